@@ -0,0 +1,80 @@
+"""FastAPI dependencies shared by the API routes."""
+
+from typing import AsyncIterator
+
+from fastapi import Request
+
+from ..db import SQLiteAdapter, SQLiteConnectionPool
+from ..repositories import (
+    CachedContentRepository,
+    ContentCache,
+    ContentRepository,
+    SQLiteContentRepository,
+    SQLiteTaskRepository,
+    SQLiteUsageRepository,
+    TaskRepository,
+    UsageRepository,
+)
+from ..tasks import TaskRunner
+
+
+def get_pool(request: Request) -> SQLiteConnectionPool:
+    """Get the app-scoped connection pool opened in the lifespan handler."""
+    return request.app.state.db_pool
+
+
+def get_content_cache(request: Request) -> ContentCache:
+    """Get the app-scoped content cache created in the lifespan handler."""
+    return request.app.state.content_cache
+
+
+def get_task_runner(request: Request) -> TaskRunner | None:
+    """Get the in-process task runner (None when standalone workers are used)."""
+    return getattr(request.app.state, "task_runner", None)
+
+
+async def get_content_repository(request: Request) -> AsyncIterator[ContentRepository]:
+    """Provide a read-through cached content repository backed by the shared pool."""
+    pool = get_pool(request)
+    repo = CachedContentRepository(
+        SQLiteContentRepository(pool.database_path, pool=pool),
+        get_content_cache(request),
+    )
+    await repo.connect()
+    try:
+        yield repo
+    finally:
+        await repo.disconnect()
+
+
+async def get_task_repository(request: Request) -> AsyncIterator[TaskRepository]:
+    """Provide a task repository backed by the shared pool."""
+    pool = get_pool(request)
+    repo = SQLiteTaskRepository(pool.database_path, pool=pool)
+    await repo.connect()
+    try:
+        yield repo
+    finally:
+        await repo.disconnect()
+
+
+async def get_usage_repository(request: Request) -> AsyncIterator[UsageRepository]:
+    """Provide an LLM usage repository backed by the shared pool."""
+    pool = get_pool(request)
+    repo = SQLiteUsageRepository(pool.database_path, pool=pool)
+    await repo.connect()
+    try:
+        yield repo
+    finally:
+        await repo.disconnect()
+
+
+async def get_database_adapter(request: Request) -> AsyncIterator[SQLiteAdapter]:
+    """Provide a raw database adapter backed by the shared pool."""
+    pool = get_pool(request)
+    adapter = SQLiteAdapter(pool.database_path, pool=pool)
+    await adapter.connect()
+    try:
+        yield adapter
+    finally:
+        await adapter.disconnect()
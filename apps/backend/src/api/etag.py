@@ -0,0 +1,39 @@
+"""Strong ETags and conditional GET handling for content endpoints."""
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from the values a response depends on.
+
+    Args:
+        parts: Content versions, path and query parameters of the response
+
+    Returns:
+        Quoted ETag header value
+    """
+    digest = hashlib.sha1(
+        "\x1f".join(repr(part) for part in parts).encode()
+    ).hexdigest()[:20]
+    return f'"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the current ETag."""
+    return Response(status_code=304, headers={"ETag": etag})
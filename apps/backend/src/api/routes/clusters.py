@@ -1,25 +1,16 @@
 """Question Cluster CRUD endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
 from ...models import QuestionCluster
-from ...repositories import SQLiteContentRepository
-from ...config import settings
+from ...repositories import ContentRepository
+from ..dependencies import get_content_repository
+from ..etag import is_not_modified, make_etag, not_modified
 
 router = APIRouter(prefix="/clusters", tags=["clusters"])
 
 
-def _get_database_path() -> str:
-    """Extract SQLite database path from connection URL."""
-    url = settings.database_url
-    if url.startswith("sqlite+aiosqlite:///"):
-        return url.replace("sqlite+aiosqlite:///", "")
-    if url.startswith("sqlite:///"):
-        return url.replace("sqlite:///", "")
-    raise ValueError(f"Unsupported database URL: {url}")
-
-
 class ClusterCreate(BaseModel):
     """Request model for creating a cluster."""
     subject_id: str
@@ -37,96 +28,102 @@ class ClusterUpdate(BaseModel):
 
 
 @router.get("", response_model=list[QuestionCluster])
-async def list_clusters(subject_id: str | None = None) -> list[QuestionCluster]:
-    """Get all clusters, optionally filtered by subject."""
-    repo = SQLiteContentRepository(_get_database_path())
+async def list_clusters(
+    request: Request,
+    response: Response,
+    subject_id: str | None = None,
+    cursor: str | None = Query(None, description="Cursor from X-Next-Cursor"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Page size"),
+    repo: ContentRepository = Depends(get_content_repository),
+) -> list[QuestionCluster] | Response:
+    """Get all clusters, optionally filtered by subject.
+
+    Ordered by topic. When a page is cut off by `limit`, the cursor for the
+    next page is returned in the `X-Next-Cursor` header. Supports
+    conditional GET via `If-None-Match`.
+    """
+    versions = await repo.get_content_versions()
+    etag = make_etag(
+        "clusters", versions.get("question_clusters"), subject_id, cursor, limit
+    )
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
     try:
-        await repo.connect()
-        if subject_id:
-            return await repo.get_clusters_by_subject(subject_id)
-        # Get all clusters by fetching all subjects first
-        subjects = await repo.get_all_subjects()
-        all_clusters = []
-        for subject in subjects:
-            clusters = await repo.get_clusters_by_subject(subject.id)
-            all_clusters.extend(clusters)
-        return all_clusters
-    finally:
-        await repo.disconnect()
+        page = await repo.list_clusters(subject_id=subject_id, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.get("/{cluster_id}", response_model=QuestionCluster)
-async def get_cluster(cluster_id: str) -> QuestionCluster:
+async def get_cluster(
+    cluster_id: str,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> QuestionCluster:
     """Get a cluster by ID."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        cluster = await repo.get_cluster_by_id(cluster_id)
-        if not cluster:
-            raise HTTPException(status_code=404, detail="Cluster not found")
-        return cluster
-    finally:
-        await repo.disconnect()
+    cluster = await repo.get_cluster_by_id(cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+    return cluster
 
 
 @router.post("", response_model=QuestionCluster, status_code=201)
-async def create_cluster(data: ClusterCreate) -> QuestionCluster:
+async def create_cluster(
+    data: ClusterCreate,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> QuestionCluster:
     """Create a new question cluster."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        # Verify subject exists
-        subject = await repo.get_subject_by_id(data.subject_id)
-        if not subject:
-            raise HTTPException(status_code=404, detail="Subject not found")
+    # Verify subject exists
+    subject = await repo.get_subject_by_id(data.subject_id)
+    if not subject:
+        raise HTTPException(status_code=404, detail="Subject not found")
 
-        cluster = QuestionCluster(
-            subject_id=data.subject_id,
-            topic=data.topic,
-            canonical_template=data.canonical_template,
-            difficulty_baseline=data.difficulty_baseline,
-        )
-        return await repo.create_cluster(cluster)
-    finally:
-        await repo.disconnect()
+    cluster = QuestionCluster(
+        subject_id=data.subject_id,
+        topic=data.topic,
+        canonical_template=data.canonical_template,
+        difficulty_baseline=data.difficulty_baseline,
+    )
+    return await repo.create_cluster(cluster)
 
 
 @router.put("/{cluster_id}", response_model=QuestionCluster)
-async def update_cluster(cluster_id: str, data: ClusterUpdate) -> QuestionCluster:
+async def update_cluster(
+    cluster_id: str,
+    data: ClusterUpdate,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> QuestionCluster:
     """Update an existing cluster."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        cluster = await repo.get_cluster_by_id(cluster_id)
-        if not cluster:
-            raise HTTPException(status_code=404, detail="Cluster not found")
-
-        if data.subject_id is not None:
-            # Verify new subject exists
-            subject = await repo.get_subject_by_id(data.subject_id)
-            if not subject:
-                raise HTTPException(status_code=404, detail="Subject not found")
-            cluster.subject_id = data.subject_id
-        if data.topic is not None:
-            cluster.topic = data.topic
-        if data.canonical_template is not None:
-            cluster.canonical_template = data.canonical_template
-        if data.difficulty_baseline is not None:
-            cluster.difficulty_baseline = data.difficulty_baseline
-
-        return await repo.update_cluster(cluster)
-    finally:
-        await repo.disconnect()
+    cluster = await repo.get_cluster_by_id(cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Cluster not found")
+
+    if data.subject_id is not None:
+        # Verify new subject exists
+        subject = await repo.get_subject_by_id(data.subject_id)
+        if not subject:
+            raise HTTPException(status_code=404, detail="Subject not found")
+        cluster.subject_id = data.subject_id
+    if data.topic is not None:
+        cluster.topic = data.topic
+    if data.canonical_template is not None:
+        cluster.canonical_template = data.canonical_template
+    if data.difficulty_baseline is not None:
+        cluster.difficulty_baseline = data.difficulty_baseline
+
+    return await repo.update_cluster(cluster)
 
 
 @router.delete("/{cluster_id}", status_code=204)
-async def delete_cluster(cluster_id: str) -> None:
+async def delete_cluster(
+    cluster_id: str,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> None:
     """Delete a cluster and all its variants/answers."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        deleted = await repo.delete_cluster(cluster_id)
-        if not deleted:
-            raise HTTPException(status_code=404, detail="Cluster not found")
-    finally:
-        await repo.disconnect()
+    deleted = await repo.delete_cluster(cluster_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Cluster not found")
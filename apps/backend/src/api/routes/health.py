@@ -1,8 +1,15 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException
 
 from ...core.circuit_breaker import CircuitBreaker
+from ...db import SQLiteConnectionPool
+from ...repositories import ContentCache, TaskRepository
+from ...tasks import task_notifier
+from ...tasks.runner import HEARTBEAT_TIMEOUT
+from ..dependencies import get_content_cache, get_pool, get_task_repository
 
 router = APIRouter(prefix="/health")
 
@@ -20,15 +27,58 @@ async def readiness_check():
     return {"status": "ready", "checks": {"database": "ok"}}
 
 
+@router.get("/pool")
+async def get_pool_status(pool: SQLiteConnectionPool = Depends(get_pool)) -> dict:
+    """Get status of the shared database connection pool.
+
+    Returns pool size and connection wait-time metrics for the
+    reader connections and the single writer connection.
+    """
+    return pool.get_stats()
+
+
+@router.get("/cache")
+async def get_cache_status(cache: ContentCache = Depends(get_content_cache)) -> dict:
+    """Get status of the in-process content cache.
+
+    Returns size, hit rate, evictions and invalidations per cached
+    entity type.
+    """
+    return cache.get_stats()
+
+
+@router.get("/workers")
+async def get_worker_status(repo: TaskRepository = Depends(get_task_repository)) -> dict:
+    """Get status of all task workers (in-API runner and standalone workers).
+
+    A worker counts as alive while it has not stopped and its last
+    heartbeat is younger than the task heartbeat timeout.
+    """
+    workers = await repo.get_workers()
+    cutoff = datetime.utcnow() - timedelta(seconds=HEARTBEAT_TIMEOUT)
+    result = []
+    for worker in workers:
+        alive = worker.stopped_at is None and (
+            worker.heartbeat_at is not None and worker.heartbeat_at >= cutoff
+        )
+        result.append({**worker.model_dump(), "alive": alive})
+    return {
+        "workers": result,
+        "alive": sum(1 for worker in result if worker["alive"]),
+    }
+
+
 @router.get("/circuits")
 async def get_circuit_status() -> dict:
     """Get status of all circuit breakers.
 
     Returns information about all registered circuit breakers including:
     - Current state (closed, open, half_open)
-    - Failure count
+    - Failure count (within the sliding window)
     - Success count (in half_open state)
     - Retry after seconds (if open)
+    - Sliding window calls, failures, slow calls and failure rate
+    - Half-open probes: in flight, outcomes, rejections and latency
     """
     circuits = CircuitBreaker.get_all_status()
     return {
@@ -53,4 +103,6 @@ async def reset_circuit(name: str) -> dict:
             detail=f"Circuit breaker '{name}' not found"
         )
     breaker.reset()
+    # Task types parked behind this circuit can be claimed again right away
+    task_notifier.notify()
     return breaker.get_status()
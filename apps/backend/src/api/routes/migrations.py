@@ -1,11 +1,11 @@
 """Migration management API routes."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
-from ...db import SQLiteAdapter
+from ...db import DatabaseAdapter
 from ...db.migrations import MigrationRunner
-from ...config import settings
+from ..dependencies import get_database_adapter
 
 router = APIRouter(prefix="/migrations", tags=["migrations"])
 
@@ -37,45 +37,32 @@ class MigrationHistoryResponse(BaseModel):
     migrations: list[AppliedMigration]
 
 
-def _get_database_path() -> str:
-    """Extract SQLite database path from connection URL."""
-    url = settings.database_url
-    if url.startswith("sqlite+aiosqlite:///"):
-        return url.replace("sqlite+aiosqlite:///", "")
-    if url.startswith("sqlite:///"):
-        return url.replace("sqlite:///", "")
-    raise ValueError(f"Unsupported database URL: {url}")
-
-
 @router.get("/status", response_model=MigrationStatusResponse)
-async def get_migration_status() -> MigrationStatusResponse:
+async def get_migration_status(
+    adapter: DatabaseAdapter = Depends(get_database_adapter),
+) -> MigrationStatusResponse:
     """Get current migration status.
 
     Returns list of applied and pending migrations.
     """
-    adapter = SQLiteAdapter(_get_database_path())
-    try:
-        await adapter.connect()
-        runner = MigrationRunner(adapter)
-        status = await runner.get_status()
-        return MigrationStatusResponse(
-            applied=status.applied,
-            pending=status.pending,
-        )
-    finally:
-        await adapter.disconnect()
+    runner = MigrationRunner(adapter)
+    status = await runner.get_status()
+    return MigrationStatusResponse(
+        applied=status.applied,
+        pending=status.pending,
+    )
 
 
 @router.post("/run", response_model=MigrationRunResponse)
-async def run_migrations() -> MigrationRunResponse:
+async def run_migrations(
+    adapter: DatabaseAdapter = Depends(get_database_adapter),
+) -> MigrationRunResponse:
     """Run all pending migrations.
 
     This endpoint should be called explicitly to apply database changes.
     Migrations are NOT run automatically on application start.
     """
-    adapter = SQLiteAdapter(_get_database_path())
     try:
-        await adapter.connect()
         runner = MigrationRunner(adapter)
         applied = await runner.run_pending()
 
@@ -90,28 +77,22 @@ async def run_migrations() -> MigrationRunResponse:
             status_code=500,
             detail=f"Migration failed: {str(e)}",
         )
-    finally:
-        await adapter.disconnect()
 
 
 @router.get("/history", response_model=MigrationHistoryResponse)
-async def get_migration_history() -> MigrationHistoryResponse:
+async def get_migration_history(
+    adapter: DatabaseAdapter = Depends(get_database_adapter),
+) -> MigrationHistoryResponse:
     """Get history of applied migrations with timestamps."""
-    adapter = SQLiteAdapter(_get_database_path())
-    try:
-        await adapter.connect()
-
-        # Check if migrations table exists
-        if not await adapter.table_exists("_migrations"):
-            return MigrationHistoryResponse(migrations=[])
-
-        rows = await adapter.fetch_all(
-            "SELECT name, applied_at FROM _migrations ORDER BY applied_at"
-        )
-        migrations = [
-            AppliedMigration(name=row["name"], applied_at=row["applied_at"])
-            for row in rows
-        ]
-        return MigrationHistoryResponse(migrations=migrations)
-    finally:
-        await adapter.disconnect()
+    # Check if migrations table exists
+    if not await adapter.table_exists("_migrations"):
+        return MigrationHistoryResponse(migrations=[])
+
+    rows = await adapter.fetch_all(
+        "SELECT name, applied_at FROM _migrations ORDER BY applied_at"
+    )
+    migrations = [
+        AppliedMigration(name=row["name"], applied_at=row["applied_at"])
+        for row in rows
+    ]
+    return MigrationHistoryResponse(migrations=migrations)
@@ -0,0 +1,47 @@
+"""Quiz question endpoints."""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ...models import QuestionWithAnswers
+from ...repositories import ContentRepository
+from ..dependencies import get_content_repository
+
+router = APIRouter(prefix="/questions", tags=["questions"])
+
+
+@router.get("/batch", response_model=list[QuestionWithAnswers])
+async def get_question_batch(
+    subject_key: str | None = Query(None, description="Filter by subject key"),
+    cluster_id: list[str] | None = Query(None, description="Filter by cluster (repeatable)"),
+    min_difficulty: int | None = Query(None, ge=0, description="Minimum difficulty"),
+    max_difficulty: int | None = Query(None, ge=0, description="Maximum difficulty"),
+    count: int = Query(20, ge=1, le=100, description="Number of questions"),
+    weighted: bool = Query(False, description="Weight by cluster difficulty"),
+    session_id: str | None = Query(None, description="Never repeat questions within this session"),
+    repo: ContentRepository = Depends(get_content_repository),
+) -> list[QuestionWithAnswers]:
+    """Draw N distinct random questions with answers in one call.
+
+    Questions are sampled from the in-memory index and hydrated in a
+    single query, so a whole quiz costs one or two database round trips.
+    Returns fewer than `count` questions if the filtered pool is exhausted.
+    """
+    if (
+        min_difficulty is not None
+        and max_difficulty is not None
+        and min_difficulty > max_difficulty
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="min_difficulty must not be greater than max_difficulty",
+        )
+
+    return await repo.get_random_questions(
+        count=count,
+        subject_key=subject_key,
+        cluster_ids=cluster_id,
+        min_difficulty=min_difficulty,
+        max_difficulty=max_difficulty,
+        weighted=weighted,
+        session_id=session_id,
+    )
@@ -1,40 +1,38 @@
 """Task management API endpoints."""
 
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Query
+from typing import Awaitable, Callable
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from ...models.tasks import (
     TaskStatus,
     TaskType,
+    TaskPriority,
     GenerationTask,
     TaskCreate,
     TaskResponse,
     TaskListResponse,
     RevertResponse,
 )
-from ...repositories import SQLiteTaskRepository
-from ...config import settings
+from ...repositories import TaskRepository
+from ...tasks import TaskRunner, task_events, task_notifier
+from ...tasks.events import TaskEvent, stream_events
+from ...tasks.revert import count_by_entity_type, revert_task_id_for
+from ..dependencies import get_task_repository, get_task_runner
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-def _get_database_path() -> str:
-    """Extract SQLite database path from connection URL."""
-    url = settings.database_url
-    if url.startswith("sqlite+aiosqlite:///"):
-        return url.replace("sqlite+aiosqlite:///", "")
-    if url.startswith("sqlite:///"):
-        return url.replace("sqlite:///", "")
-    raise ValueError(f"Unsupported database URL: {url}")
-
-
-async def _task_to_response(repo: SQLiteTaskRepository, task: GenerationTask) -> TaskResponse:
+async def _task_to_response(repo: TaskRepository, task: GenerationTask) -> TaskResponse:
     """Convert GenerationTask to TaskResponse with content log."""
     content_log = await repo.get_content_log_by_task(task.id)
     return TaskResponse(
         id=task.id,
         task_type=task.task_type,
         status=task.status,
+        priority=task.priority,
         payload=task.payload,
         user_context=task.user_context,
         created_at=task.created_at,
@@ -44,227 +42,331 @@ async def _task_to_response(repo: SQLiteTaskRepository, task: GenerationTask) ->
         progress_current=task.progress_current,
         progress_total=task.progress_total,
         progress_message=task.progress_message,
+        lease_owner=task.lease_owner,
+        lease_expires_at=task.lease_expires_at,
         error_message=task.error_message,
         retry_count=task.retry_count,
         max_retries=task.max_retries,
         accepted_at=task.accepted_at,
         reverted_at=task.reverted_at,
+        archived_at=task.archived_at,
         content_log=content_log,
     )
 
 
+def _ensure_not_archived(task: GenerationTask) -> None:
+    """Reject changes to tasks moved to the archive by the retention job."""
+    if task.archived_at:
+        raise HTTPException(status_code=400, detail="Task is archived and read-only")
+
+
 @router.get("", response_model=TaskListResponse)
 async def list_tasks(
     status: TaskStatus | None = Query(None, description="Filter by status"),
     task_type: TaskType | None = Query(None, description="Filter by task type"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of tasks"),
-    offset: int = Query(0, ge=0, description="Number of tasks to skip"),
+    offset: int = Query(0, ge=0, description="Number of tasks to skip (ignored with cursor)"),
+    cursor: str | None = Query(None, description="next_cursor of the previous page"),
+    repo: TaskRepository = Depends(get_task_repository),
 ) -> TaskListResponse:
-    """List all tasks with optional filtering."""
-    repo = SQLiteTaskRepository(_get_database_path())
+    """List all tasks with optional filtering.
+
+    Returns summaries without payload and content log, newest first; use
+    GET /tasks/{task_id} for the full task. Page through large queues with
+    `cursor` (from `next_cursor`) rather than `offset`.
+    """
     try:
-        await repo.connect()
-        tasks = await repo.get_tasks(
+        page = await repo.get_task_summaries(
             status=status,
             task_type=task_type,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
-        total = await repo.count_tasks(status=status, task_type=task_type)
-
-        # Convert to response models (without content_log for list view)
-        task_responses = []
-        for task in tasks:
-            task_responses.append(TaskResponse(
-                id=task.id,
-                task_type=task.task_type,
-                status=task.status,
-                payload=task.payload,
-                user_context=task.user_context,
-                created_at=task.created_at,
-                delayed_until=task.delayed_until,
-                started_at=task.started_at,
-                completed_at=task.completed_at,
-                progress_current=task.progress_current,
-                progress_total=task.progress_total,
-                progress_message=task.progress_message,
-                error_message=task.error_message,
-                retry_count=task.retry_count,
-                max_retries=task.max_retries,
-                accepted_at=task.accepted_at,
-                reverted_at=task.reverted_at,
-                content_log=[],  # Empty for list view
-            ))
-
-        return TaskListResponse(tasks=task_responses, total=total)
-    finally:
-        await repo.disconnect()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await repo.count_tasks(status=status, task_type=task_type)
+    return TaskListResponse(tasks=page.items, total=total, next_cursor=page.next_cursor)
+
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+_SSE_POLL_SECONDS = 2.0  # DB poll interval of task streams without a local runner
+
+
+def _task_poller(
+    repo: TaskRepository, task_id: str, state: dict
+) -> Callable[[], Awaitable[list[TaskEvent] | None]]:
+    """Build a poll callback turning DB changes of a task into events.
+
+    Used when no runner in this process publishes the task's events.
+    `state` is the last state sent to the watcher and is updated in place.
+    """
+    async def poll() -> list[TaskEvent] | None:
+        task = await repo.get_task_by_id(task_id)
+        if task is None:
+            return None
+        events = []
+        progress = {
+            "current": task.progress_current,
+            "total": task.progress_total,
+            "message": task.progress_message,
+        }
+        if any(state.get(key) != value for key, value in progress.items()):
+            state.update(progress)
+            events.append(TaskEvent(id=0, type="progress", task_id=task_id, data=progress))
+        if task.status.value != state.get("status"):
+            state["status"] = task.status.value
+            data = {"status": task.status.value}
+            if task.error_message:
+                data["error_message"] = task.error_message
+            events.append(TaskEvent(id=0, type="status", task_id=task_id, data=data))
+        return events
+
+    return poll
+
+
+@router.get("/events")
+async def stream_queue_events(request: Request) -> StreamingResponse:
+    """Stream status, progress and artifact events of all tasks (SSE).
+
+    Events come from the in-process task runner; watchers cause no
+    database reads.
+    """
+    async def generate():
+        async with task_events.subscribe() as subscription:
+            async for message in stream_events(
+                subscription, is_disconnected=request.is_disconnected
+            ):
+                yield message
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.get("/{task_id}/events")
+async def stream_task_events(
+    task_id: str,
+    request: Request,
+    repo: TaskRepository = Depends(get_task_repository),
+    runner: TaskRunner | None = Depends(get_task_runner),
+) -> StreamingResponse:
+    """Stream status, progress and artifact events of one task (SSE).
+
+    Starts with the task's current state and ends after a terminal
+    status (completed, failed, cancelled). The current state comes from
+    the event bus; only tasks it has not seen are read once from the DB.
+    Without a local task runner (standalone workers), status and progress
+    are polled from the DB instead; artifact events are not sent then.
+    """
+    subscription = task_events.subscribe(task_id)
+    subscription.open()  # Before reading state, so no event is missed
+    try:
+        snapshot = task_events.snapshot(task_id)
+        if snapshot is None:
+            task = await repo.get_task_by_id(task_id)
+            if not task:
+                raise HTTPException(status_code=404, detail="Task not found")
+            snapshot = {
+                "status": task.status.value,
+                "task_type": task.task_type.value,
+                "current": task.progress_current,
+                "total": task.progress_total,
+                "message": task.progress_message,
+            }
+    except BaseException:
+        subscription.close()
+        raise
+
+    async def generate():
+        try:
+            initial = [TaskEvent(id=0, type="status", task_id=task_id, data=snapshot)]
+            poll = _task_poller(repo, task_id, dict(snapshot)) if runner is None else None
+            async for message in stream_events(
+                subscription,
+                initial=initial,
+                is_disconnected=request.is_disconnected,
+                poll=poll,
+                poll_seconds=_SSE_POLL_SECONDS,
+            ):
+                yield message
+        finally:
+            subscription.close()
+
+    return StreamingResponse(generate(), media_type="text/event-stream", headers=_SSE_HEADERS)
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(task_id: str) -> TaskResponse:
+async def get_task(
+    task_id: str,
+    repo: TaskRepository = Depends(get_task_repository),
+) -> TaskResponse:
     """Get task details including content log."""
-    repo = SQLiteTaskRepository(_get_database_path())
-    try:
-        await repo.connect()
-        task = await repo.get_task_by_id(task_id)
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-        return await _task_to_response(repo, task)
-    finally:
-        await repo.disconnect()
+    task = await repo.get_task_by_id(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return await _task_to_response(repo, task)
 
 
 @router.post("", response_model=TaskResponse, status_code=201)
-async def create_task(data: TaskCreate) -> TaskResponse:
+async def create_task(
+    data: TaskCreate,
+    repo: TaskRepository = Depends(get_task_repository),
+) -> TaskResponse:
     """Create a new generation task."""
-    repo = SQLiteTaskRepository(_get_database_path())
-    try:
-        await repo.connect()
-        task = GenerationTask(
-            task_type=data.task_type,
-            payload=data.payload,
-            user_context=data.user_context,
-            delayed_until=data.delayed_until,
-        )
-        created = await repo.create_task(task)
-        return await _task_to_response(repo, created)
-    finally:
-        await repo.disconnect()
+    task = GenerationTask(
+        task_type=data.task_type,
+        payload=data.payload,
+        user_context=data.user_context,
+        delayed_until=data.delayed_until,
+        priority=data.priority,
+    )
+    created = await repo.create_task(task)
+    task_notifier.notify()
+    task_events.publish(
+        "status", created.id, status=created.status.value, task_type=created.task_type.value,
+    )
+    return await _task_to_response(repo, created)
 
 
 @router.post("/{task_id}/cancel", response_model=TaskResponse)
-async def cancel_task(task_id: str) -> TaskResponse:
+async def cancel_task(
+    task_id: str,
+    repo: TaskRepository = Depends(get_task_repository),
+) -> TaskResponse:
     """Cancel a pending or in_progress task."""
-    repo = SQLiteTaskRepository(_get_database_path())
-    try:
-        await repo.connect()
-        task = await repo.get_task_by_id(task_id)
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-
-        if task.status not in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
-            raise HTTPException(
-                status_code=400,
-                detail=f"Cannot cancel task with status '{task.status.value}'"
-            )
+    task = await repo.get_task_by_id(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if task.status not in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot cancel task with status '{task.status.value}'"
+        )
 
-        task.status = TaskStatus.CANCELLED
-        updated = await repo.update_task(task)
-        return await _task_to_response(repo, updated)
-    finally:
-        await repo.disconnect()
+    task.status = TaskStatus.CANCELLED
+    updated = await repo.update_task(task)
+    task_events.publish("status", task.id, status=TaskStatus.CANCELLED.value)
+    return await _task_to_response(repo, updated)
 
 
 @router.post("/{task_id}/retry", response_model=TaskResponse)
-async def retry_task(task_id: str) -> TaskResponse:
+async def retry_task(
+    task_id: str,
+    repo: TaskRepository = Depends(get_task_repository),
+) -> TaskResponse:
     """Retry a failed task."""
-    repo = SQLiteTaskRepository(_get_database_path())
-    try:
-        await repo.connect()
-        task = await repo.get_task_by_id(task_id)
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-
-        if task.status != TaskStatus.FAILED:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Can only retry failed tasks, current status is '{task.status.value}'"
-            )
-
-        # Reset task for retry
-        task.status = TaskStatus.PENDING
-        task.error_message = None
-        task.started_at = None
-        task.completed_at = None
-        task.progress_current = 0
-        task.progress_total = 0
-        task.progress_message = None
-        task.delayed_until = None
-
-        updated = await repo.update_task(task)
-        return await _task_to_response(repo, updated)
-    finally:
-        await repo.disconnect()
+    task = await repo.get_task_by_id(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    _ensure_not_archived(task)
+
+    if task.status != TaskStatus.FAILED:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Can only retry failed tasks, current status is '{task.status.value}'"
+        )
+
+    # Reset task for retry
+    task.status = TaskStatus.PENDING
+    task.error_message = None
+    task.started_at = None
+    task.completed_at = None
+    task.progress_current = 0
+    task.progress_total = 0
+    task.progress_message = None
+    task.delayed_until = None
+
+    updated = await repo.update_task(task)
+    task_notifier.notify()
+    task_events.publish("status", task.id, status=TaskStatus.PENDING.value, retry=True)
+    return await _task_to_response(repo, updated)
 
 
 @router.post("/{task_id}/accept", response_model=TaskResponse)
-async def accept_task(task_id: str) -> TaskResponse:
+async def accept_task(
+    task_id: str,
+    repo: TaskRepository = Depends(get_task_repository),
+) -> TaskResponse:
     """Accept completed task results."""
-    repo = SQLiteTaskRepository(_get_database_path())
-    try:
-        await repo.connect()
-        task = await repo.get_task_by_id(task_id)
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
+    task = await repo.get_task_by_id(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    _ensure_not_archived(task)
+
+    if task.status != TaskStatus.COMPLETED:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Can only accept completed tasks, current status is '{task.status.value}'"
+        )
 
-        if task.status != TaskStatus.COMPLETED:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Can only accept completed tasks, current status is '{task.status.value}'"
-            )
+    if task.accepted_at:
+        raise HTTPException(status_code=400, detail="Task already accepted")
 
-        if task.accepted_at:
-            raise HTTPException(status_code=400, detail="Task already accepted")
+    if task.reverted_at:
+        raise HTTPException(status_code=400, detail="Task has been reverted")
 
-        if task.reverted_at:
-            raise HTTPException(status_code=400, detail="Task has been reverted")
+    if await repo.get_task_by_id(revert_task_id_for(task.id)):
+        raise HTTPException(status_code=400, detail="Task is being reverted")
 
-        task.accepted_at = datetime.utcnow()
-        updated = await repo.update_task(task)
-        return await _task_to_response(repo, updated)
-    finally:
-        await repo.disconnect()
+    task.accepted_at = datetime.utcnow()
+    updated = await repo.update_task(task)
+    return await _task_to_response(repo, updated)
 
 
 @router.post("/{task_id}/revert", response_model=RevertResponse)
-async def revert_task(task_id: str) -> RevertResponse:
+async def revert_task(
+    task_id: str,
+    repo: TaskRepository = Depends(get_task_repository),
+) -> RevertResponse:
     """Revert all changes made by a task.
 
-    Note: The actual revert logic (deleting/restoring entities) will be
-    implemented in the Task Runner phase. This endpoint currently marks
-    the task as reverted and counts what would be reverted.
+    Queues a revert_task that deletes created entities and restores
+    updated or deleted ones in chunks; follow it via `revert_task_id`.
+    The task's `reverted_at` is set once the revert has finished.
     """
-    repo = SQLiteTaskRepository(_get_database_path())
-    try:
-        await repo.connect()
-        task = await repo.get_task_by_id(task_id)
-        if not task:
-            raise HTTPException(status_code=404, detail="Task not found")
-
-        if task.status != TaskStatus.COMPLETED:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Can only revert completed tasks, current status is '{task.status.value}'"
-            )
-
-        if task.accepted_at:
-            raise HTTPException(status_code=400, detail="Cannot revert accepted task")
-
-        if task.reverted_at:
-            raise HTTPException(status_code=400, detail="Task already reverted")
-
-        # Get content log to count what will be reverted
-        content_log = await repo.get_content_log_by_task(task_id)
-
-        # Count by entity type
-        reverted_count: dict[str, int] = {}
-        for log in content_log:
-            entity_plural = f"{log.entity_type}s"  # Simple pluralization
-            reverted_count[entity_plural] = reverted_count.get(entity_plural, 0) + 1
-
-        # TODO: Actual revert logic will be implemented with Task Runner
-        # For now, we just mark as reverted and the actual cleanup would
-        # happen when the revert handler is implemented
-
-        task.reverted_at = datetime.utcnow()
-        await repo.update_task(task)
-
-        return RevertResponse(
-            id=task.id,
-            status=task.status,
-            reverted_at=task.reverted_at,
-            reverted_count=reverted_count,
+    task = await repo.get_task_by_id(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    _ensure_not_archived(task)
+
+    if task.status != TaskStatus.COMPLETED:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Can only revert completed tasks, current status is '{task.status.value}'"
+        )
+
+    if task.accepted_at:
+        raise HTTPException(status_code=400, detail="Cannot revert accepted task")
+
+    if task.reverted_at:
+        raise HTTPException(status_code=400, detail="Task already reverted")
+
+    revert_task_id = revert_task_id_for(task.id)
+    if await repo.get_task_by_id(revert_task_id):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Revert already requested (task {revert_task_id})"
         )
-    finally:
-        await repo.disconnect()
+
+    # Count what will be reverted
+    content_log = await repo.get_content_log_by_task(task_id)
+
+    await repo.create_task(GenerationTask(
+        id=revert_task_id,
+        task_type=TaskType.REVERT_TASK,
+        priority=TaskPriority.HIGH,
+        payload={"target_task_id": task.id},
+    ))
+    task_notifier.notify()
+    task_events.publish(
+        "status", revert_task_id, status=TaskStatus.PENDING.value,
+        task_type=TaskType.REVERT_TASK.value,
+    )
+
+    return RevertResponse(
+        id=task.id,
+        status=task.status,
+        reverted_at=None,
+        reverted_count=count_by_entity_type(content_log),
+        revert_task_id=revert_task_id,
+    )
@@ -0,0 +1,60 @@
+"""LLM usage and cost endpoints (served from the rollup tables)."""
+
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ...models import LLMUsageRollup
+from ...repositories import UsageRepository
+from ..dependencies import get_usage_repository
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+
+
+@router.get("", response_model=list[LLMUsageRollup])
+async def get_usage(
+    granularity: Literal["hour", "day"] = Query("day", description="Bucket size"),
+    since: datetime | None = Query(None, description="Include the bucket containing this time"),
+    until: datetime | None = Query(None, description="Include buckets starting before this time"),
+    provider: str | None = Query(None, description="Filter by provider"),
+    model: str | None = Query(None, description="Filter by model"),
+    source_type: str | None = Query(None, description="Filter by source type"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of rows"),
+    repo: UsageRepository = Depends(get_usage_repository),
+) -> list[LLMUsageRollup]:
+    """Get LLM usage per hour or day and provider / model / source type.
+
+    Oldest bucket first, for charting. Reads the maintained rollups, so
+    the cost does not grow with the number of logged LLM requests.
+    """
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="'since' must be before 'until'")
+    return await repo.get_usage_rollups(
+        granularity=granularity,
+        since=since,
+        until=until,
+        provider=provider,
+        model=model,
+        source_type=source_type,
+        limit=limit,
+    )
+
+
+@router.get("/summary", response_model=list[LLMUsageRollup])
+async def get_usage_summary(
+    since: datetime | None = Query(None, description="Include the day containing this time"),
+    until: datetime | None = Query(None, description="Include days starting before this time"),
+    source_type: str | None = Query(None, description="Filter by source type"),
+    repo: UsageRepository = Depends(get_usage_repository),
+) -> list[LLMUsageRollup]:
+    """Get total LLM usage and cost per provider and model, most expensive first."""
+    if since and until and since >= until:
+        raise HTTPException(status_code=400, detail="'since' must be before 'until'")
+    return await repo.get_usage_totals(since=since, until=until, source_type=source_type)
+
+
+@router.get("/recorder")
+async def get_recorder_status(request: Request) -> dict:
+    """Get write statistics of this process's usage recorder."""
+    return request.app.state.usage_recorder.get_stats()
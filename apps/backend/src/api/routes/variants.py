@@ -1,25 +1,16 @@
 """Question Variant CRUD endpoints."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
 from ...models import QuestionVariant, QuestionWithAnswers
-from ...repositories import SQLiteContentRepository
-from ...config import settings
+from ...repositories import ContentRepository
+from ..dependencies import get_content_repository
+from ..etag import is_not_modified, make_etag, not_modified
 
 router = APIRouter(prefix="/variants", tags=["variants"])
 
 
-def _get_database_path() -> str:
-    """Extract SQLite database path from connection URL."""
-    url = settings.database_url
-    if url.startswith("sqlite+aiosqlite:///"):
-        return url.replace("sqlite+aiosqlite:///", "")
-    if url.startswith("sqlite:///"):
-        return url.replace("sqlite:///", "")
-    raise ValueError(f"Unsupported database URL: {url}")
-
-
 class VariantCreate(BaseModel):
     """Request model for creating a variant."""
     cluster_id: str
@@ -33,106 +24,116 @@ class VariantUpdate(BaseModel):
 
 
 @router.get("", response_model=list[QuestionVariant])
-async def list_variants(cluster_id: str | None = None) -> list[QuestionVariant]:
-    """Get all variants, optionally filtered by cluster."""
-    repo = SQLiteContentRepository(_get_database_path())
+async def list_variants(
+    response: Response,
+    cluster_id: str | None = None,
+    subject_id: str | None = None,
+    cursor: str | None = Query(None, description="Cursor from X-Next-Cursor"),
+    limit: int | None = Query(None, ge=1, le=1000, description="Page size"),
+    repo: ContentRepository = Depends(get_content_repository),
+) -> list[QuestionVariant]:
+    """Get all variants, optionally filtered by cluster or subject.
+
+    When a page is cut off by `limit`, the cursor for the next page is
+    returned in the `X-Next-Cursor` header.
+    """
     try:
-        await repo.connect()
-        if cluster_id:
-            return await repo.get_variants_by_cluster(cluster_id)
-        # Get all variants (expensive, consider pagination later)
-        subjects = await repo.get_all_subjects()
-        all_variants = []
-        for subject in subjects:
-            clusters = await repo.get_clusters_by_subject(subject.id)
-            for cluster in clusters:
-                variants = await repo.get_variants_by_cluster(cluster.id)
-                all_variants.extend(variants)
-        return all_variants
-    finally:
-        await repo.disconnect()
+        page = await repo.list_variants(
+            cluster_id=cluster_id,
+            subject_id=subject_id,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @router.get("/{variant_id}", response_model=QuestionVariant)
-async def get_variant(variant_id: str) -> QuestionVariant:
+async def get_variant(
+    variant_id: str,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> QuestionVariant:
     """Get a variant by ID."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        variant = await repo.get_variant_by_id(variant_id)
-        if not variant:
-            raise HTTPException(status_code=404, detail="Variant not found")
-        return variant
-    finally:
-        await repo.disconnect()
+    variant = await repo.get_variant_by_id(variant_id)
+    if not variant:
+        raise HTTPException(status_code=404, detail="Variant not found")
+    return variant
 
 
 @router.get("/{variant_id}/full", response_model=QuestionWithAnswers)
-async def get_variant_with_answers(variant_id: str) -> QuestionWithAnswers:
-    """Get a variant with all its answers, cluster, and subject info."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        question = await repo.get_question_with_answers(variant_id)
-        if not question:
-            raise HTTPException(status_code=404, detail="Variant not found")
-        return question
-    finally:
-        await repo.disconnect()
+async def get_variant_with_answers(
+    variant_id: str,
+    request: Request,
+    response: Response,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> QuestionWithAnswers | Response:
+    """Get a variant with all its answers, cluster, and subject info.
+
+    Supports conditional GET via `If-None-Match`; the ETag covers the
+    subject, cluster, variant and answer tables.
+    """
+    versions = await repo.get_content_versions()
+    etag = make_etag("variant_full", variant_id, sorted(versions.items()))
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+
+    question = await repo.get_question_with_answers(variant_id)
+    if not question:
+        raise HTTPException(status_code=404, detail="Variant not found")
+    return question
 
 
 @router.post("", response_model=QuestionVariant, status_code=201)
-async def create_variant(data: VariantCreate) -> QuestionVariant:
+async def create_variant(
+    data: VariantCreate,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> QuestionVariant:
     """Create a new question variant."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        # Verify cluster exists
-        cluster = await repo.get_cluster_by_id(data.cluster_id)
-        if not cluster:
-            raise HTTPException(status_code=404, detail="Cluster not found")
+    # Verify cluster exists
+    cluster = await repo.get_cluster_by_id(data.cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=404, detail="Cluster not found")
 
-        variant = QuestionVariant(
-            cluster_id=data.cluster_id,
-            question_text=data.question_text,
-        )
-        return await repo.create_variant(variant)
-    finally:
-        await repo.disconnect()
+    variant = QuestionVariant(
+        cluster_id=data.cluster_id,
+        question_text=data.question_text,
+    )
+    return await repo.create_variant(variant)
 
 
 @router.put("/{variant_id}", response_model=QuestionVariant)
-async def update_variant(variant_id: str, data: VariantUpdate) -> QuestionVariant:
+async def update_variant(
+    variant_id: str,
+    data: VariantUpdate,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> QuestionVariant:
     """Update an existing variant."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        variant = await repo.get_variant_by_id(variant_id)
-        if not variant:
-            raise HTTPException(status_code=404, detail="Variant not found")
+    variant = await repo.get_variant_by_id(variant_id)
+    if not variant:
+        raise HTTPException(status_code=404, detail="Variant not found")
 
-        if data.cluster_id is not None:
-            # Verify new cluster exists
-            cluster = await repo.get_cluster_by_id(data.cluster_id)
-            if not cluster:
-                raise HTTPException(status_code=404, detail="Cluster not found")
-            variant.cluster_id = data.cluster_id
-        if data.question_text is not None:
-            variant.question_text = data.question_text
+    if data.cluster_id is not None:
+        # Verify new cluster exists
+        cluster = await repo.get_cluster_by_id(data.cluster_id)
+        if not cluster:
+            raise HTTPException(status_code=404, detail="Cluster not found")
+        variant.cluster_id = data.cluster_id
+    if data.question_text is not None:
+        variant.question_text = data.question_text
 
-        return await repo.update_variant(variant)
-    finally:
-        await repo.disconnect()
+    return await repo.update_variant(variant)
 
 
 @router.delete("/{variant_id}", status_code=204)
-async def delete_variant(variant_id: str) -> None:
+async def delete_variant(
+    variant_id: str,
+    repo: ContentRepository = Depends(get_content_repository),
+) -> None:
     """Delete a variant and all its answers."""
-    repo = SQLiteContentRepository(_get_database_path())
-    try:
-        await repo.connect()
-        deleted = await repo.delete_variant(variant_id)
-        if not deleted:
-            raise HTTPException(status_code=404, detail="Variant not found")
-    finally:
-        await repo.disconnect()
+    deleted = await repo.delete_variant(variant_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Variant not found")
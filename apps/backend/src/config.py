@@ -14,6 +14,38 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite+aiosqlite:///./mindforge.db"
+    db_pool_readers: int = 4  # Reader connections in the shared pool (plus one writer)
+
+    # SQLite connection profile (applied to every connection)
+    sqlite_journal_mode: str = "wal"
+    sqlite_synchronous: str = "normal"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size: int = -20000  # Negative = KiB, positive = pages
+    sqlite_mmap_size: int = 268435456  # 256 MiB
+    sqlite_temp_store: str = "memory"
+
+    # Random question sampling index (rebuilt on writes, expires as a safety net)
+    sampler_max_age_seconds: float = 300.0
+    # Max age of the content_versions check before a draw (picks up writes
+    # from workers and other processes; 0 checks every draw)
+    sampler_version_check_seconds: float = 1.0
+
+    # Read-through content cache (subjects, clusters, hydrated questions)
+    content_cache_max_entries: int = 5000
+    content_cache_ttl_seconds: float = 300.0
+    # Max age of the content_versions snapshot a cache hit is checked against
+    # (picks up writes from workers and other processes; 0 checks every read)
+    content_cache_version_check_seconds: float = 1.0
+
+    # Task runner (disable the in-API runner when standalone workers are used)
+    task_runner_enabled: bool = True
+    # Concurrency per runner (per-type limits as JSON, e.g. {"generate_variants": 2})
+    task_concurrency: int = 4
+    task_type_concurrency: dict[str, int] = {}
+    # Finished tasks older than this are moved to archive tables (0 keeps them)
+    task_retention_days: int = 30
+    task_archive_batch_size: int = 200
+    task_archive_drop_payloads: bool = False  # Also drop payload / previous_data blobs
 
     # CORS
     cors_origins: list[str] = ["http://localhost:4201"]
@@ -6,10 +6,12 @@ from .circuit_breaker import (
     CircuitState,
     CircuitOpenError,
 )
+from .cache import TTLCache
 
 __all__ = [
     "CircuitBreaker",
     "CircuitBreakerConfig",
     "CircuitState",
     "CircuitOpenError",
+    "TTLCache",
 ]
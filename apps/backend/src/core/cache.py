@@ -0,0 +1,112 @@
+"""Bounded in-process LRU cache with per-entry TTL."""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Counters of a single cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache bounded by entry count, with a time-to-live per entry.
+
+    Not thread-safe; intended for use from a single asyncio event loop,
+    where no await happens between a lookup and its update.
+
+    Usage:
+        cache = TTLCache[str, Subject](name="subjects", max_entries=1000, ttl_seconds=300)
+        subject = cache.get(subject_id)
+        if subject is None:
+            subject = await load(subject_id)
+            cache.set(subject_id, subject)
+    """
+
+    def __init__(self, name: str, max_entries: int = 1000, ttl_seconds: float = 300.0):
+        """Initialize cache.
+
+        Args:
+            name: Name used in statistics
+            max_entries: Maximum number of entries before LRU eviction
+            ttl_seconds: Time after which an entry is considered expired
+        """
+        self.name = name
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Get a value, or None on miss or expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._stats.expirations += 1
+            self._stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        self._entries[key] = (time.monotonic() + self._ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def invalidate(self, key: K) -> None:
+        """Remove a single entry."""
+        if self._entries.pop(key, None) is not None:
+            self._stats.invalidations += 1
+
+    def invalidate_where(self, predicate: Callable[[K, V], bool]) -> int:
+        """Remove all entries matching a predicate. Returns the count removed."""
+        keys = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+        for key in keys:
+            del self._entries[key]
+        self._stats.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._stats.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics for API response."""
+        lookups = self._stats.hits + self._stats.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "ttl_seconds": self._ttl_seconds,
+            "hits": self._stats.hits,
+            "misses": self._stats.misses,
+            "hit_rate": round(self._stats.hits / lookups, 4) if lookups else None,
+            "evictions": self._stats.evictions,
+            "expirations": self._stats.expirations,
+            "invalidations": self._stats.invalidations,
+        }
@@ -1,11 +1,10 @@
 """Generic Circuit Breaker implementation for protecting external service calls."""
 
-import asyncio
 import time
 import logging
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Callable, TypeVar, ParamSpec, Any
+from typing import Callable, TypeVar, ParamSpec
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -23,24 +22,138 @@ class CircuitState(str, Enum):
 
 @dataclass
 class CircuitBreakerConfig:
-    """Configuration for a circuit breaker."""
+    """Configuration for a circuit breaker.
+
+    The circuit opens when, within the last `window_seconds`, at least
+    `minimum_calls` calls were made, at least `failure_threshold` of them
+    failed and the failed share reached `failure_rate_threshold`. Calls
+    slower than `slow_call_seconds` count as failed.
+
+    In half-open, at most `half_open_max_calls` probe calls run at once;
+    further calls are rejected with a `retry_after` of
+    `half_open_retry_seconds`.
+    """
     name: str
-    failure_threshold: int = 5       # Failures before opening
+    failure_threshold: int = 5       # Failures in the window before opening
     success_threshold: int = 2       # Successes in half-open before closing
     timeout_seconds: float = 60.0    # Time in open state before half-open
     excluded_exceptions: tuple = ()  # Exceptions that don't count as failures
+    failure_rate_threshold: float = 0.5    # Failed share of calls that opens
+    minimum_calls: int = 10                # Calls in the window before the rate counts
+    window_seconds: float = 60.0           # Sliding window length
+    window_buckets: int = 6                # Time buckets the window is kept in
+    slow_call_seconds: float | None = None  # Calls at least this slow count as failures
+    half_open_max_calls: int = 1           # Concurrent probe calls in half-open
+    half_open_retry_seconds: float = 1.0   # retry_after for calls rejected in half-open
+
+    def __post_init__(self) -> None:
+        if not 0 < self.failure_rate_threshold <= 1:
+            raise ValueError(
+                f"Invalid failure_rate_threshold for circuit '{self.name}': "
+                f"{self.failure_rate_threshold}"
+            )
+        if self.window_seconds <= 0 or self.window_buckets < 1:
+            raise ValueError(f"Invalid sliding window for circuit '{self.name}'")
+        if self.half_open_max_calls < 1:
+            raise ValueError(
+                f"Invalid half_open_max_calls for circuit '{self.name}': "
+                f"{self.half_open_max_calls}"
+            )
 
 
 @dataclass
 class CircuitBreakerState:
     """Runtime state of a circuit breaker."""
     state: CircuitState = CircuitState.CLOSED
-    failure_count: int = 0
     success_count: int = 0
+    probes_in_flight: int = 0
     last_failure_time: float | None = None
     last_state_change: float = field(default_factory=time.time)
 
 
+@dataclass
+class ProbeStats:
+    """Outcomes and latency of the probe calls made in half-open state."""
+    started: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    rejected: int = 0
+    total_latency: float = 0.0
+    last_latency: float | None = None
+    max_latency: float = 0.0
+
+    def record(self, failed: bool, latency: float) -> None:
+        """Record a finished probe."""
+        if failed:
+            self.failed += 1
+        else:
+            self.succeeded += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def to_dict(self, in_flight: int) -> dict:
+        """Get the stats for API response (latencies in milliseconds)."""
+        finished = self.succeeded + self.failed
+        return {
+            "in_flight": in_flight,
+            "started": self.started,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_latency_ms": round(self.total_latency / finished * 1000, 3) if finished else 0.0,
+            "last_latency_ms": (
+                round(self.last_latency * 1000, 3) if self.last_latency is not None else None
+            ),
+            "max_latency_ms": round(self.max_latency * 1000, 3),
+        }
+
+
+class SlidingWindow:
+    """Call outcomes of the last `window_seconds`, kept in time buckets.
+
+    Each bucket covers `window_seconds / buckets` seconds and is reused
+    (cleared) once its slot comes round again, so recording is O(1) and
+    the window slides in bucket-sized steps.
+    """
+
+    def __init__(self, window_seconds: float, buckets: int):
+        self._width = window_seconds / buckets
+        self._size = buckets
+        self._epochs = [-1] * buckets
+        self._calls = [0] * buckets
+        self._failures = [0] * buckets
+        self._slow = [0] * buckets
+
+    def record(self, failed: bool, slow: bool, now: float) -> None:
+        """Record one call outcome at monotonic time `now`."""
+        epoch = int(now // self._width)
+        index = epoch % self._size
+        if self._epochs[index] != epoch:
+            self._epochs[index] = epoch
+            self._calls[index] = self._failures[index] = self._slow[index] = 0
+        self._calls[index] += 1
+        if failed:
+            self._failures[index] += 1
+        if slow:
+            self._slow[index] += 1
+
+    def totals(self, now: float) -> tuple[int, int, int]:
+        """Get (calls, failures, slow calls) within the window."""
+        oldest = int(now // self._width) - self._size + 1
+        calls = failures = slow = 0
+        for index, epoch in enumerate(self._epochs):
+            if epoch >= oldest:
+                calls += self._calls[index]
+                failures += self._failures[index]
+                slow += self._slow[index]
+        return calls, failures, slow
+
+    def clear(self) -> None:
+        """Forget all recorded calls."""
+        self._epochs = [-1] * self._size
+
+
 class CircuitOpenError(Exception):
     """Raised when circuit breaker is open and blocking calls."""
 
@@ -59,7 +172,13 @@ class CircuitBreaker:
     States:
     - CLOSED: Normal operation, requests pass through
     - OPEN: Service is failing, requests are blocked immediately
-    - HALF_OPEN: Testing if service recovered, limited requests allowed
+    - HALF_OPEN: Testing if service recovered, up to `half_open_max_calls`
+      concurrent probe calls allowed
+
+    While CLOSED, calls pass without any bookkeeping up front; outcomes
+    (failures and slow calls) are counted in a time-bucketed sliding
+    window, and the circuit opens on the failure rate within that window
+    rather than on consecutive failures.
 
     Usage as decorator:
         llm_breaker = CircuitBreaker(CircuitBreakerConfig(name="llm"))
@@ -87,7 +206,11 @@ class CircuitBreaker:
         """
         self.config = config
         self._state = CircuitBreakerState()
-        self._lock = asyncio.Lock()
+        self._window = SlidingWindow(config.window_seconds, config.window_buckets)
+        self._probes = ProbeStats()
+        # Identifies the current half-open period, so probes admitted in an
+        # earlier one don't release slots or decide transitions in this one
+        self._probe_epoch = 0
 
         # Register globally
         CircuitBreaker._registry[config.name] = self
@@ -121,88 +244,183 @@ class CircuitBreaker:
         """Check if circuit is closed (normal operation)."""
         return self._state.state == CircuitState.CLOSED
 
+    @property
+    def retry_after(self) -> float | None:
+        """Seconds until the circuit lets calls through again.
+
+        None unless the circuit is open or half-open with all probe slots taken.
+        """
+        if self._state.state == CircuitState.HALF_OPEN:
+            if self._state.probes_in_flight >= self.config.half_open_max_calls:
+                return self.config.half_open_retry_seconds
+            return None
+        if self._state.state != CircuitState.OPEN or not self._state.last_failure_time:
+            return None
+        elapsed = time.time() - self._state.last_failure_time
+        return max(0.0, self.config.timeout_seconds - elapsed)
+
     def get_status(self) -> dict:
         """Get current status for API response."""
-        retry_after = None
-        if self._state.state == CircuitState.OPEN and self._state.last_failure_time:
-            elapsed = time.time() - self._state.last_failure_time
-            remaining = self.config.timeout_seconds - elapsed
-            retry_after = max(0, remaining)
+        retry_after = self.retry_after
+        calls, failures, slow = self._window.totals(time.monotonic())
 
         return {
             "name": self.config.name,
             "state": self._state.state.value,
-            "failure_count": self._state.failure_count,
+            "failure_count": failures,
             "success_count": self._state.success_count,
             "retry_after_seconds": retry_after,
             "last_state_change": self._state.last_state_change,
+            "window": {
+                "seconds": self.config.window_seconds,
+                "calls": calls,
+                "failures": failures,
+                "slow_calls": slow,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+            },
+            "probes": self._probes.to_dict(self._state.probes_in_flight),
         }
 
-    async def _check_state(self) -> None:
-        """Check and potentially transition state based on timeout."""
-        async with self._lock:
-            if self._state.state == CircuitState.OPEN:
-                # Check if timeout has passed
-                if self._state.last_failure_time:
-                    elapsed = time.time() - self._state.last_failure_time
-                    if elapsed >= self.config.timeout_seconds:
-                        logger.info(
-                            f"Circuit '{self.config.name}' transitioning "
-                            f"OPEN -> HALF_OPEN (timeout elapsed)"
-                        )
-                        self._state.state = CircuitState.HALF_OPEN
-                        self._state.success_count = 0
-                        self._state.last_state_change = time.time()
-
-    async def record_success(self) -> None:
-        """Record a successful call."""
-        async with self._lock:
+    # -------------------------------------------------------------------------
+    # State transitions
+    #
+    # Nothing below awaits, so every check-and-update runs atomically on the
+    # event loop and needs no lock.
+    # -------------------------------------------------------------------------
+
+    def _transition(self, state: CircuitState, reason: str) -> None:
+        """Move to `state`, logging why."""
+        log = logger.warning if state == CircuitState.OPEN else logger.info
+        log(
+            f"Circuit '{self.config.name}' transitioning "
+            f"{self._state.state.name} -> {state.name} ({reason})"
+        )
+        self._state.state = state
+        self._state.success_count = 0
+        self._state.probes_in_flight = 0
+        self._state.last_state_change = time.time()
+        if state == CircuitState.HALF_OPEN:
+            self._probe_epoch += 1
+
+    def _before_call(self) -> int | None:
+        """Admit a call or raise CircuitOpenError.
+
+        Returns:
+            The half-open period the call probes (None for regular calls)
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with all
+                probe slots taken
+        """
+        if self._state.state == CircuitState.CLOSED:
+            return None  # Fast path
+
+        if self._state.state == CircuitState.OPEN:
+            retry_after = self.retry_after
+            if retry_after is not None and retry_after > 0:
+                raise CircuitOpenError(self.config.name, retry_after)
+            self._transition(CircuitState.HALF_OPEN, "timeout elapsed")
+
+        if self._state.probes_in_flight >= self.config.half_open_max_calls:
+            self._probes.rejected += 1
+            raise CircuitOpenError(self.config.name, self.config.half_open_retry_seconds)
+        self._state.probes_in_flight += 1
+        self._probes.started += 1
+        return self._probe_epoch
+
+    def _is_current_probe(self, probe: int | None) -> bool:
+        """Check if a call is a probe of the ongoing half-open period."""
+        return (
+            probe is not None
+            and probe == self._probe_epoch
+            and self._state.state == CircuitState.HALF_OPEN
+        )
+
+    def _release_probe(self, probe: int | None) -> None:
+        """Free the probe slot of a finished or cancelled call."""
+        if self._is_current_probe(probe):
+            self._state.probes_in_flight -= 1
+
+    def _record_outcome(
+        self,
+        failed: bool,
+        duration: float | None = None,
+        probe: int | None = None,
+    ) -> None:
+        """Record a finished call and apply the resulting state change.
+
+        In half-open, only the outcomes of this period's probes move the
+        circuit; calls admitted before it opened are just counted.
+        """
+        slow = (
+            duration is not None
+            and self.config.slow_call_seconds is not None
+            and duration >= self.config.slow_call_seconds
+        )
+        failed = failed or slow
+        self._window.record(failed, slow, time.monotonic())
+
+        if self._is_current_probe(probe):
+            self._state.probes_in_flight -= 1
+            self._probes.record(failed, duration or 0.0)
+        elif self._state.state == CircuitState.HALF_OPEN:
+            return
+
+        if not failed:
             if self._state.state == CircuitState.HALF_OPEN:
                 self._state.success_count += 1
                 if self._state.success_count >= self.config.success_threshold:
-                    logger.info(
-                        f"Circuit '{self.config.name}' transitioning "
-                        f"HALF_OPEN -> CLOSED (success threshold reached)"
-                    )
-                    self._state.state = CircuitState.CLOSED
-                    self._state.failure_count = 0
-                    self._state.success_count = 0
-                    self._state.last_state_change = time.time()
-            elif self._state.state == CircuitState.CLOSED:
-                # Reset failure count on success
-                self._state.failure_count = 0
+                    self._transition(CircuitState.CLOSED, "success threshold reached")
+                    # Failures from before the outage must not re-open it
+                    self._window.clear()
+            return
+
+        self._state.last_failure_time = time.time()
+        reason = "slow call" if slow else "failure"
+
+        if self._state.state == CircuitState.HALF_OPEN:
+            # Any failure in half-open goes back to open
+            self._transition(CircuitState.OPEN, f"{reason} in half-open")
+
+        elif self._state.state == CircuitState.CLOSED:
+            calls, failures, _ = self._window.totals(time.monotonic())
+            if (
+                calls >= self.config.minimum_calls
+                and failures >= self.config.failure_threshold
+                and failures >= calls * self.config.failure_rate_threshold
+            ):
+                self._transition(
+                    CircuitState.OPEN,
+                    f"{failures}/{calls} calls failed within {self.config.window_seconds:g}s",
+                )
+
+    async def record_success(self, duration: float | None = None) -> None:
+        """Record a successful call (slow calls count as failures)."""
+        self._record_outcome(False, duration)
 
     async def record_failure(self, exception: Exception) -> None:
         """Record a failed call."""
+        self._on_exception(exception)
+
+    def _on_exception(
+        self,
+        exception: BaseException,
+        duration: float | None = None,
+        probe: int | None = None,
+    ) -> None:
+        """Record a call that raised (cancellation and excluded exceptions don't count)."""
+        if not isinstance(exception, Exception):
+            self._release_probe(probe)
+            return
         # Check if this exception should be excluded
         if isinstance(exception, self.config.excluded_exceptions):
             logger.debug(
                 f"Circuit '{self.config.name}' ignoring excluded exception: "
                 f"{type(exception).__name__}"
             )
+            self._release_probe(probe)
             return
-
-        async with self._lock:
-            self._state.failure_count += 1
-            self._state.last_failure_time = time.time()
-
-            if self._state.state == CircuitState.HALF_OPEN:
-                # Any failure in half-open goes back to open
-                logger.warning(
-                    f"Circuit '{self.config.name}' transitioning "
-                    f"HALF_OPEN -> OPEN (failure in half-open)"
-                )
-                self._state.state = CircuitState.OPEN
-                self._state.last_state_change = time.time()
-
-            elif self._state.state == CircuitState.CLOSED:
-                if self._state.failure_count >= self.config.failure_threshold:
-                    logger.warning(
-                        f"Circuit '{self.config.name}' transitioning "
-                        f"CLOSED -> OPEN (failure threshold {self.config.failure_threshold} reached)"
-                    )
-                    self._state.state = CircuitState.OPEN
-                    self._state.last_state_change = time.time()
+        self._record_outcome(True, duration, probe)
 
     async def call(
         self,
@@ -224,23 +442,15 @@ class CircuitBreaker:
             CircuitOpenError: If circuit is open
             Exception: If func raises an exception
         """
-        await self._check_state()
-
-        if self._state.state == CircuitState.OPEN:
-            retry_after = None
-            if self._state.last_failure_time:
-                retry_after = self.config.timeout_seconds - (
-                    time.time() - self._state.last_failure_time
-                )
-            raise CircuitOpenError(self.config.name, retry_after)
-
+        probe = self._before_call()
+        started = time.monotonic()
         try:
             result = await func(*args, **kwargs)
-            await self.record_success()
-            return result
-        except Exception as e:
-            await self.record_failure(e)
+        except BaseException as e:
+            self._on_exception(e, time.monotonic() - started, probe)
             raise
+        self._record_outcome(False, time.monotonic() - started, probe)
+        return result
 
     def __call__(
         self,
@@ -263,23 +473,20 @@ class CircuitBreaker:
 
         def __init__(self, breaker: "CircuitBreaker"):
             self._breaker = breaker
+            self._started = 0.0
+            self._probe: int | None = None
 
         async def __aenter__(self) -> "CircuitBreaker._ProtectContext":
-            await self._breaker._check_state()
-            if self._breaker._state.state == CircuitState.OPEN:
-                retry_after = None
-                if self._breaker._state.last_failure_time:
-                    retry_after = self._breaker.config.timeout_seconds - (
-                        time.time() - self._breaker._state.last_failure_time
-                    )
-                raise CircuitOpenError(self._breaker.config.name, retry_after)
+            self._probe = self._breaker._before_call()
+            self._started = time.monotonic()
             return self
 
         async def __aexit__(self, exc_type, exc_val, exc_tb) -> bool:
+            duration = time.monotonic() - self._started
             if exc_val is None:
-                await self._breaker.record_success()
+                self._breaker._record_outcome(False, duration, self._probe)
             else:
-                await self._breaker.record_failure(exc_val)
+                self._breaker._on_exception(exc_val, duration, self._probe)
             return False  # Don't suppress exceptions
 
     def protect(self) -> _ProtectContext:
@@ -297,4 +504,6 @@ class CircuitBreaker:
         Use for testing or administrative override.
         """
         self._state = CircuitBreakerState()
+        self._window.clear()
+        self._probe_epoch += 1  # Probes still running no longer hold a slot
         logger.info(f"Circuit '{self.config.name}' manually reset to CLOSED")
@@ -4,6 +4,15 @@ Provides a unified interface for SQLite (local) and Supabase (production).
 """
 
 from .adapter import DatabaseAdapter
+from .connection import ConnectionProfile, database_path_from_url, open_connection
 from .sqlite_adapter import SQLiteAdapter
+from .pool import SQLiteConnectionPool
 
-__all__ = ["DatabaseAdapter", "SQLiteAdapter"]
+__all__ = [
+    "DatabaseAdapter",
+    "SQLiteAdapter",
+    "SQLiteConnectionPool",
+    "ConnectionProfile",
+    "database_path_from_url",
+    "open_connection",
+]
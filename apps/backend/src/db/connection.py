@@ -0,0 +1,155 @@
+"""SQLite connection profile applied to every connection."""
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+import aiosqlite
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_MODES = {"delete", "truncate", "persist", "memory", "wal", "off"}
+SYNCHRONOUS_MODES = {"off", "normal", "full", "extra"}
+TEMP_STORE_MODES = {"default", "file", "memory"}
+
+# Numeric codes SQLite reports back for synchronous / temp_store
+_SYNCHRONOUS_NAMES = {0: "off", 1: "normal", 2: "full", 3: "extra"}
+_TEMP_STORE_NAMES = {0: "default", 1: "file", 2: "memory"}
+
+
+@dataclass
+class ConnectionProfile:
+    """PRAGMA settings applied to each SQLite connection.
+
+    Defaults favour concurrent readers next to a single busy writer:
+    WAL lets readers proceed while the TaskRunner writes heartbeats and
+    progress, and synchronous=NORMAL is durable in WAL mode except for
+    the last transactions on power loss.
+    """
+
+    journal_mode: str = "wal"
+    synchronous: str = "normal"
+    busy_timeout_ms: int = 5000
+    cache_size: int = -20000         # Negative = KiB, positive = pages
+    mmap_size: int = 268435456       # Bytes, 0 disables memory-mapped I/O
+    temp_store: str = "memory"
+    foreign_keys: bool = True
+
+    def __post_init__(self) -> None:
+        self.journal_mode = self.journal_mode.lower()
+        self.synchronous = self.synchronous.lower()
+        self.temp_store = self.temp_store.lower()
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f"Invalid SQLite journal_mode: {self.journal_mode}")
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid SQLite synchronous mode: {self.synchronous}")
+        if self.temp_store not in TEMP_STORE_MODES:
+            raise ValueError(f"Invalid SQLite temp_store: {self.temp_store}")
+
+    @classmethod
+    def from_settings(cls) -> "ConnectionProfile":
+        """Build the profile from application settings."""
+        return cls(
+            journal_mode=settings.sqlite_journal_mode,
+            synchronous=settings.sqlite_synchronous,
+            busy_timeout_ms=settings.sqlite_busy_timeout_ms,
+            cache_size=settings.sqlite_cache_size,
+            mmap_size=settings.sqlite_mmap_size,
+            temp_store=settings.sqlite_temp_store,
+        )
+
+    def pragmas(self) -> list[str]:
+        """Get the PRAGMA statements for this profile."""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA foreign_keys = {'ON' if self.foreign_keys else 'OFF'}",
+        ]
+
+
+def database_path_from_url(url: str) -> str:
+    """Extract the SQLite database path from a connection URL."""
+    if url.startswith("sqlite+aiosqlite:///"):
+        return url.replace("sqlite+aiosqlite:///", "")
+    if url.startswith("sqlite:///"):
+        return url.replace("sqlite:///", "")
+    raise ValueError(f"Unsupported database URL: {url}")
+
+
+async def open_connection(
+    database_path: str,
+    profile: ConnectionProfile | None = None,
+) -> aiosqlite.Connection:
+    """Open an aiosqlite connection and apply the connection profile.
+
+    Args:
+        database_path: Path to SQLite database file, or ':memory:' for in-memory
+        profile: PRAGMA profile to apply (defaults to the settings profile)
+
+    Returns:
+        Configured connection with dict-like rows
+    """
+    profile = profile or ConnectionProfile.from_settings()
+    conn = await aiosqlite.connect(database_path)
+    conn.row_factory = aiosqlite.Row
+    for pragma in profile.pragmas():
+        await conn.execute(pragma)
+    return conn
+
+
+async def get_effective_pragmas(conn: aiosqlite.Connection) -> dict[str, Any]:
+    """Read back the PRAGMA values SQLite actually applied."""
+    values: dict[str, Any] = {}
+    for name in (
+        "journal_mode", "synchronous", "busy_timeout",
+        "cache_size", "mmap_size", "temp_store", "foreign_keys",
+    ):
+        cursor = await conn.execute(f"PRAGMA {name}")
+        row = await cursor.fetchone()
+        values[name] = row[0] if row else None
+
+    values["synchronous"] = _SYNCHRONOUS_NAMES.get(values["synchronous"], values["synchronous"])
+    values["temp_store"] = _TEMP_STORE_NAMES.get(values["temp_store"], values["temp_store"])
+    values["foreign_keys"] = bool(values["foreign_keys"])
+    return values
+
+
+async def verify_profile(
+    conn: aiosqlite.Connection,
+    profile: ConnectionProfile | None = None,
+) -> dict[str, Any]:
+    """Log the effective connection settings and warn about mismatches.
+
+    SQLite silently ignores some settings (e.g. WAL on ':memory:' databases
+    or mmap on builds without support), so the startup check compares what
+    was requested with what is in effect.
+
+    Returns:
+        Effective PRAGMA values
+    """
+    profile = profile or ConnectionProfile.from_settings()
+    effective = await get_effective_pragmas(conn)
+    logger.info(
+        "SQLite connection profile: "
+        + ", ".join(f"{key}={value}" for key, value in effective.items())
+    )
+
+    expected = {
+        "journal_mode": profile.journal_mode,
+        "synchronous": profile.synchronous,
+        "busy_timeout": profile.busy_timeout_ms,
+        "temp_store": profile.temp_store,
+    }
+    for key, value in expected.items():
+        if str(effective.get(key)).lower() != str(value).lower():
+            logger.warning(
+                f"SQLite setting '{key}' requested {value!r} "
+                f"but effective value is {effective.get(key)!r}"
+            )
+    return effective
@@ -0,0 +1,22 @@
+"""Indexes for keyset-paginated catalog listings.
+
+Adds composite indexes matching the (topic, id) order of cluster
+listings and the (cluster_id, id) order of variant listings, so each
+page is a range scan instead of a sort over the whole table.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m003_catalog_indexes"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Create catalog listing indexes."""
+    await adapter.executescript("""
+        CREATE INDEX idx_clusters_topic ON question_clusters(topic, id);
+        CREATE INDEX idx_clusters_subject_topic ON question_clusters(subject_id, topic, id);
+        CREATE INDEX idx_variants_cluster_id ON question_variants(cluster_id, id);
+    """)
@@ -0,0 +1,45 @@
+"""Content change counters for conditional GETs.
+
+Creates:
+- content_versions: One monotonic counter per content table
+
+Triggers bump the counter of a table on every INSERT, UPDATE and DELETE,
+so writes from the API, the task runner and other processes are all
+covered. The API derives ETags from these counters.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m004_content_versions"
+
+CONTENT_TABLES = ("subjects", "question_clusters", "question_variants", "answers")
+
+
+def _triggers(table: str) -> str:
+    return "\n".join(
+        f"""
+        CREATE TRIGGER trg_{table}_version_{event.lower()}
+        AFTER {event} ON {table}
+        BEGIN
+            UPDATE content_versions SET version = version + 1 WHERE table_name = '{table}';
+        END;"""
+        for event in ("INSERT", "UPDATE", "DELETE")
+    )
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Create content version counters and their triggers."""
+    seed = ",\n".join(f"            ('{table}', 0)" for table in CONTENT_TABLES)
+    await adapter.executescript(f"""
+        CREATE TABLE content_versions (
+            table_name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        );
+
+        INSERT INTO content_versions (table_name, version) VALUES
+{seed};
+        {"".join(_triggers(table) for table in CONTENT_TABLES)}
+    """)
@@ -0,0 +1,24 @@
+"""Lease columns for atomic task claims.
+
+Adds to generation_tasks:
+- lease_owner: ID of the worker that claimed the task
+- lease_expires_at: Claim is considered abandoned after this time
+  unless renewed by the owner's heartbeat
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m005_task_leases"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Add lease columns to generation_tasks."""
+    await adapter.executescript("""
+        ALTER TABLE generation_tasks ADD COLUMN lease_owner TEXT;
+        ALTER TABLE generation_tasks ADD COLUMN lease_expires_at TEXT;
+
+        CREATE INDEX idx_tasks_status_lease ON generation_tasks(status, lease_expires_at);
+    """)
@@ -0,0 +1,32 @@
+"""Registry of task worker processes.
+
+Creates:
+- task_workers: One row per TaskRunner (in-API or standalone worker),
+  refreshed by its heartbeat; lease_owner in generation_tasks refers
+  to task_workers.id
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m006_task_workers"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Create task worker registry."""
+    await adapter.executescript("""
+        CREATE TABLE task_workers (
+            id TEXT PRIMARY KEY,
+            hostname TEXT NOT NULL,
+            pid INTEGER NOT NULL,
+            concurrency INTEGER NOT NULL,
+            running_tasks INTEGER NOT NULL DEFAULT 0,
+            started_at TEXT NOT NULL,
+            heartbeat_at TEXT,
+            stopped_at TEXT
+        );
+
+        CREATE INDEX idx_task_workers_heartbeat ON task_workers(heartbeat_at);
+    """)
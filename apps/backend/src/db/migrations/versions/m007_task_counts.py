@@ -0,0 +1,58 @@
+"""Maintained task counters for cheap list totals.
+
+Creates:
+- task_counts: Number of tasks per (status, task_type)
+
+Triggers keep the counters in sync on INSERT, DELETE and on UPDATEs
+that change status or task_type, so totals for GET /tasks no longer
+need a COUNT(*) over generation_tasks.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m007_task_counts"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Create task counters, seed them and install triggers."""
+    await adapter.executescript("""
+        CREATE TABLE task_counts (
+            status TEXT NOT NULL,
+            task_type TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (status, task_type)
+        );
+
+        INSERT INTO task_counts (status, task_type, count)
+        SELECT status, task_type, COUNT(*) FROM generation_tasks
+        GROUP BY status, task_type;
+
+        CREATE TRIGGER trg_task_counts_insert
+        AFTER INSERT ON generation_tasks
+        BEGIN
+            INSERT INTO task_counts (status, task_type, count)
+            VALUES (new.status, new.task_type, 1)
+            ON CONFLICT (status, task_type) DO UPDATE SET count = count + 1;
+        END;
+
+        CREATE TRIGGER trg_task_counts_delete
+        AFTER DELETE ON generation_tasks
+        BEGIN
+            UPDATE task_counts SET count = count - 1
+            WHERE status = old.status AND task_type = old.task_type;
+        END;
+
+        CREATE TRIGGER trg_task_counts_update
+        AFTER UPDATE OF status, task_type ON generation_tasks
+        WHEN old.status IS NOT new.status OR old.task_type IS NOT new.task_type
+        BEGIN
+            UPDATE task_counts SET count = count - 1
+            WHERE status = old.status AND task_type = old.task_type;
+            INSERT INTO task_counts (status, task_type, count)
+            VALUES (new.status, new.task_type, 1)
+            ON CONFLICT (status, task_type) DO UPDATE SET count = count + 1;
+        END;
+    """)
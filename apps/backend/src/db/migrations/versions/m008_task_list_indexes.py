@@ -0,0 +1,24 @@
+"""Indexes for keyset-paginated task listings.
+
+Task lists are ordered by (created_at DESC, id DESC). These composite
+indexes let each page (optionally filtered by status or task type) be
+a range scan from the cursor instead of an OFFSET walk. The plain
+created_at index is superseded by the (created_at, id) one.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m008_task_list_indexes"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Create task listing indexes."""
+    await adapter.executescript("""
+        DROP INDEX IF EXISTS idx_tasks_created;
+        CREATE INDEX idx_tasks_created_id ON generation_tasks(created_at, id);
+        CREATE INDEX idx_tasks_status_created_id ON generation_tasks(status, created_at, id);
+        CREATE INDEX idx_tasks_type_created_id ON generation_tasks(task_type, created_at, id);
+    """)
@@ -0,0 +1,59 @@
+"""Archive tables for finished tasks.
+
+Creates:
+- archived_tasks: Finished generation_tasks moved out of the hot queue
+  table by the retention job (payload may be dropped)
+- archived_task_content_log: Their content log entries (previous_data
+  may be dropped)
+
+Archived rows keep their IDs, so tasks stay retrievable by ID.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m009_task_archive"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Create task archive tables."""
+    await adapter.executescript("""
+        CREATE TABLE archived_tasks (
+            id TEXT PRIMARY KEY,
+            task_type TEXT NOT NULL,
+            status TEXT NOT NULL,
+            payload TEXT,
+            user_context TEXT,
+            created_at TEXT,
+            delayed_until TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            progress_current INTEGER DEFAULT 0,
+            progress_total INTEGER DEFAULT 0,
+            progress_message TEXT,
+            heartbeat_at TEXT,
+            error_message TEXT,
+            retry_count INTEGER DEFAULT 0,
+            max_retries INTEGER DEFAULT 3,
+            accepted_at TEXT,
+            reverted_at TEXT,
+            lease_owner TEXT,
+            lease_expires_at TEXT,
+            archived_at TEXT NOT NULL
+        );
+
+        CREATE TABLE archived_task_content_log (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            entity_type TEXT NOT NULL,
+            entity_id TEXT NOT NULL,
+            action TEXT NOT NULL,
+            previous_data TEXT,
+            created_at TEXT
+        );
+
+        CREATE INDEX idx_archived_tasks_archived ON archived_tasks(archived_at);
+        CREATE INDEX idx_archived_content_log_task ON archived_task_content_log(task_id);
+    """)
@@ -0,0 +1,97 @@
+"""Maintained rollups of LLM usage.
+
+Creates:
+- llm_usage_hourly: Requests, tokens and cost per hour
+- llm_usage_daily: Requests, tokens and cost per day
+
+Both are keyed by (bucket, provider, model, source_type); a missing
+source_type is stored as ''. A trigger on llm_usage_log keeps them in
+sync in the same transaction as the insert, so usage dashboards read a
+few rollup rows instead of scanning raw log rows.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m010_llm_usage_rollups"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Create usage rollup tables, seed them and install the trigger."""
+    await adapter.executescript("""
+        CREATE TABLE llm_usage_hourly (
+            bucket TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            source_type TEXT NOT NULL DEFAULT '',
+            requests INTEGER NOT NULL DEFAULT 0,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            cost_cents INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket, provider, model, source_type)
+        );
+
+        CREATE TABLE llm_usage_daily (
+            bucket TEXT NOT NULL,
+            provider TEXT NOT NULL,
+            model TEXT NOT NULL,
+            source_type TEXT NOT NULL DEFAULT '',
+            requests INTEGER NOT NULL DEFAULT 0,
+            prompt_tokens INTEGER NOT NULL DEFAULT 0,
+            completion_tokens INTEGER NOT NULL DEFAULT 0,
+            total_tokens INTEGER NOT NULL DEFAULT 0,
+            cost_cents INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket, provider, model, source_type)
+        );
+
+        INSERT INTO llm_usage_hourly
+            (bucket, provider, model, source_type, requests,
+             prompt_tokens, completion_tokens, total_tokens, cost_cents)
+        SELECT strftime('%Y-%m-%dT%H:00:00', created_at), provider, model,
+               COALESCE(source_type, ''), COUNT(*), SUM(prompt_tokens),
+               SUM(completion_tokens), SUM(total_tokens), COALESCE(SUM(cost_cents), 0)
+        FROM llm_usage_log
+        GROUP BY 1, 2, 3, 4;
+
+        INSERT INTO llm_usage_daily
+            (bucket, provider, model, source_type, requests,
+             prompt_tokens, completion_tokens, total_tokens, cost_cents)
+        SELECT date(created_at), provider, model,
+               COALESCE(source_type, ''), COUNT(*), SUM(prompt_tokens),
+               SUM(completion_tokens), SUM(total_tokens), COALESCE(SUM(cost_cents), 0)
+        FROM llm_usage_log
+        GROUP BY 1, 2, 3, 4;
+
+        CREATE TRIGGER trg_llm_usage_rollups
+        AFTER INSERT ON llm_usage_log
+        BEGIN
+            INSERT INTO llm_usage_hourly
+                (bucket, provider, model, source_type, requests,
+                 prompt_tokens, completion_tokens, total_tokens, cost_cents)
+            VALUES (strftime('%Y-%m-%dT%H:00:00', new.created_at), new.provider, new.model,
+                    COALESCE(new.source_type, ''), 1, new.prompt_tokens,
+                    new.completion_tokens, new.total_tokens, COALESCE(new.cost_cents, 0))
+            ON CONFLICT (bucket, provider, model, source_type) DO UPDATE SET
+                requests = requests + 1,
+                prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                completion_tokens = completion_tokens + excluded.completion_tokens,
+                total_tokens = total_tokens + excluded.total_tokens,
+                cost_cents = cost_cents + excluded.cost_cents;
+
+            INSERT INTO llm_usage_daily
+                (bucket, provider, model, source_type, requests,
+                 prompt_tokens, completion_tokens, total_tokens, cost_cents)
+            VALUES (date(new.created_at), new.provider, new.model,
+                    COALESCE(new.source_type, ''), 1, new.prompt_tokens,
+                    new.completion_tokens, new.total_tokens, COALESCE(new.cost_cents, 0))
+            ON CONFLICT (bucket, provider, model, source_type) DO UPDATE SET
+                requests = requests + 1,
+                prompt_tokens = prompt_tokens + excluded.prompt_tokens,
+                completion_tokens = completion_tokens + excluded.completion_tokens,
+                total_tokens = total_tokens + excluded.total_tokens,
+                cost_cents = cost_cents + excluded.cost_cents;
+        END;
+    """)
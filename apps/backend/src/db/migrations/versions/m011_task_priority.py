@@ -0,0 +1,26 @@
+"""Priority lanes for the task queue.
+
+Adds to generation_tasks (and archived_tasks):
+- priority: Lane of the task (0 = low, 1 = normal, 2 = high)
+
+The claim index serves the per-type candidate lookups of the fair
+scheduler: pending tasks of one type, highest lane first, oldest first.
+"""
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ...adapter import DatabaseAdapter
+
+NAME = "m011_task_priority"
+
+
+async def up(adapter: "DatabaseAdapter") -> None:
+    """Add priority columns and the claim index."""
+    await adapter.executescript("""
+        ALTER TABLE generation_tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 1;
+        ALTER TABLE archived_tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 1;
+
+        CREATE INDEX idx_tasks_claim_lanes
+            ON generation_tasks(status, task_type, priority DESC, created_at);
+    """)
@@ -0,0 +1,192 @@
+"""Application-scoped SQLite connection pool."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+import aiosqlite
+
+from .connection import ConnectionProfile, open_connection, verify_profile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PoolStats:
+    """Wait-time counters for one side (readers or writer) of the pool."""
+
+    acquisitions: int = 0
+    waits: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    def record(self, wait_seconds: float) -> None:
+        """Record a single acquisition and how long it waited."""
+        self.acquisitions += 1
+        if wait_seconds > 0.001:
+            self.waits += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+    def to_dict(self) -> dict:
+        """Serialize for API responses."""
+        avg = self.total_wait_seconds / self.acquisitions if self.acquisitions else 0.0
+        return {
+            "acquisitions": self.acquisitions,
+            "waits": self.waits,
+            "avg_wait_ms": round(avg * 1000, 3),
+            "max_wait_ms": round(self.max_wait_seconds * 1000, 3),
+        }
+
+
+class SQLiteConnectionPool:
+    """Pool of long-lived aiosqlite connections shared by the whole app.
+
+    SQLite allows many concurrent readers but only one writer, so the pool
+    keeps a fixed set of reader connections and exactly one writer
+    connection guarded by a lock. Opening happens once in the FastAPI
+    lifespan; repositories borrow connections per operation instead of
+    paying the aiosqlite thread start-up and PRAGMA cost per request.
+
+    Usage:
+        pool = SQLiteConnectionPool("./mindforge.db", readers=4)
+        await pool.open()
+
+        async with pool.reader() as conn:
+            cursor = await conn.execute("SELECT ...")
+
+        async with pool.writer() as conn:
+            await conn.execute("INSERT ...")
+            await conn.commit()
+
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        readers: int = 4,
+        profile: ConnectionProfile | None = None,
+    ):
+        """Initialize connection pool.
+
+        Args:
+            database_path: Path to SQLite database file, or ':memory:' for in-memory
+            readers: Number of reader connections. In-memory databases are
+                     private per connection, so readers fall back to the writer.
+            profile: PRAGMA profile for every connection (defaults to settings)
+        """
+        self._database_path = database_path
+        self._profile = profile or ConnectionProfile.from_settings()
+        self._effective_pragmas: dict | None = None
+        self._reader_count = 0 if database_path == ":memory:" else max(0, readers)
+        self._readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        self._all_readers: list[aiosqlite.Connection] = []
+        self._writer: aiosqlite.Connection | None = None
+        self._writer_lock = asyncio.Lock()
+        self._reader_stats = PoolStats()
+        self._writer_stats = PoolStats()
+
+    @property
+    def database_path(self) -> str:
+        """Path of the database served by this pool."""
+        return self._database_path
+
+    @property
+    def is_open(self) -> bool:
+        """Check if the pool has been opened."""
+        return self._writer is not None
+
+    async def open(self) -> None:
+        """Open the writer and all reader connections."""
+        if self._writer is not None:
+            return
+        # Writer first: switching journal_mode to WAL needs a write lock
+        self._writer = await open_connection(self._database_path, self._profile)
+        for _ in range(self._reader_count):
+            conn = await open_connection(self._database_path, self._profile)
+            self._all_readers.append(conn)
+            self._readers.put_nowait(conn)
+        logger.info(
+            f"Connection pool opened for '{self._database_path}' "
+            f"({self._reader_count} readers, 1 writer)"
+        )
+
+    async def close(self) -> None:
+        """Close all connections."""
+        for conn in self._all_readers:
+            await conn.close()
+        self._all_readers.clear()
+        self._readers = asyncio.Queue()
+        if self._writer is not None:
+            await self._writer.close()
+            self._writer = None
+        logger.info("Connection pool closed")
+
+    async def verify_profile(self) -> dict:
+        """Log and remember the effective connection settings (startup check)."""
+        async with self.writer() as conn:
+            self._effective_pragmas = await verify_profile(conn, self._profile)
+        return self._effective_pragmas
+
+    def _ensure_open(self) -> aiosqlite.Connection:
+        """Ensure the pool is open and return the writer connection."""
+        if self._writer is None:
+            raise RuntimeError("Connection pool not open. Call open() first.")
+        return self._writer
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow a reader connection for the duration of the block."""
+        self._ensure_open()
+        if self._reader_count == 0:
+            async with self.writer() as conn:
+                yield conn
+            return
+
+        started = time.perf_counter()
+        conn = await self._readers.get()
+        self._reader_stats.record(time.perf_counter() - started)
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Hold the single writer connection for the duration of the block.
+
+        Any transaction left open by a failing block is rolled back so the
+        next holder never commits someone else's partial work.
+        """
+        conn = self._ensure_open()
+        started = time.perf_counter()
+        async with self._writer_lock:
+            self._writer_stats.record(time.perf_counter() - started)
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    await conn.rollback()
+                raise
+
+    def get_stats(self) -> dict:
+        """Get pool size and wait-time metrics for API response."""
+        return {
+            "database": self._database_path,
+            "open": self.is_open,
+            "pragmas": self._effective_pragmas,
+            "readers": {
+                "size": self._reader_count,
+                "available": self._readers.qsize(),
+                **self._reader_stats.to_dict(),
+            },
+            "writer": {
+                "size": 1,
+                "locked": self._writer_lock.locked(),
+                **self._writer_stats.to_dict(),
+            },
+        }
@@ -1,9 +1,12 @@
 """SQLite database adapter implementation."""
 
 import aiosqlite
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 from .adapter import DatabaseAdapter
+from .connection import open_connection
+from .pool import SQLiteConnectionPool
 
 
 class SQLiteAdapter(DatabaseAdapter):
@@ -13,21 +16,24 @@ class SQLiteAdapter(DatabaseAdapter):
     Suitable for local development and testing.
     """
 
-    def __init__(self, database_path: str):
+    def __init__(self, database_path: str, pool: SQLiteConnectionPool | None = None):
         """Initialize SQLite adapter.
 
         Args:
             database_path: Path to SQLite database file, or ':memory:' for in-memory
+            pool: Optional shared connection pool. When given, connections are
+                  borrowed from the pool and connect()/disconnect() are no-ops.
         """
         self._database_path = database_path
+        self._pool = pool
         self._connection: aiosqlite.Connection | None = None
 
     async def connect(self) -> None:
         """Establish database connection."""
+        if self._pool is not None:
+            return  # Connections are owned by the pool
         if self._connection is None:
-            self._connection = await aiosqlite.connect(self._database_path)
-            self._connection.row_factory = aiosqlite.Row
-            await self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection = await open_connection(self._database_path)
 
     async def disconnect(self) -> None:
         """Close database connection."""
@@ -41,47 +47,65 @@ class SQLiteAdapter(DatabaseAdapter):
             raise RuntimeError("Database not connected. Call connect() first.")
         return self._connection
 
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get a connection for read-only queries."""
+        if self._pool is not None:
+            async with self._pool.reader() as conn:
+                yield conn
+        else:
+            yield self._ensure_connected()
+
+    @asynccontextmanager
+    async def _writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get the connection for statements that modify data."""
+        if self._pool is not None:
+            async with self._pool.writer() as conn:
+                yield conn
+        else:
+            yield self._ensure_connected()
+
     async def execute(self, sql: str, params: tuple | None = None) -> None:
         """Execute a single SQL statement."""
-        conn = self._ensure_connected()
-        if params:
-            await conn.execute(sql, params)
-        else:
-            await conn.execute(sql)
-        await conn.commit()
+        async with self._writer() as conn:
+            if params:
+                await conn.execute(sql, params)
+            else:
+                await conn.execute(sql)
+            await conn.commit()
 
     async def execute_many(self, sql: str, params_list: list[tuple]) -> None:
         """Execute a SQL statement with multiple parameter sets."""
-        conn = self._ensure_connected()
-        await conn.executemany(sql, params_list)
-        await conn.commit()
+        async with self._writer() as conn:
+            await conn.executemany(sql, params_list)
+            await conn.commit()
 
     async def executescript(self, sql: str) -> None:
         """Execute multiple SQL statements as a script."""
-        conn = self._ensure_connected()
-        await conn.executescript(sql)
-        await conn.commit()
+        async with self._writer() as conn:
+            await conn.executescript(sql)
+            await conn.commit()
 
     async def fetch_one(self, sql: str, params: tuple | None = None) -> dict[str, Any] | None:
         """Fetch a single row as a dictionary."""
-        conn = self._ensure_connected()
-        if params:
-            cursor = await conn.execute(sql, params)
-        else:
-            cursor = await conn.execute(sql)
-        row = await cursor.fetchone()
+        async with self._reader() as conn:
+            if params:
+                cursor = await conn.execute(sql, params)
+            else:
+                cursor = await conn.execute(sql)
+            row = await cursor.fetchone()
         if row is None:
             return None
         return dict(row)
 
     async def fetch_all(self, sql: str, params: tuple | None = None) -> list[dict[str, Any]]:
         """Fetch all rows as a list of dictionaries."""
-        conn = self._ensure_connected()
-        if params:
-            cursor = await conn.execute(sql, params)
-        else:
-            cursor = await conn.execute(sql)
-        rows = await cursor.fetchall()
+        async with self._reader() as conn:
+            if params:
+                cursor = await conn.execute(sql, params)
+            else:
+                cursor = await conn.execute(sql)
+            rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
     async def table_exists(self, table_name: str) -> bool:
@@ -6,42 +6,67 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import settings
-from .api.routes import health, migrations, subjects, clusters, variants, answers, tasks
-from .repositories import SQLiteTaskRepository
-from .tasks import TaskRunner
+from .api.routes import (
+    health, migrations, subjects, clusters, variants, answers, questions, tasks, usage,
+)
+from .db import SQLiteConnectionPool, database_path_from_url
+from .repositories import (
+    CachedContentRepository,
+    ContentCache,
+    SQLiteContentRepository,
+    SQLiteTaskRepository,
+    SQLiteUsageRepository,
+)
+from .tasks import TaskRunner, UsageRecorder
 
 # Global task runner instance
 task_runner: TaskRunner | None = None
 
 
-def _get_database_path() -> str:
-    """Extract SQLite database path from connection URL."""
-    url = settings.database_url
-    if url.startswith("sqlite+aiosqlite:///"):
-        return url.replace("sqlite+aiosqlite:///", "")
-    if url.startswith("sqlite:///"):
-        return url.replace("sqlite:///", "")
-    raise ValueError(f"Unsupported database URL: {url}")
-
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup/shutdown.
 
-    Starts the task runner on startup and stops it gracefully on shutdown.
+    Opens the shared connection pool, creates the content cache and LLM
+    usage recorder and starts the task runner on startup (unless disabled
+    in favour of standalone workers); stops the runner, flushes recorded
+    usage and closes the pool on shutdown.
     """
     global task_runner
 
     # Startup
-    repo = SQLiteTaskRepository(_get_database_path())
-    task_runner = TaskRunner(repo)
-    await task_runner.start()
+    pool = SQLiteConnectionPool(
+        database_path_from_url(settings.database_url), readers=settings.db_pool_readers
+    )
+    await pool.open()
+    await pool.verify_profile()
+    app.state.db_pool = pool
+    app.state.content_cache = ContentCache.from_settings()
+    app.state.usage_recorder = UsageRecorder(SQLiteUsageRepository(pool.database_path, pool=pool))
+
+    if settings.task_runner_enabled:
+        repo = SQLiteTaskRepository(pool.database_path, pool=pool)
+        task_runner = TaskRunner(
+            repo,
+            content_cache=app.state.content_cache,
+            content_repository=CachedContentRepository(
+                SQLiteContentRepository(pool.database_path, pool=pool),
+                app.state.content_cache,
+            ),
+            usage_recorder=app.state.usage_recorder,
+        )
+        await task_runner.start()
+    app.state.task_runner = task_runner
 
     yield
 
     # Shutdown
     if task_runner:
         await task_runner.stop()
+        task_runner = None
+    app.state.task_runner = None
+    await app.state.usage_recorder.close()
+    await pool.close()
 
 
 app = FastAPI(
@@ -58,6 +83,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursor and conditional GET validators must be readable by the frontend
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # Include routers
@@ -67,7 +94,9 @@ app.include_router(subjects.router)
 app.include_router(clusters.router)
 app.include_router(variants.router)
 app.include_router(answers.router)
+app.include_router(questions.router)
 app.include_router(tasks.router)
+app.include_router(usage.router)
 
 
 @app.get("/")
@@ -10,12 +10,16 @@ from .content import (
 from .tasks import (
     TaskStatus,
     TaskType,
+    TaskPriority,
     ContentAction,
     GenerationTask,
     TaskContentLog,
+    TaskWorker,
     LLMUsageLog,
+    LLMUsageRollup,
     TaskCreate,
     TaskResponse,
+    TaskSummary,
     TaskListResponse,
     RevertResponse,
 )
@@ -30,12 +34,16 @@ __all__ = [
     # Task models
     "TaskStatus",
     "TaskType",
+    "TaskPriority",
     "ContentAction",
     "GenerationTask",
     "TaskContentLog",
+    "TaskWorker",
     "LLMUsageLog",
+    "LLMUsageRollup",
     "TaskCreate",
     "TaskResponse",
+    "TaskSummary",
     "TaskListResponse",
     "RevertResponse",
 ]
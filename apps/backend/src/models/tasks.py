@@ -2,7 +2,7 @@
 
 from pydantic import BaseModel, Field
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
 from typing import Any
 from uuid import uuid4
 
@@ -26,6 +26,14 @@ class TaskType(str, Enum):
     GENERATE_CLUSTERS = "generate_clusters"
     GENERATE_VARIANTS = "generate_variants"
     REGENERATE_ANSWERS = "regenerate_answers"
+    REVERT_TASK = "revert_task"
+
+
+class TaskPriority(IntEnum):
+    """Priority lane of a task (higher runs first)."""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
 
 
 class ContentAction(str, Enum):
@@ -44,8 +52,9 @@ class GenerationTask(BaseModel):
     id: str = Field(default_factory=generate_uuid)
     task_type: TaskType
     status: TaskStatus = TaskStatus.PENDING
+    priority: TaskPriority = TaskPriority.NORMAL
     payload: dict[str, Any]
-    user_context: str | None = None
+    user_context: str | None = None  # Submitter; the scheduler shares slots fairly between them
 
     # Scheduling
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -59,6 +68,10 @@ class GenerationTask(BaseModel):
     progress_message: str | None = None
     heartbeat_at: datetime | None = None
 
+    # Lease (set by the worker that claimed the task)
+    lease_owner: str | None = None
+    lease_expires_at: datetime | None = None
+
     # Error handling
     error_message: str | None = None
     retry_count: int = 0
@@ -68,6 +81,9 @@ class GenerationTask(BaseModel):
     accepted_at: datetime | None = None
     reverted_at: datetime | None = None
 
+    # Set once moved to the archive by the retention job (read-only)
+    archived_at: datetime | None = None
+
 
 class TaskContentLog(BaseModel):
     """Log entry for content created/modified by a task."""
@@ -81,6 +97,19 @@ class TaskContentLog(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class TaskWorker(BaseModel):
+    """A task runner process (in-API or standalone worker)."""
+
+    id: str
+    hostname: str
+    pid: int
+    concurrency: int
+    running_tasks: int = 0
+    started_at: datetime = Field(default_factory=datetime.utcnow)
+    heartbeat_at: datetime | None = None
+    stopped_at: datetime | None = None
+
+
 class LLMUsageLog(BaseModel):
     """Log entry for LLM API usage."""
 
@@ -96,6 +125,20 @@ class LLMUsageLog(BaseModel):
     source_id: str | None = None
 
 
+class LLMUsageRollup(BaseModel):
+    """Aggregated LLM usage of one bucket (hour or day) or of a whole range."""
+
+    bucket: str | None = None  # 'YYYY-MM-DDTHH:00:00' (hour), 'YYYY-MM-DD' (day)
+    provider: str
+    model: str
+    source_type: str | None = None
+    requests: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cost_cents: int
+
+
 # --- API Models ---
 
 
@@ -106,6 +149,7 @@ class TaskCreate(BaseModel):
     payload: dict[str, Any]
     user_context: str | None = None
     delayed_until: datetime | None = None
+    priority: TaskPriority = TaskPriority.NORMAL
 
 
 class TaskResponse(BaseModel):
@@ -114,6 +158,7 @@ class TaskResponse(BaseModel):
     id: str
     task_type: TaskType
     status: TaskStatus
+    priority: TaskPriority = TaskPriority.NORMAL
     payload: dict[str, Any]
     user_context: str | None
 
@@ -126,21 +171,53 @@ class TaskResponse(BaseModel):
     progress_total: int
     progress_message: str | None
 
+    lease_owner: str | None = None
+    lease_expires_at: datetime | None = None
+
     error_message: str | None
     retry_count: int
     max_retries: int
 
     accepted_at: datetime | None
     reverted_at: datetime | None
+    archived_at: datetime | None = None
 
     content_log: list[TaskContentLog] = []
 
 
+class TaskSummary(BaseModel):
+    """List view of a task: no payload, user context or content log."""
+
+    id: str
+    task_type: TaskType
+    status: TaskStatus
+    priority: TaskPriority = TaskPriority.NORMAL
+
+    created_at: datetime
+    delayed_until: datetime | None = None
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+
+    progress_current: int = 0
+    progress_total: int = 0
+    progress_message: str | None = None
+
+    lease_owner: str | None = None
+
+    error_message: str | None = None
+    retry_count: int = 0
+    max_retries: int = 3
+
+    accepted_at: datetime | None = None
+    reverted_at: datetime | None = None
+
+
 class TaskListResponse(BaseModel):
     """Response model for task list."""
 
-    tasks: list[TaskResponse]
+    tasks: list[TaskSummary]
     total: int
+    next_cursor: str | None = None  # Pass as `cursor` to get the next page
 
 
 class RevertResponse(BaseModel):
@@ -148,5 +225,6 @@ class RevertResponse(BaseModel):
 
     id: str
     status: TaskStatus
-    reverted_at: datetime
+    reverted_at: datetime | None = None  # Set once the revert task finished
     reverted_count: dict[str, int]  # e.g., {"clusters": 3, "variants": 15}
+    revert_task_id: str  # Background revert_task doing the work
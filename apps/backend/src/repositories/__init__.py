@@ -2,12 +2,23 @@
 
 from .content_repository import ContentRepository
 from .sqlite_content_repository import SQLiteContentRepository
+from .cached_content_repository import CachedContentRepository, ContentCache
 from .task_repository import TaskRepository
 from .sqlite_task_repository import SQLiteTaskRepository
+from .usage_repository import UsageRepository
+from .sqlite_usage_repository import SQLiteUsageRepository
+from .pagination import Page
+from .sampling import QuestionSampler
 
 __all__ = [
     "ContentRepository",
     "SQLiteContentRepository",
+    "CachedContentRepository",
+    "ContentCache",
     "TaskRepository",
     "SQLiteTaskRepository",
+    "UsageRepository",
+    "SQLiteUsageRepository",
+    "Page",
+    "QuestionSampler",
 ]
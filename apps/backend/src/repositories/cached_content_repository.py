@@ -0,0 +1,524 @@
+"""Read-through caching decorator for ContentRepository."""
+
+import logging
+import time
+from typing import Any, Callable, Sequence
+
+from .content_repository import ContentRepository
+from .pagination import Page
+from ..core.cache import TTLCache
+from ..models.content import (
+    Subject,
+    QuestionCluster,
+    QuestionVariant,
+    Answer,
+    QuestionWithAnswers,
+)
+from ..models.tasks import TaskContentLog
+
+logger = logging.getLogger(__name__)
+
+_ALL_SUBJECTS = "__all__"
+
+
+class ContentCache:
+    """Process-wide caches for rarely changing, frequently read content.
+
+    Holds subjects, clusters and hydrated questions. Entries are removed
+    precisely when the entity (or anything embedded in it) is written,
+    either through CachedContentRepository or via invalidate_entity()
+    for content changes made by background tasks.
+
+    Writes from other processes (standalone workers, a second API
+    process) are picked up through the `content_versions` counters:
+    sync_versions() drops every entry built from a table whose counter
+    moved since the last sync, so an entry is never older than the
+    versions an ETag was derived from. Cached reads re-read the counters
+    once they are older than `version_check_seconds`.
+
+    Cached values are returned as deep copies, so callers may modify
+    what they get (as the update routes do) without corrupting the cache.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        ttl_seconds: float = 300.0,
+        version_check_seconds: float = 1.0,
+    ):
+        """Initialize content cache.
+
+        Args:
+            max_entries: Maximum entries per cache (LRU eviction)
+            ttl_seconds: Time-to-live per entry
+            version_check_seconds: Max age of the content_versions snapshot
+                                   cached reads are served against
+        """
+        self.subjects: TTLCache[str, Subject] = TTLCache("subjects", max_entries, ttl_seconds)
+        self.subject_keys: TTLCache[str, Subject] = TTLCache("subject_keys", max_entries, ttl_seconds)
+        self.subject_lists: TTLCache[str, list[Subject]] = TTLCache("subject_lists", 1, ttl_seconds)
+        self.clusters: TTLCache[str, QuestionCluster] = TTLCache("clusters", max_entries, ttl_seconds)
+        self.questions: TTLCache[str, QuestionWithAnswers] = TTLCache(
+            "questions", max_entries, ttl_seconds
+        )
+        self._generation = 0
+        self._versions: dict[str, int] = {}
+        self._version_check_seconds = version_check_seconds
+        self._versions_checked_at: float | None = None
+
+    @classmethod
+    def from_settings(cls) -> "ContentCache":
+        """Build the cache from application settings."""
+        from ..config import settings
+
+        return cls(
+            max_entries=settings.content_cache_max_entries,
+            ttl_seconds=settings.content_cache_ttl_seconds,
+            version_check_seconds=settings.content_cache_version_check_seconds,
+        )
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation."""
+        return self._generation
+
+    def store(self, cache: TTLCache, key: str, value, generation: int) -> None:
+        """Fill a cache entry unless an invalidation happened since `generation`.
+
+        Read-through fills await the data store; a write finishing in the
+        meantime must not be overwritten by the value read before it.
+        """
+        if generation == self._generation:
+            cache.set(key, value)
+
+    # -------------------------------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------------------------------
+
+    def invalidate_subject(self, subject_id: str) -> None:
+        """Drop a subject and every cached question embedding it."""
+        self._generation += 1
+        self.subjects.invalidate(subject_id)
+        self.subject_keys.invalidate_where(lambda _, s: s.id == subject_id)
+        self.subject_lists.clear()
+        self.questions.invalidate_where(
+            lambda _, q: q.subject is not None and q.subject.id == subject_id
+        )
+
+    def invalidate_cluster(self, cluster_id: str) -> None:
+        """Drop a cluster and every cached question embedding it."""
+        self._generation += 1
+        self.clusters.invalidate(cluster_id)
+        self.questions.invalidate_where(
+            lambda _, q: q.cluster is not None and q.cluster.id == cluster_id
+        )
+
+    def invalidate_variant(self, variant_id: str) -> None:
+        """Drop the cached question of a variant."""
+        self._generation += 1
+        self.questions.invalidate(variant_id)
+
+    def invalidate_answer(self, answer_id: str, variant_id: str | None = None) -> None:
+        """Drop every cached question containing an answer."""
+        self._generation += 1
+        if variant_id is not None:
+            self.questions.invalidate(variant_id)
+        self.questions.invalidate_where(
+            lambda _, q: any(a.id == answer_id for a in q.answers)
+        )
+
+    def invalidate_entity(self, entity_type: str, entity_id: str) -> None:
+        """Invalidate by task_content_log entity type ('subject', 'cluster', ...)."""
+        if entity_type == "subject":
+            self.invalidate_subject(entity_id)
+        elif entity_type == "cluster":
+            self.invalidate_cluster(entity_id)
+        elif entity_type == "variant":
+            self.invalidate_variant(entity_id)
+        elif entity_type == "answer":
+            self.invalidate_answer(entity_id)
+        else:
+            logger.debug(f"Content cache ignoring unknown entity type: {entity_type}")
+
+    def version_check_due(self) -> bool:
+        """Check if the versions snapshot is too old to serve cached reads from.
+
+        Claims the check when due, so concurrent reads don't all re-read
+        the counters.
+        """
+        now = time.monotonic()
+        if (
+            self._versions_checked_at is not None
+            and now - self._versions_checked_at < self._version_check_seconds
+        ):
+            return False
+        self._versions_checked_at = now
+        return True
+
+    def sync_versions(self, versions: dict[str, int]) -> set[str]:
+        """Drop entries built from content tables that changed since the last sync.
+
+        Args:
+            versions: Current `content_versions` counters by table name
+
+        Returns:
+            Names of the tables whose counter moved
+        """
+        self._versions_checked_at = time.monotonic()
+        # Counters only grow; an older snapshot arriving late changes nothing
+        changed = {
+            table for table, version in versions.items()
+            if version > self._versions.get(table, -1)
+        }
+        if not changed:
+            return changed
+        for table in changed:
+            self._versions[table] = versions[table]
+
+        self._generation += 1
+        if "subjects" in changed:
+            self.subjects.clear()
+            self.subject_keys.clear()
+            self.subject_lists.clear()
+        if "question_clusters" in changed:
+            self.clusters.clear()
+        # Hydrated questions embed rows of every content table
+        self.questions.clear()
+        return changed
+
+    def clear(self) -> None:
+        """Drop all cached content."""
+        self._generation += 1
+        for cache in self._caches():
+            cache.clear()
+
+    def _caches(self) -> list[TTLCache]:
+        return [self.subjects, self.subject_keys, self.subject_lists, self.clusters, self.questions]
+
+    def get_stats(self) -> dict:
+        """Get hit/miss statistics of all caches."""
+        return {cache.name: cache.get_stats() for cache in self._caches()}
+
+
+class CachedContentRepository(ContentRepository):
+    """ContentRepository decorator adding a read-through cache.
+
+    Reads of subjects, clusters and hydrated questions are served from
+    ContentCache; everything else is delegated unchanged. Writes are
+    delegated first and then invalidate exactly the affected entries.
+
+    Usage:
+        repo = CachedContentRepository(SQLiteContentRepository(path, pool=pool), cache)
+    """
+
+    def __init__(self, inner: ContentRepository, cache: ContentCache):
+        """Initialize caching repository.
+
+        Args:
+            inner: Repository that actually accesses the data store
+            cache: Shared content cache
+        """
+        self._inner = inner
+        self._cache = cache
+
+    # -------------------------------------------------------------------------
+    # Connection Management
+    # -------------------------------------------------------------------------
+
+    async def connect(self) -> None:
+        await self._inner.connect()
+
+    async def disconnect(self) -> None:
+        await self._inner.disconnect()
+
+    def for_task(
+        self,
+        task_id: str,
+        on_logged: Callable[[Sequence[TaskContentLog]], None] | None = None,
+    ) -> "CachedContentRepository":
+        return CachedContentRepository(self._inner.for_task(task_id, on_logged), self._cache)
+
+    async def _check_versions(self) -> None:
+        """Drop entries made stale by other processes before serving from the cache."""
+        if self._cache.version_check_due():
+            self._cache.sync_versions(await self._inner.get_content_versions())
+
+    # -------------------------------------------------------------------------
+    # Subjects
+    # -------------------------------------------------------------------------
+
+    async def get_all_subjects(self) -> list[Subject]:
+        await self._check_versions()
+        subjects = self._cache.subject_lists.get(_ALL_SUBJECTS)
+        if subjects is None:
+            generation = self._cache.generation
+            subjects = await self._inner.get_all_subjects()
+            self._cache.store(self._cache.subject_lists, _ALL_SUBJECTS, subjects, generation)
+        return [s.model_copy() for s in subjects]
+
+    async def get_subject_by_id(self, subject_id: str) -> Subject | None:
+        await self._check_versions()
+        subject = self._cache.subjects.get(subject_id)
+        if subject is None:
+            generation = self._cache.generation
+            subject = await self._inner.get_subject_by_id(subject_id)
+            if subject is None:
+                return None
+            self._cache.store(self._cache.subjects, subject_id, subject, generation)
+        return subject.model_copy()
+
+    async def get_subject_by_key(self, key: str) -> Subject | None:
+        await self._check_versions()
+        subject = self._cache.subject_keys.get(key)
+        if subject is None:
+            generation = self._cache.generation
+            subject = await self._inner.get_subject_by_key(key)
+            if subject is None:
+                return None
+            self._cache.store(self._cache.subject_keys, key, subject, generation)
+        return subject.model_copy()
+
+    async def create_subject(self, subject: Subject) -> Subject:
+        created = await self._inner.create_subject(subject)
+        self._cache.invalidate_subject(subject.id)
+        return created
+
+    async def update_subject(self, subject: Subject) -> Subject:
+        updated = await self._inner.update_subject(subject)
+        self._cache.invalidate_subject(subject.id)
+        return updated
+
+    async def delete_subject(self, subject_id: str) -> bool:
+        deleted = await self._inner.delete_subject(subject_id)
+        self._cache.invalidate_subject(subject_id)
+        return deleted
+
+    # -------------------------------------------------------------------------
+    # Question Clusters
+    # -------------------------------------------------------------------------
+
+    async def get_clusters_by_subject(self, subject_id: str) -> list[QuestionCluster]:
+        return await self._inner.get_clusters_by_subject(subject_id)
+
+    async def list_clusters(
+        self,
+        subject_id: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> Page[QuestionCluster]:
+        return await self._inner.list_clusters(subject_id=subject_id, cursor=cursor, limit=limit)
+
+    async def get_cluster_by_id(self, cluster_id: str) -> QuestionCluster | None:
+        await self._check_versions()
+        cluster = self._cache.clusters.get(cluster_id)
+        if cluster is None:
+            generation = self._cache.generation
+            cluster = await self._inner.get_cluster_by_id(cluster_id)
+            if cluster is None:
+                return None
+            self._cache.store(self._cache.clusters, cluster_id, cluster, generation)
+        return cluster.model_copy()
+
+    async def create_cluster(self, cluster: QuestionCluster) -> QuestionCluster:
+        return await self._inner.create_cluster(cluster)
+
+    async def update_cluster(self, cluster: QuestionCluster) -> QuestionCluster:
+        updated = await self._inner.update_cluster(cluster)
+        self._cache.invalidate_cluster(cluster.id)
+        return updated
+
+    async def delete_cluster(self, cluster_id: str) -> bool:
+        deleted = await self._inner.delete_cluster(cluster_id)
+        self._cache.invalidate_cluster(cluster_id)
+        return deleted
+
+    # -------------------------------------------------------------------------
+    # Question Variants
+    # -------------------------------------------------------------------------
+
+    async def get_variants_by_cluster(self, cluster_id: str) -> list[QuestionVariant]:
+        return await self._inner.get_variants_by_cluster(cluster_id)
+
+    async def list_variants(
+        self,
+        cluster_id: str | None = None,
+        subject_id: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> Page[QuestionVariant]:
+        return await self._inner.list_variants(
+            cluster_id=cluster_id, subject_id=subject_id, cursor=cursor, limit=limit
+        )
+
+    async def get_variant_by_id(self, variant_id: str) -> QuestionVariant | None:
+        return await self._inner.get_variant_by_id(variant_id)
+
+    async def get_random_variant_for_cluster(
+        self,
+        cluster_id: str,
+        session_id: str | None = None,
+    ) -> QuestionVariant | None:
+        return await self._inner.get_random_variant_for_cluster(cluster_id, session_id=session_id)
+
+    async def create_variant(self, variant: QuestionVariant) -> QuestionVariant:
+        return await self._inner.create_variant(variant)
+
+    async def update_variant(self, variant: QuestionVariant) -> QuestionVariant:
+        updated = await self._inner.update_variant(variant)
+        self._cache.invalidate_variant(variant.id)
+        return updated
+
+    async def delete_variant(self, variant_id: str) -> bool:
+        deleted = await self._inner.delete_variant(variant_id)
+        self._cache.invalidate_variant(variant_id)
+        return deleted
+
+    # -------------------------------------------------------------------------
+    # Answers
+    # -------------------------------------------------------------------------
+
+    async def get_answers_by_variant(self, variant_id: str) -> list[Answer]:
+        return await self._inner.get_answers_by_variant(variant_id)
+
+    async def get_answer_by_id(self, answer_id: str) -> Answer | None:
+        return await self._inner.get_answer_by_id(answer_id)
+
+    async def create_answer(self, answer: Answer) -> Answer:
+        created = await self._inner.create_answer(answer)
+        self._cache.invalidate_variant(answer.variant_id)
+        return created
+
+    async def create_answers_bulk(self, answers: list[Answer]) -> list[Answer]:
+        created = await self._inner.create_answers_bulk(answers)
+        for variant_id in {a.variant_id for a in answers}:
+            self._cache.invalidate_variant(variant_id)
+        return created
+
+    async def update_answer(self, answer: Answer) -> Answer:
+        updated = await self._inner.update_answer(answer)
+        # The answer may have moved, so drop both the old and new question
+        self._cache.invalidate_answer(answer.id, answer.variant_id)
+        return updated
+
+    async def delete_answer(self, answer_id: str) -> bool:
+        deleted = await self._inner.delete_answer(answer_id)
+        self._cache.invalidate_answer(answer_id)
+        return deleted
+
+    # -------------------------------------------------------------------------
+    # Convenience Methods
+    # -------------------------------------------------------------------------
+
+    async def get_question_with_answers(self, variant_id: str) -> QuestionWithAnswers | None:
+        await self._check_versions()
+        question = self._cache.questions.get(variant_id)
+        if question is None:
+            generation = self._cache.generation
+            question = await self._inner.get_question_with_answers(variant_id)
+            if question is None:
+                return None
+            self._cache.store(self._cache.questions, variant_id, question, generation)
+        return question.model_copy(deep=True)
+
+    async def get_questions_with_answers(self, variant_ids: list[str]) -> list[QuestionWithAnswers]:
+        await self._check_versions()
+        unique_ids = list(dict.fromkeys(variant_ids))
+        by_id: dict[str, QuestionWithAnswers] = {}
+        missing = []
+        for variant_id in unique_ids:
+            question = self._cache.questions.get(variant_id)
+            if question is None:
+                missing.append(variant_id)
+            else:
+                by_id[variant_id] = question
+
+        if missing:
+            generation = self._cache.generation
+            for question in await self._inner.get_questions_with_answers(missing):
+                self._cache.store(self._cache.questions, question.variant.id, question, generation)
+                by_id[question.variant.id] = question
+
+        return [by_id[vid].model_copy(deep=True) for vid in unique_ids if vid in by_id]
+
+    async def sample_variant_ids(
+        self,
+        count: int,
+        subject_key: str | None = None,
+        cluster_ids: list[str] | None = None,
+        min_difficulty: int | None = None,
+        max_difficulty: int | None = None,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> list[str]:
+        return await self._inner.sample_variant_ids(
+            count=count,
+            subject_key=subject_key,
+            cluster_ids=cluster_ids,
+            min_difficulty=min_difficulty,
+            max_difficulty=max_difficulty,
+            weighted=weighted,
+            session_id=session_id,
+        )
+
+    async def get_random_questions(
+        self,
+        count: int,
+        subject_key: str | None = None,
+        cluster_ids: list[str] | None = None,
+        min_difficulty: int | None = None,
+        max_difficulty: int | None = None,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> list[QuestionWithAnswers]:
+        # Sample from the index, hydrate through the cache
+        picked = await self.sample_variant_ids(
+            count=count,
+            subject_key=subject_key,
+            cluster_ids=cluster_ids,
+            min_difficulty=min_difficulty,
+            max_difficulty=max_difficulty,
+            weighted=weighted,
+            session_id=session_id,
+        )
+        return await self.get_questions_with_answers(picked)
+
+    async def get_random_question_for_subject(
+        self,
+        subject_key: str,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> QuestionWithAnswers | None:
+        picked = await self.sample_variant_ids(
+            count=1, subject_key=subject_key, weighted=weighted, session_id=session_id
+        )
+        if not picked:
+            return None
+        return await self.get_question_with_answers(picked[0])
+
+    # -------------------------------------------------------------------------
+    # Change tracking
+    # -------------------------------------------------------------------------
+
+    async def get_content_versions(self) -> dict[str, int]:
+        # Never cached: versions must reflect writes from other processes.
+        # Syncing here makes sure a body served after an ETag was derived
+        # from these versions is not older than them.
+        versions = await self._inner.get_content_versions()
+        self._cache.sync_versions(versions)
+        return versions
+
+    # -------------------------------------------------------------------------
+    # Bulk operations (task revert)
+    # -------------------------------------------------------------------------
+
+    async def delete_entities(self, entity_type: str, entity_ids: Sequence[str]) -> int:
+        deleted = await self._inner.delete_entities(entity_type, entity_ids)
+        # Per-entity invalidation scans the question cache once per ID;
+        # for bulk writes dropping everything is cheaper
+        self._cache.clear()
+        return deleted
+
+    async def restore_entities(self, entity_type: str, rows: Sequence[dict[str, Any]]) -> int:
+        restored = await self._inner.restore_entities(entity_type, rows)
+        self._cache.clear()
+        return restored
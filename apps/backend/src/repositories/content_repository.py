@@ -1,6 +1,7 @@
 """Abstract Content Repository interface."""
 
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Sequence
 
 from ..models.content import (
     Subject,
@@ -9,6 +10,8 @@ from ..models.content import (
     Answer,
     QuestionWithAnswers,
 )
+from ..models.tasks import TaskContentLog
+from .pagination import Page
 
 
 class ContentRepository(ABC):
@@ -33,6 +36,30 @@ class ContentRepository(ABC):
         """Close connection to data store."""
         ...
 
+    @abstractmethod
+    def for_task(
+        self,
+        task_id: str,
+        on_logged: Callable[[Sequence[TaskContentLog]], None] | None = None,
+    ) -> "ContentRepository":
+        """Get a repository whose writes are logged as artifacts of a task.
+
+        Every create, update and delete made through it inserts the
+        matching task_content_log rows (with the previous row as
+        previous_data) in the same transaction as the content itself, so
+        a crash can neither lose the log of committed content nor leave
+        log rows behind for content that was never written. The bulk
+        revert operations are not logged.
+
+        Args:
+            task_id: Task the writes belong to
+            on_logged: Called with the new log entries after each commit
+
+        Returns:
+            Repository sharing this one's connections (and cache)
+        """
+        ...
+
     # -------------------------------------------------------------------------
     # Subjects
     # -------------------------------------------------------------------------
@@ -76,6 +103,25 @@ class ContentRepository(ABC):
         """Get all clusters for a subject."""
         ...
 
+    @abstractmethod
+    async def list_clusters(
+        self,
+        subject_id: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> Page[QuestionCluster]:
+        """List clusters ordered by (topic, id) in a single query.
+
+        Args:
+            subject_id: Optional subject filter
+            cursor: Cursor from a previous page to continue after
+            limit: Page size, or None for all remaining clusters
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        ...
+
     @abstractmethod
     async def get_cluster_by_id(self, cluster_id: str) -> QuestionCluster | None:
         """Get a cluster by ID."""
@@ -105,14 +151,42 @@ class ContentRepository(ABC):
         """Get all variants for a cluster."""
         ...
 
+    @abstractmethod
+    async def list_variants(
+        self,
+        cluster_id: str | None = None,
+        subject_id: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> Page[QuestionVariant]:
+        """List variants ordered by id in a single query.
+
+        Args:
+            cluster_id: Optional cluster filter
+            subject_id: Optional subject filter
+            cursor: Cursor from a previous page to continue after
+            limit: Page size, or None for all remaining variants
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        ...
+
     @abstractmethod
     async def get_variant_by_id(self, variant_id: str) -> QuestionVariant | None:
         """Get a variant by ID."""
         ...
 
     @abstractmethod
-    async def get_random_variant_for_cluster(self, cluster_id: str) -> QuestionVariant | None:
-        """Get a random variant from a cluster (for gameplay)."""
+    async def get_random_variant_for_cluster(
+        self,
+        cluster_id: str,
+        session_id: str | None = None,
+    ) -> QuestionVariant | None:
+        """Get a random variant from a cluster (for gameplay).
+
+        With a session_id, variants already drawn in that session are skipped.
+        """
         ...
 
     @abstractmethod
@@ -139,6 +213,11 @@ class ContentRepository(ABC):
         """Get all answers for a variant."""
         ...
 
+    @abstractmethod
+    async def get_answer_by_id(self, answer_id: str) -> Answer | None:
+        """Get an answer by ID."""
+        ...
+
     @abstractmethod
     async def create_answer(self, answer: Answer) -> Answer:
         """Create a new answer."""
@@ -169,6 +248,124 @@ class ContentRepository(ABC):
         ...
 
     @abstractmethod
-    async def get_random_question_for_subject(self, subject_key: str) -> QuestionWithAnswers | None:
-        """Get a random question with answers for a subject (for gameplay)."""
+    async def get_questions_with_answers(self, variant_ids: list[str]) -> list[QuestionWithAnswers]:
+        """Get complete questions for many variants at once.
+
+        Results keep the order of `variant_ids`; unknown IDs are skipped.
+        """
+        ...
+
+    @abstractmethod
+    async def sample_variant_ids(
+        self,
+        count: int,
+        subject_key: str | None = None,
+        cluster_ids: list[str] | None = None,
+        min_difficulty: int | None = None,
+        max_difficulty: int | None = None,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> list[str]:
+        """Draw up to `count` distinct random variant IDs without hydrating them.
+
+        Takes the same filters as get_random_questions().
+        """
+        ...
+
+    @abstractmethod
+    async def get_random_questions(
+        self,
+        count: int,
+        subject_key: str | None = None,
+        cluster_ids: list[str] | None = None,
+        min_difficulty: int | None = None,
+        max_difficulty: int | None = None,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> list[QuestionWithAnswers]:
+        """Draw up to `count` distinct random questions with answers (for quizzes).
+
+        Args:
+            count: Number of questions to draw
+            subject_key: Restrict to a subject
+            cluster_ids: Restrict to a set of clusters
+            min_difficulty: Minimum cluster difficulty_baseline (inclusive)
+            max_difficulty: Maximum cluster difficulty_baseline (inclusive)
+            weighted: Weight questions by their cluster's difficulty_baseline
+            session_id: Skip questions already drawn in this session
+
+        Returns:
+            Fewer than `count` questions if the filtered pool is exhausted
+        """
+        ...
+
+    @abstractmethod
+    async def get_random_question_for_subject(
+        self,
+        subject_key: str,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> QuestionWithAnswers | None:
+        """Get a random question with answers for a subject (for gameplay).
+
+        Args:
+            subject_key: Key of the subject to draw from
+            weighted: Weight questions by their cluster's difficulty_baseline
+            session_id: Skip questions already drawn in this session
+        """
+        ...
+
+    # -------------------------------------------------------------------------
+    # Change tracking
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def get_content_versions(self) -> dict[str, int]:
+        """Get the change counter of each content table.
+
+        Counters only ever increase; any write to a table bumps it, so
+        they identify a state of the content (used for ETags).
+
+        Returns:
+            Mapping of table name to version
+        """
+        ...
+
+    # -------------------------------------------------------------------------
+    # Bulk operations (task revert)
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def delete_entities(self, entity_type: str, entity_ids: Sequence[str]) -> int:
+        """Delete many entities of one type in a single transaction.
+
+        Dependents go with them like in delete_cluster / delete_variant
+        (answers of a variant; variants and answers of a cluster).
+
+        Args:
+            entity_type: 'subject', 'cluster', 'variant' or 'answer'
+            entity_ids: IDs to delete; unknown IDs are ignored
+
+        Returns:
+            Number of `entity_type` rows deleted
+
+        Raises:
+            ValueError: If the entity type is unknown
+        """
+        ...
+
+    @abstractmethod
+    async def restore_entities(self, entity_type: str, rows: Sequence[dict[str, Any]]) -> int:
+        """Insert or overwrite many entities of one type in a single transaction.
+
+        Args:
+            entity_type: 'subject', 'cluster', 'variant' or 'answer'
+            rows: Full entity snapshots (e.g. task_content_log previous_data)
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            ValueError: If the entity type is unknown or a snapshot is invalid
+        """
         ...
@@ -0,0 +1,400 @@
+"""In-memory sampling index for random question draws."""
+
+import logging
+import random
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+# Rejection sampling is only used while the candidate pool is clearly larger
+# than what has to be skipped; otherwise we fall back to an explicit draw.
+_REJECTION_FACTOR = 2
+_MAX_CACHED_POOLS = 256
+
+# content_versions counters of the tables the index is built from
+_SOURCE_TABLES = ("subjects", "question_clusters", "question_variants")
+
+
+@dataclass
+class _ClusterEntry:
+    """Variants of one cluster plus the attributes used for filtering."""
+
+    id: str
+    subject_id: str
+    difficulty: int
+    variant_ids: list[str] = field(default_factory=list)
+
+
+class _SamplingPool:
+    """Cumulative weight array over a fixed set of clusters.
+
+    A draw picks a cluster by binary search over the cumulative weights
+    (O(log clusters)) and then a variant uniformly within it (O(1)).
+    Cluster weight is its variant count, multiplied by the difficulty
+    baseline when weighted, so every variant gets the same probability
+    as in a flat array.
+    """
+
+    def __init__(self, clusters: Iterable[_ClusterEntry], weighted: bool):
+        self.entries: list[_ClusterEntry] = []
+        self.cluster_ids: set[str] = set()
+        self.cumulative: list[float] = []
+        self.weighted = weighted
+        self.size = 0
+        total = 0.0
+        for cluster in clusters:
+            if not cluster.variant_ids:
+                continue
+            total += len(cluster.variant_ids) * self._variant_weight(cluster)
+            self.entries.append(cluster)
+            self.cluster_ids.add(cluster.id)
+            self.cumulative.append(total)
+            self.size += len(cluster.variant_ids)
+        self.total_weight = total
+
+    def _variant_weight(self, cluster: _ClusterEntry) -> float:
+        return float(max(cluster.difficulty, 1)) if self.weighted else 1.0
+
+    def draw(self, rng: random.Random) -> str:
+        """Draw one variant ID (with replacement)."""
+        r = rng.random() * self.total_weight
+        index = min(bisect_right(self.cumulative, r), len(self.entries) - 1)
+        return rng.choice(self.entries[index].variant_ids)
+
+    def draw_distinct(self, rng: random.Random, count: int, exclude: set[str]) -> list[str]:
+        """Draw up to `count` distinct variant IDs not contained in `exclude`."""
+        available = self.size - len(exclude)
+        if available <= 0 or count <= 0:
+            return []
+
+        if self.size >= _REJECTION_FACTOR * (count + len(exclude)):
+            picked: list[str] = []
+            seen = set(exclude)
+            attempts = 0
+            while len(picked) < count and attempts < count * 20:
+                attempts += 1
+                variant_id = self.draw(rng)
+                if variant_id not in seen:
+                    seen.add(variant_id)
+                    picked.append(variant_id)
+            if len(picked) == count:
+                return picked
+
+        # Small or mostly exhausted pool: weighted sampling without
+        # replacement over the remaining candidates (Efraimidis-Spirakis keys)
+        keyed = [
+            (rng.random() ** (1.0 / self._variant_weight(cluster)), variant_id)
+            for cluster in self.entries
+            for variant_id in cluster.variant_ids
+            if variant_id not in exclude
+        ]
+        keyed.sort(reverse=True)
+        return [variant_id for _, variant_id in keyed[:count]]
+
+
+class QuestionSampler:
+    """Process-wide sampling index over all question variants.
+
+    Replaces `ORDER BY RANDOM()` scans: the index holds dense per-cluster
+    arrays of variant IDs grouped by subject and is rebuilt lazily from a
+    single query after any content write invalidated it. Draws cost
+    O(log clusters) regardless of catalog size.
+
+    One sampler exists per database path and is shared by all repository
+    instances, so a write through any repository invalidates it for all.
+    Writes from other processes (standalone workers) are picked up through
+    the `content_versions` counters: the index remembers the counters it
+    was built from and is rebuilt once they move. As a last safety net,
+    the index also expires after `max_age_seconds`.
+
+    Supports:
+    - Uniform or difficulty-weighted draws (weight = difficulty_baseline)
+    - Filtering by subject, cluster set and difficulty band
+    - Sampling without replacement within a session
+    """
+
+    # Global registry of samplers, keyed by database path
+    _registry: dict[str, "QuestionSampler"] = {}
+
+    def __init__(
+        self,
+        max_age_seconds: float = 300.0,
+        max_sessions: int = 1000,
+        rng: random.Random | None = None,
+        version_check_seconds: float = 1.0,
+    ):
+        """Initialize sampler.
+
+        Args:
+            max_age_seconds: Rebuild the index after this age even without writes
+            max_sessions: Number of sampling sessions remembered (LRU)
+            rng: Random source (mainly for deterministic tests)
+            version_check_seconds: Max age of the content_versions check
+                                   before a draw (0 checks every draw)
+        """
+        self._max_age_seconds = max_age_seconds
+        self._version_check_seconds = version_check_seconds
+        self._max_sessions = max_sessions
+        self._rng = rng or random.Random()
+
+        self._clusters: dict[str, _ClusterEntry] = {}
+        self._variant_clusters: dict[str, str] = {}
+        self._subject_clusters: dict[str, list[str]] = {}
+        self._subject_keys: dict[str, str] = {}
+        self._pools: dict[tuple, _SamplingPool] = {}
+        self._sessions: OrderedDict[str, set[str]] = OrderedDict()
+
+        self._loaded_at: float | None = None
+        self._versions: dict[str, int] | None = None
+        self._versions_checked_at: float | None = None
+        self._generation = 0
+        self._rebuilds = 0
+        self._draws = 0
+
+    @classmethod
+    def for_database(cls, database_path: str) -> "QuestionSampler":
+        """Get (or create) the shared sampler for a database."""
+        sampler = cls._registry.get(database_path)
+        if sampler is None:
+            from ..config import settings
+
+            sampler = cls(
+                max_age_seconds=settings.sampler_max_age_seconds,
+                version_check_seconds=settings.sampler_version_check_seconds,
+            )
+            cls._registry[database_path] = sampler
+        return sampler
+
+    # -------------------------------------------------------------------------
+    # Index lifecycle
+    # -------------------------------------------------------------------------
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on each invalidation (guards against stale loads)."""
+        return self._generation
+
+    @property
+    def is_stale(self) -> bool:
+        """Check if the index must be (re)built before the next draw."""
+        if self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at > self._max_age_seconds
+
+    def invalidate(self) -> None:
+        """Drop the index after a content write. Rebuilt on next draw."""
+        self._generation += 1
+        self._loaded_at = None
+        self._versions = None
+        self._pools.clear()
+
+    def version_check_due(self) -> bool:
+        """Check if the loaded index should be compared with the current counters.
+
+        Claims the check when due, so concurrent draws don't all re-read
+        the counters.
+        """
+        if self._versions is None:
+            return False
+        now = time.monotonic()
+        if (
+            self._versions_checked_at is not None
+            and now - self._versions_checked_at < self._version_check_seconds
+        ):
+            return False
+        self._versions_checked_at = now
+        return True
+
+    def sync_versions(self, versions: dict[str, int]) -> bool:
+        """Invalidate the index if a source table changed since it was built.
+
+        Args:
+            versions: Current `content_versions` counters by table name
+
+        Returns:
+            True if the index was invalidated
+        """
+        self._versions_checked_at = time.monotonic()
+        if self._versions is None:
+            return False
+        if all(versions.get(t, 0) == self._versions.get(t, 0) for t in _SOURCE_TABLES):
+            return False
+        logger.debug("Question sampler invalidated by content_versions")
+        self.invalidate()
+        return True
+
+    def load(
+        self,
+        rows: Iterable[dict[str, Any]],
+        generation: int | None = None,
+        versions: dict[str, int] | None = None,
+    ) -> bool:
+        """Build the index from variant rows.
+
+        Args:
+            rows: Rows with variant_id, cluster_id, subject_id, subject_key
+                  and difficulty_baseline (clusters without variants may
+                  appear with variant_id NULL)
+            generation: Generation observed before the rows were queried.
+                        If an invalidation happened meanwhile, the rows are
+                        discarded.
+            versions: `content_versions` counters read before the rows;
+                      the index is rebuilt once they move
+
+        Returns:
+            True if the index was replaced
+        """
+        if generation is not None and generation != self._generation:
+            return False
+
+        clusters: dict[str, _ClusterEntry] = {}
+        variant_clusters: dict[str, str] = {}
+        subject_clusters: dict[str, list[str]] = {}
+        subject_keys: dict[str, str] = {}
+        for row in rows:
+            cluster = clusters.get(row["cluster_id"])
+            if cluster is None:
+                cluster = _ClusterEntry(
+                    id=row["cluster_id"],
+                    subject_id=row["subject_id"],
+                    difficulty=row["difficulty_baseline"] or 0,
+                )
+                clusters[cluster.id] = cluster
+                subject_clusters.setdefault(cluster.subject_id, []).append(cluster.id)
+                subject_keys[row["subject_key"]] = cluster.subject_id
+            if row["variant_id"] is not None:
+                cluster.variant_ids.append(row["variant_id"])
+                variant_clusters[row["variant_id"]] = cluster.id
+
+        self._clusters = clusters
+        self._variant_clusters = variant_clusters
+        self._subject_clusters = subject_clusters
+        self._subject_keys = subject_keys
+        self._pools.clear()
+        self._loaded_at = time.monotonic()
+        self._versions = versions
+        self._versions_checked_at = self._loaded_at
+        self._rebuilds += 1
+        logger.debug(f"Question sampler rebuilt ({len(clusters)} clusters)")
+        return True
+
+    # -------------------------------------------------------------------------
+    # Sampling
+    # -------------------------------------------------------------------------
+
+    def subject_id_for_key(self, subject_key: str) -> str | None:
+        """Resolve a subject key from the index (no DB access)."""
+        return self._subject_keys.get(subject_key)
+
+    def _get_pool(
+        self,
+        subject_id: str | None,
+        cluster_ids: Iterable[str] | None,
+        min_difficulty: int | None,
+        max_difficulty: int | None,
+        weighted: bool,
+    ) -> _SamplingPool:
+        """Get the cached pool for a filter combination."""
+        cluster_key = frozenset(cluster_ids) if cluster_ids is not None else None
+        key = (subject_id, cluster_key, min_difficulty, max_difficulty, weighted)
+        pool = self._pools.get(key)
+        if pool is not None:
+            return pool
+
+        if cluster_key is not None:
+            candidates = [self._clusters[cid] for cid in cluster_key if cid in self._clusters]
+        elif subject_id is not None:
+            candidates = [self._clusters[cid] for cid in self._subject_clusters.get(subject_id, [])]
+        else:
+            candidates = list(self._clusters.values())
+
+        pool = _SamplingPool(
+            (
+                c for c in candidates
+                if (subject_id is None or c.subject_id == subject_id)
+                and (min_difficulty is None or c.difficulty >= min_difficulty)
+                and (max_difficulty is None or c.difficulty <= max_difficulty)
+            ),
+            weighted=weighted,
+        )
+        if len(self._pools) >= _MAX_CACHED_POOLS:
+            self._pools.clear()
+        self._pools[key] = pool
+        return pool
+
+    def _session_seen(self, session_id: str) -> set[str]:
+        """Get the set of variants already drawn in a session (LRU)."""
+        seen = self._sessions.get(session_id)
+        if seen is None:
+            seen = set()
+            self._sessions[session_id] = seen
+            while len(self._sessions) > self._max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return seen
+
+    def sample(
+        self,
+        count: int = 1,
+        subject_id: str | None = None,
+        cluster_ids: Iterable[str] | None = None,
+        min_difficulty: int | None = None,
+        max_difficulty: int | None = None,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> list[str]:
+        """Draw up to `count` distinct variant IDs.
+
+        Args:
+            count: Number of variants to draw
+            subject_id: Restrict to one subject
+            cluster_ids: Restrict to a set of clusters
+            min_difficulty: Minimum cluster difficulty_baseline (inclusive)
+            max_difficulty: Maximum cluster difficulty_baseline (inclusive)
+            weighted: Weight variants by their cluster's difficulty_baseline
+            session_id: Never return a variant already drawn in this session
+
+        Returns:
+            Variant IDs; fewer than `count` if the pool is exhausted
+        """
+        pool = self._get_pool(subject_id, cluster_ids, min_difficulty, max_difficulty, weighted)
+        if pool.size == 0:
+            return []
+
+        seen = self._session_seen(session_id) if session_id else set()
+        if count == 1 and not seen:
+            picked = [pool.draw(self._rng)]
+        else:
+            # Only exclusions that are actually part of this pool count
+            # against its size; others can never be drawn anyway.
+            exclude = {
+                vid for vid in seen
+                if self._variant_clusters.get(vid) in pool.cluster_ids
+            }
+            picked = pool.draw_distinct(self._rng, count, exclude)
+
+        if session_id:
+            seen.update(picked)
+        self._draws += len(picked)
+        return picked
+
+    def end_session(self, session_id: str) -> None:
+        """Forget what was drawn in a session."""
+        self._sessions.pop(session_id, None)
+
+    def get_stats(self) -> dict:
+        """Get sampler statistics."""
+        return {
+            "clusters": len(self._clusters),
+            "variants": len(self._variant_clusters),
+            "stale": self.is_stale,
+            "rebuilds": self._rebuilds,
+            "draws": self._draws,
+            "cached_pools": len(self._pools),
+            "sessions": len(self._sessions),
+        }
@@ -1,9 +1,18 @@
 """SQLite implementation of ContentRepository."""
 
+import json
 import aiosqlite
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Sequence
+
+from pydantic import BaseModel, ValidationError
 
 from .content_repository import ContentRepository
+from .pagination import Page, decode_cursor, encode_cursor
+from .sampling import QuestionSampler
+from .sqlite_task_repository import insert_content_logs
+from ..db.connection import open_connection
+from ..db.pool import SQLiteConnectionPool
 from ..models.content import (
     Subject,
     QuestionCluster,
@@ -11,6 +20,66 @@ from ..models.content import (
     Answer,
     QuestionWithAnswers,
 )
+from ..models.tasks import ContentAction, TaskContentLog
+
+# Hydrates variant + answers + cluster + subject in one statement. Answers
+# are aggregated per variant with json_group_array via idx_answers_variant.
+_QUESTION_SELECT = """
+    SELECT qv.id AS variant_id, qv.cluster_id, qv.question_text,
+           qc.id AS c_id, qc.subject_id AS c_subject_id, qc.topic AS c_topic,
+           qc.canonical_template AS c_canonical_template,
+           qc.difficulty_baseline AS c_difficulty_baseline,
+           s.id AS s_id, s.key AS s_key, s.name AS s_name,
+           (SELECT json_group_array(json_object(
+                       'id', a.id,
+                       'variant_id', a.variant_id,
+                       'answer_text', a.answer_text,
+                       'is_correct', a.is_correct))
+              FROM answers a WHERE a.variant_id = qv.id) AS answers_json
+    FROM question_variants qv
+    LEFT JOIN question_clusters qc ON qc.id = qv.cluster_id
+    LEFT JOIN subjects s ON s.id = qc.subject_id
+"""
+
+# Rows feeding the in-memory sampling index
+_SAMPLER_SELECT = """
+    SELECT qv.id AS variant_id, qc.id AS cluster_id, qc.subject_id,
+           qc.difficulty_baseline, s.key AS subject_key
+    FROM question_variants qv
+    JOIN question_clusters qc ON qc.id = qv.cluster_id
+    JOIN subjects s ON s.id = qc.subject_id
+"""
+
+# Stay well below SQLite's host parameter limit for IN (...) lists
+_MAX_IN_PARAMS = 500
+
+# Entity types as used in task_content_log
+_ENTITY_TABLES: dict[str, tuple[str, type[BaseModel]]] = {
+    "subject": ("subjects", Subject),
+    "cluster": ("question_clusters", QuestionCluster),
+    "variant": ("question_variants", QuestionVariant),
+    "answer": ("answers", Answer),
+}
+
+# Set-based deletes per entity type, dependents first ({ids} = placeholders)
+_DELETE_STATEMENTS: dict[str, tuple[str, ...]] = {
+    "subject": (
+        "DELETE FROM subjects WHERE id IN ({ids})",
+    ),
+    "cluster": (
+        """DELETE FROM answers WHERE variant_id IN (
+               SELECT id FROM question_variants WHERE cluster_id IN ({ids}))""",
+        "DELETE FROM question_variants WHERE cluster_id IN ({ids})",
+        "DELETE FROM question_clusters WHERE id IN ({ids})",
+    ),
+    "variant": (
+        "DELETE FROM answers WHERE variant_id IN ({ids})",
+        "DELETE FROM question_variants WHERE id IN ({ids})",
+    ),
+    "answer": (
+        "DELETE FROM answers WHERE id IN ({ids})",
+    ),
+}
 
 
 class SQLiteContentRepository(ContentRepository):
@@ -20,14 +89,21 @@ class SQLiteContentRepository(ContentRepository):
     Suitable for local development and testing.
     """
 
-    def __init__(self, database_path: str):
+    def __init__(self, database_path: str, pool: SQLiteConnectionPool | None = None):
         """Initialize SQLite content repository.
 
         Args:
             database_path: Path to SQLite database file, or ':memory:' for in-memory
+            pool: Optional shared connection pool. When given, connections are
+                  borrowed from the pool and connect()/disconnect() are no-ops.
         """
         self._database_path = database_path
+        self._pool = pool
         self._connection: aiosqlite.Connection | None = None
+        self._sampler = QuestionSampler.for_database(database_path)
+        # Set on task-scoped copies (see for_task)
+        self._task_id: str | None = None
+        self._on_logged: Callable[[Sequence[TaskContentLog]], None] | None = None
 
     # -------------------------------------------------------------------------
     # Connection Management
@@ -35,10 +111,10 @@ class SQLiteContentRepository(ContentRepository):
 
     async def connect(self) -> None:
         """Establish database connection."""
+        if self._pool is not None:
+            return  # Connections are owned by the pool
         if self._connection is None:
-            self._connection = await aiosqlite.connect(self._database_path)
-            self._connection.row_factory = aiosqlite.Row
-            await self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection = await open_connection(self._database_path)
 
     async def disconnect(self) -> None:
         """Close database connection."""
@@ -46,32 +122,146 @@ class SQLiteContentRepository(ContentRepository):
             await self._connection.close()
             self._connection = None
 
+    def for_task(
+        self,
+        task_id: str,
+        on_logged: Callable[[Sequence[TaskContentLog]], None] | None = None,
+    ) -> "SQLiteContentRepository":
+        repo = SQLiteContentRepository(self._database_path, pool=self._pool)
+        repo._connection = self._connection
+        repo._task_id = task_id
+        repo._on_logged = on_logged
+        return repo
+
     def _ensure_connected(self) -> aiosqlite.Connection:
         """Ensure connection is established."""
         if self._connection is None:
             raise RuntimeError("Repository not connected. Call connect() first.")
         return self._connection
 
-    async def _execute(self, sql: str, params: tuple = ()) -> None:
-        """Execute a SQL statement."""
-        conn = self._ensure_connected()
-        await conn.execute(sql, params)
-        await conn.commit()
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get a connection for read-only queries."""
+        if self._pool is not None:
+            async with self._pool.reader() as conn:
+                yield conn
+        else:
+            yield self._ensure_connected()
+
+    @asynccontextmanager
+    async def _writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get the connection for statements that modify data."""
+        if self._pool is not None:
+            async with self._pool.writer() as conn:
+                yield conn
+        else:
+            conn = self._ensure_connected()
+            try:
+                yield conn
+            except BaseException:
+                # Don't let the next write commit half of this one (or its log)
+                if conn.in_transaction:
+                    await conn.rollback()
+                raise
+
+    async def _log_changes(
+        self,
+        conn: aiosqlite.Connection,
+        entity_type: str,
+        action: ContentAction,
+        entity_ids: Sequence[str] = (),
+        where: str | None = None,
+        params: tuple = (),
+    ) -> list[TaskContentLog]:
+        """Insert the task content log of a write, inside the write's transaction.
+
+        Created entities are logged by ID. For updates and deletes the rows
+        matching `where` are logged with their current values as
+        previous_data, so this must run before the statement that changes
+        them. Does nothing unless the repository is scoped to a task.
+        """
+        if self._task_id is None:
+            return []
+        if where is None:
+            changes = [(entity_id, None) for entity_id in entity_ids]
+        else:
+            table, _ = self._entity_table(entity_type)
+            cursor = await conn.execute(f"SELECT * FROM {table} WHERE {where}", params)
+            changes = [(row["id"], dict(row)) for row in await cursor.fetchall()]
+
+        logs = [
+            TaskContentLog(
+                task_id=self._task_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                action=action,
+                previous_data=previous_data,
+            )
+            for entity_id, previous_data in changes
+        ]
+        await insert_content_logs(conn, logs)
+        return logs
+
+    def _logged(self, logs: Sequence[TaskContentLog]) -> None:
+        """Report committed log entries to the task's listener."""
+        if logs and self._on_logged is not None:
+            self._on_logged(logs)
+
+    async def _execute(
+        self,
+        sql: str,
+        params: tuple,
+        entity_type: str,
+        entity_id: str,
+        action: ContentAction,
+    ) -> int:
+        """Execute a write to one entity (logged for the task, if any).
+
+        Returns:
+            Number of rows changed
+        """
+        async with self._writer() as conn:
+            if action == ContentAction.CREATED:
+                cursor = await conn.execute(sql, params)
+                logs = await self._log_changes(conn, entity_type, action, [entity_id])
+            else:
+                logs = await self._log_changes(
+                    conn, entity_type, action, where="id = ?", params=(entity_id,)
+                )
+                cursor = await conn.execute(sql, params)
+            await conn.commit()
+        self._logged(logs)
+        return cursor.rowcount
 
     async def _fetch_one(self, sql: str, params: tuple = ()) -> dict[str, Any] | None:
         """Fetch a single row."""
-        conn = self._ensure_connected()
-        cursor = await conn.execute(sql, params)
-        row = await cursor.fetchone()
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            row = await cursor.fetchone()
         return dict(row) if row else None
 
     async def _fetch_all(self, sql: str, params: tuple = ()) -> list[dict[str, Any]]:
         """Fetch all rows."""
-        conn = self._ensure_connected()
-        cursor = await conn.execute(sql, params)
-        rows = await cursor.fetchall()
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
+    async def _ensure_sampler(self) -> QuestionSampler:
+        """Rebuild the sampling index if a write (here or elsewhere) invalidated it."""
+        if self._sampler.version_check_due():
+            self._sampler.sync_versions(await self.get_content_versions())
+        for _ in range(3):
+            if not self._sampler.is_stale:
+                break
+            generation = self._sampler.generation
+            # Counters first: a write landing in between only causes an extra rebuild
+            versions = await self.get_content_versions()
+            rows = await self._fetch_all(_SAMPLER_SELECT)
+            if self._sampler.load(rows, generation=generation, versions=versions):
+                break
+        return self._sampler
+
     # -------------------------------------------------------------------------
     # Subjects
     # -------------------------------------------------------------------------
@@ -92,6 +282,7 @@ class SQLiteContentRepository(ContentRepository):
         await self._execute(
             "INSERT INTO subjects (id, key, name) VALUES (?, ?, ?)",
             (subject.id, subject.key, subject.name),
+            "subject", subject.id, ContentAction.CREATED,
         )
         return subject
 
@@ -99,14 +290,18 @@ class SQLiteContentRepository(ContentRepository):
         await self._execute(
             "UPDATE subjects SET key = ?, name = ? WHERE id = ?",
             (subject.key, subject.name, subject.id),
+            "subject", subject.id, ContentAction.UPDATED,
         )
+        self._sampler.invalidate()
         return subject
 
     async def delete_subject(self, subject_id: str) -> bool:
-        conn = self._ensure_connected()
-        cursor = await conn.execute("DELETE FROM subjects WHERE id = ?", (subject_id,))
-        await conn.commit()
-        return cursor.rowcount > 0
+        deleted = await self._execute(
+            "DELETE FROM subjects WHERE id = ?", (subject_id,),
+            "subject", subject_id, ContentAction.DELETED,
+        )
+        self._sampler.invalidate()
+        return deleted > 0
 
     # -------------------------------------------------------------------------
     # Question Clusters
@@ -119,6 +314,41 @@ class SQLiteContentRepository(ContentRepository):
         )
         return [QuestionCluster(**row) for row in rows]
 
+    async def list_clusters(
+        self,
+        subject_id: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> Page[QuestionCluster]:
+        conditions = []
+        params: list[Any] = []
+
+        if subject_id:
+            conditions.append("subject_id = ?")
+            params.append(subject_id)
+        if cursor:
+            topic, last_id = decode_cursor(cursor, 2)
+            conditions.append("(topic, id) > (?, ?)")
+            params.extend([topic, last_id])
+
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+
+        # Fetch one extra row to know whether another page follows
+        rows = await self._fetch_all(
+            f"""SELECT * FROM question_clusters
+                WHERE {where_clause}
+                ORDER BY topic, id
+                LIMIT ?""",
+            tuple(params + [limit + 1 if limit else -1]),
+        )
+        clusters = [QuestionCluster(**row) for row in rows]
+
+        next_cursor = None
+        if limit and len(clusters) > limit:
+            clusters = clusters[:limit]
+            next_cursor = encode_cursor(clusters[-1].topic, clusters[-1].id)
+        return Page(items=clusters, next_cursor=next_cursor)
+
     async def get_cluster_by_id(self, cluster_id: str) -> QuestionCluster | None:
         row = await self._fetch_one(
             "SELECT * FROM question_clusters WHERE id = ?",
@@ -133,7 +363,9 @@ class SQLiteContentRepository(ContentRepository):
                VALUES (?, ?, ?, ?, ?)""",
             (cluster.id, cluster.subject_id, cluster.topic,
              cluster.canonical_template, cluster.difficulty_baseline),
+            "cluster", cluster.id, ContentAction.CREATED,
         )
+        self._sampler.invalidate()
         return cluster
 
     async def update_cluster(self, cluster: QuestionCluster) -> QuestionCluster:
@@ -143,38 +375,57 @@ class SQLiteContentRepository(ContentRepository):
                WHERE id = ?""",
             (cluster.subject_id, cluster.topic, cluster.canonical_template,
              cluster.difficulty_baseline, cluster.id),
+            "cluster", cluster.id, ContentAction.UPDATED,
         )
+        self._sampler.invalidate()
         return cluster
 
     async def delete_cluster(self, cluster_id: str) -> bool:
         # Foreign keys with CASCADE would handle this, but let's be explicit
-        conn = self._ensure_connected()
+        async with self._writer() as conn:
+            # Log answers, variants and the cluster while they still exist
+            logs = await self._log_changes(
+                conn, "answer", ContentAction.DELETED,
+                where="variant_id IN (SELECT id FROM question_variants WHERE cluster_id = ?)",
+                params=(cluster_id,),
+            )
+            logs += await self._log_changes(
+                conn, "variant", ContentAction.DELETED,
+                where="cluster_id = ?", params=(cluster_id,),
+            )
+            logs += await self._log_changes(
+                conn, "cluster", ContentAction.DELETED,
+                where="id = ?", params=(cluster_id,),
+            )
 
-        # Get all variants for this cluster
-        variants = await self._fetch_all(
-            "SELECT id FROM question_variants WHERE cluster_id = ?",
-            (cluster_id,),
-        )
+            # Get all variants for this cluster
+            cursor = await conn.execute(
+                "SELECT id FROM question_variants WHERE cluster_id = ?",
+                (cluster_id,),
+            )
+            variants = await cursor.fetchall()
+
+            # Delete answers for all variants
+            for variant in variants:
+                await conn.execute(
+                    "DELETE FROM answers WHERE variant_id = ?",
+                    (variant["id"],),
+                )
 
-        # Delete answers for all variants
-        for variant in variants:
+            # Delete variants
             await conn.execute(
-                "DELETE FROM answers WHERE variant_id = ?",
-                (variant["id"],),
+                "DELETE FROM question_variants WHERE cluster_id = ?",
+                (cluster_id,),
             )
 
-        # Delete variants
-        await conn.execute(
-            "DELETE FROM question_variants WHERE cluster_id = ?",
-            (cluster_id,),
-        )
-
-        # Delete cluster
-        cursor = await conn.execute(
-            "DELETE FROM question_clusters WHERE id = ?",
-            (cluster_id,),
-        )
-        await conn.commit()
+            # Delete cluster
+            cursor = await conn.execute(
+                "DELETE FROM question_clusters WHERE id = ?",
+                (cluster_id,),
+            )
+            await conn.commit()
+        self._logged(logs)
+        self._sampler.invalidate()
         return cursor.rowcount > 0
 
     # -------------------------------------------------------------------------
@@ -188,6 +439,47 @@ class SQLiteContentRepository(ContentRepository):
         )
         return [QuestionVariant(**row) for row in rows]
 
+    async def list_variants(
+        self,
+        cluster_id: str | None = None,
+        subject_id: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> Page[QuestionVariant]:
+        conditions = []
+        params: list[Any] = []
+
+        if cluster_id:
+            conditions.append("qv.cluster_id = ?")
+            params.append(cluster_id)
+        if subject_id:
+            conditions.append(
+                "qv.cluster_id IN (SELECT id FROM question_clusters WHERE subject_id = ?)"
+            )
+            params.append(subject_id)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            conditions.append("qv.id > ?")
+            params.append(last_id)
+
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+
+        # Fetch one extra row to know whether another page follows
+        rows = await self._fetch_all(
+            f"""SELECT qv.* FROM question_variants qv
+                WHERE {where_clause}
+                ORDER BY qv.id
+                LIMIT ?""",
+            tuple(params + [limit + 1 if limit else -1]),
+        )
+        variants = [QuestionVariant(**row) for row in rows]
+
+        next_cursor = None
+        if limit and len(variants) > limit:
+            variants = variants[:limit]
+            next_cursor = encode_cursor(variants[-1].id)
+        return Page(items=variants, next_cursor=next_cursor)
+
     async def get_variant_by_id(self, variant_id: str) -> QuestionVariant | None:
         row = await self._fetch_one(
             "SELECT * FROM question_variants WHERE id = ?",
@@ -195,37 +487,55 @@ class SQLiteContentRepository(ContentRepository):
         )
         return QuestionVariant(**row) if row else None
 
-    async def get_random_variant_for_cluster(self, cluster_id: str) -> QuestionVariant | None:
-        row = await self._fetch_one(
-            "SELECT * FROM question_variants WHERE cluster_id = ? ORDER BY RANDOM() LIMIT 1",
-            (cluster_id,),
-        )
-        return QuestionVariant(**row) if row else None
+    async def get_random_variant_for_cluster(
+        self,
+        cluster_id: str,
+        session_id: str | None = None,
+    ) -> QuestionVariant | None:
+        sampler = await self._ensure_sampler()
+        picked = sampler.sample(cluster_ids=[cluster_id], session_id=session_id)
+        if not picked:
+            return None
+        return await self.get_variant_by_id(picked[0])
 
     async def create_variant(self, variant: QuestionVariant) -> QuestionVariant:
         await self._execute(
             "INSERT INTO question_variants (id, cluster_id, question_text) VALUES (?, ?, ?)",
             (variant.id, variant.cluster_id, variant.question_text),
+            "variant", variant.id, ContentAction.CREATED,
         )
+        self._sampler.invalidate()
         return variant
 
     async def update_variant(self, variant: QuestionVariant) -> QuestionVariant:
         await self._execute(
             "UPDATE question_variants SET cluster_id = ?, question_text = ? WHERE id = ?",
             (variant.cluster_id, variant.question_text, variant.id),
+            "variant", variant.id, ContentAction.UPDATED,
         )
+        self._sampler.invalidate()
         return variant
 
     async def delete_variant(self, variant_id: str) -> bool:
-        conn = self._ensure_connected()
-        # Delete answers first
-        await conn.execute("DELETE FROM answers WHERE variant_id = ?", (variant_id,))
-        # Delete variant
-        cursor = await conn.execute(
-            "DELETE FROM question_variants WHERE id = ?",
-            (variant_id,),
-        )
-        await conn.commit()
+        async with self._writer() as conn:
+            logs = await self._log_changes(
+                conn, "answer", ContentAction.DELETED,
+                where="variant_id = ?", params=(variant_id,),
+            )
+            logs += await self._log_changes(
+                conn, "variant", ContentAction.DELETED,
+                where="id = ?", params=(variant_id,),
+            )
+            # Delete answers first
+            await conn.execute("DELETE FROM answers WHERE variant_id = ?", (variant_id,))
+            # Delete variant
+            cursor = await conn.execute(
+                "DELETE FROM question_variants WHERE id = ?",
+                (variant_id,),
+            )
+            await conn.commit()
+        self._logged(logs)
+        self._sampler.invalidate()
         return cursor.rowcount > 0
 
     # -------------------------------------------------------------------------
@@ -239,81 +549,221 @@ class SQLiteContentRepository(ContentRepository):
         )
         return [Answer(**row) for row in rows]
 
+    async def get_answer_by_id(self, answer_id: str) -> Answer | None:
+        row = await self._fetch_one("SELECT * FROM answers WHERE id = ?", (answer_id,))
+        return Answer(**row) if row else None
+
     async def create_answer(self, answer: Answer) -> Answer:
         await self._execute(
             "INSERT INTO answers (id, variant_id, answer_text, is_correct) VALUES (?, ?, ?, ?)",
             (answer.id, answer.variant_id, answer.answer_text, 1 if answer.is_correct else 0),
+            "answer", answer.id, ContentAction.CREATED,
         )
         return answer
 
     async def create_answers_bulk(self, answers: list[Answer]) -> list[Answer]:
-        conn = self._ensure_connected()
-        await conn.executemany(
-            "INSERT INTO answers (id, variant_id, answer_text, is_correct) VALUES (?, ?, ?, ?)",
-            [(a.id, a.variant_id, a.answer_text, 1 if a.is_correct else 0) for a in answers],
-        )
-        await conn.commit()
+        async with self._writer() as conn:
+            await conn.executemany(
+                "INSERT INTO answers (id, variant_id, answer_text, is_correct) VALUES (?, ?, ?, ?)",
+                [(a.id, a.variant_id, a.answer_text, 1 if a.is_correct else 0) for a in answers],
+            )
+            logs = await self._log_changes(
+                conn, "answer", ContentAction.CREATED, [a.id for a in answers]
+            )
+            await conn.commit()
+        self._logged(logs)
         return answers
 
     async def update_answer(self, answer: Answer) -> Answer:
         await self._execute(
             "UPDATE answers SET variant_id = ?, answer_text = ?, is_correct = ? WHERE id = ?",
             (answer.variant_id, answer.answer_text, 1 if answer.is_correct else 0, answer.id),
+            "answer", answer.id, ContentAction.UPDATED,
         )
         return answer
 
     async def delete_answer(self, answer_id: str) -> bool:
-        conn = self._ensure_connected()
-        cursor = await conn.execute("DELETE FROM answers WHERE id = ?", (answer_id,))
-        await conn.commit()
-        return cursor.rowcount > 0
+        deleted = await self._execute(
+            "DELETE FROM answers WHERE id = ?", (answer_id,),
+            "answer", answer_id, ContentAction.DELETED,
+        )
+        return deleted > 0
 
     # -------------------------------------------------------------------------
     # Convenience Methods
     # -------------------------------------------------------------------------
 
-    async def get_question_with_answers(self, variant_id: str) -> QuestionWithAnswers | None:
-        variant = await self.get_variant_by_id(variant_id)
-        if not variant:
-            return None
-
-        answers = await self.get_answers_by_variant(variant_id)
-        cluster = await self.get_cluster_by_id(variant.cluster_id)
+    @staticmethod
+    def _row_to_question(row: dict[str, Any]) -> QuestionWithAnswers:
+        """Convert a hydration row to QuestionWithAnswers."""
+        cluster = None
+        if row["c_id"] is not None:
+            cluster = QuestionCluster(
+                id=row["c_id"],
+                subject_id=row["c_subject_id"],
+                topic=row["c_topic"],
+                canonical_template=row["c_canonical_template"],
+                difficulty_baseline=row["c_difficulty_baseline"],
+            )
         subject = None
-        if cluster:
-            subject = await self.get_subject_by_id(cluster.subject_id)
+        if row["s_id"] is not None:
+            subject = Subject(id=row["s_id"], key=row["s_key"], name=row["s_name"])
 
         return QuestionWithAnswers(
-            variant=variant,
-            answers=answers,
+            variant=QuestionVariant(
+                id=row["variant_id"],
+                cluster_id=row["cluster_id"],
+                question_text=row["question_text"],
+            ),
+            answers=[Answer(**a) for a in json.loads(row["answers_json"])],
             cluster=cluster,
             subject=subject,
         )
 
-    async def get_random_question_for_subject(self, subject_key: str) -> QuestionWithAnswers | None:
-        # Get subject
-        subject = await self.get_subject_by_key(subject_key)
-        if not subject:
-            return None
-
-        # Get random variant for this subject
+    async def get_question_with_answers(self, variant_id: str) -> QuestionWithAnswers | None:
         row = await self._fetch_one(
-            """SELECT qv.* FROM question_variants qv
-               JOIN question_clusters qc ON qv.cluster_id = qc.id
-               WHERE qc.subject_id = ?
-               ORDER BY RANDOM() LIMIT 1""",
-            (subject.id,),
+            f"{_QUESTION_SELECT} WHERE qv.id = ?",
+            (variant_id,),
         )
-        if not row:
+        return self._row_to_question(row) if row else None
+
+    async def get_questions_with_answers(self, variant_ids: list[str]) -> list[QuestionWithAnswers]:
+        unique_ids = list(dict.fromkeys(variant_ids))
+        by_id: dict[str, QuestionWithAnswers] = {}
+
+        for start in range(0, len(unique_ids), _MAX_IN_PARAMS):
+            chunk = unique_ids[start:start + _MAX_IN_PARAMS]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows = await self._fetch_all(
+                f"{_QUESTION_SELECT} WHERE qv.id IN ({placeholders})",
+                tuple(chunk),
+            )
+            for row in rows:
+                by_id[row["variant_id"]] = self._row_to_question(row)
+
+        return [by_id[vid] for vid in unique_ids if vid in by_id]
+
+    async def sample_variant_ids(
+        self,
+        count: int,
+        subject_key: str | None = None,
+        cluster_ids: list[str] | None = None,
+        min_difficulty: int | None = None,
+        max_difficulty: int | None = None,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> list[str]:
+        sampler = await self._ensure_sampler()
+        subject_id = None
+        if subject_key is not None:
+            subject_id = sampler.subject_id_for_key(subject_key)
+            if subject_id is None:
+                return []
+
+        return sampler.sample(
+            count=count,
+            subject_id=subject_id,
+            cluster_ids=cluster_ids,
+            min_difficulty=min_difficulty,
+            max_difficulty=max_difficulty,
+            weighted=weighted,
+            session_id=session_id,
+        )
+
+    async def get_random_questions(
+        self,
+        count: int,
+        subject_key: str | None = None,
+        cluster_ids: list[str] | None = None,
+        min_difficulty: int | None = None,
+        max_difficulty: int | None = None,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> list[QuestionWithAnswers]:
+        picked = await self.sample_variant_ids(
+            count=count,
+            subject_key=subject_key,
+            cluster_ids=cluster_ids,
+            min_difficulty=min_difficulty,
+            max_difficulty=max_difficulty,
+            weighted=weighted,
+            session_id=session_id,
+        )
+        return await self.get_questions_with_answers(picked)
+
+    async def get_random_question_for_subject(
+        self,
+        subject_key: str,
+        weighted: bool = False,
+        session_id: str | None = None,
+    ) -> QuestionWithAnswers | None:
+        picked = await self.sample_variant_ids(
+            count=1, subject_key=subject_key, weighted=weighted, session_id=session_id
+        )
+        if not picked:
             return None
+        return await self.get_question_with_answers(picked[0])
+
+    # -------------------------------------------------------------------------
+    # Change tracking
+    # -------------------------------------------------------------------------
 
-        variant = QuestionVariant(**row)
-        answers = await self.get_answers_by_variant(variant.id)
-        cluster = await self.get_cluster_by_id(variant.cluster_id)
+    async def get_content_versions(self) -> dict[str, int]:
+        rows = await self._fetch_all("SELECT table_name, version FROM content_versions")
+        return {row["table_name"]: row["version"] for row in rows}
 
-        return QuestionWithAnswers(
-            variant=variant,
-            answers=answers,
-            cluster=cluster,
-            subject=subject,
-        )
+    # -------------------------------------------------------------------------
+    # Bulk operations (task revert)
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _entity_table(entity_type: str) -> tuple[str, type[BaseModel]]:
+        """Get table name and model of a content log entity type."""
+        if entity_type not in _ENTITY_TABLES:
+            raise ValueError(f"Unknown entity type: {entity_type}")
+        return _ENTITY_TABLES[entity_type]
+
+    async def delete_entities(self, entity_type: str, entity_ids: Sequence[str]) -> int:
+        self._entity_table(entity_type)
+        ids = list(dict.fromkeys(entity_ids))
+        if not ids:
+            return 0
+
+        deleted = 0
+        async with self._writer() as conn:
+            for start in range(0, len(ids), _MAX_IN_PARAMS):
+                chunk = ids[start:start + _MAX_IN_PARAMS]
+                placeholders = ", ".join("?" * len(chunk))
+                for statement in _DELETE_STATEMENTS[entity_type]:
+                    cursor = await conn.execute(statement.format(ids=placeholders), chunk)
+                # The last statement deletes the entities themselves
+                deleted += cursor.rowcount
+            await conn.commit()
+        self._sampler.invalidate()
+        return deleted
+
+    async def restore_entities(self, entity_type: str, rows: Sequence[dict[str, Any]]) -> int:
+        table, model = self._entity_table(entity_type)
+        if not rows:
+            return 0
+
+        # Only model fields become columns, so snapshot keys never reach the SQL
+        try:
+            entities = [model.model_validate(row) for row in rows]
+        except ValidationError as e:
+            raise ValueError(f"Invalid {entity_type} snapshot: {e}") from e
+        columns = list(model.model_fields)
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns if col != "id")
+
+        # Upsert rather than INSERT OR REPLACE, which would delete and
+        # re-insert the row and trip foreign keys of its dependents
+        async with self._writer() as conn:
+            await conn.executemany(
+                f"""INSERT INTO {table} ({", ".join(columns)})
+                    VALUES ({", ".join("?" * len(columns))})
+                    ON CONFLICT(id) DO UPDATE SET {updates}""",
+                [tuple(getattr(entity, col) for col in columns) for entity in entities],
+            )
+            await conn.commit()
+        self._sampler.invalidate()
+        return len(entities)
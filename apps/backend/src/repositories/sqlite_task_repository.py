@@ -2,19 +2,107 @@
 
 import json
 import aiosqlite
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, AsyncIterator, Collection, Sequence
 
+from .pagination import Page, decode_cursor, encode_cursor
 from .task_repository import TaskRepository
+from ..db.connection import open_connection
+from ..db.pool import SQLiteConnectionPool
 from ..models.tasks import (
     GenerationTask,
     TaskContentLog,
+    TaskPriority,
     TaskStatus,
+    TaskSummary,
     TaskType,
+    TaskWorker,
     ContentAction,
 )
 
 
+# Columns of the list view; payload and user_context are never read
+_SUMMARY_COLUMNS = """id, task_type, status, priority, created_at, delayed_until, started_at,
+    completed_at, COALESCE(progress_current, 0) AS progress_current,
+    COALESCE(progress_total, 0) AS progress_total, progress_message, lease_owner,
+    error_message, COALESCE(retry_count, 0) AS retry_count,
+    COALESCE(max_retries, 3) AS max_retries, accepted_at, reverted_at"""
+
+_INSERT_CONTENT_LOG = """INSERT INTO task_content_log
+    (id, task_id, entity_type, entity_id, action, previous_data, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+
+# Same insert, but only while the worker (last parameter) holds the lease
+_INSERT_LEASED_CONTENT_LOG = """INSERT INTO task_content_log
+    (id, task_id, entity_type, entity_id, action, previous_data, created_at)
+    SELECT ?, ?, ?, ?, ?, ?, ? WHERE EXISTS (
+        SELECT 1 FROM generation_tasks
+        WHERE id = ? AND lease_owner = ? AND status = 'in_progress')"""
+
+# Columns shared by generation_tasks and archived_tasks
+_TASK_COLUMNS = """id, task_type, status, payload, user_context, created_at, delayed_until,
+    started_at, completed_at, progress_current, progress_total, progress_message,
+    heartbeat_at, error_message, retry_count, max_retries, accepted_at, reverted_at,
+    lease_owner, lease_expires_at, priority"""
+
+# Same columns with the payload blob optionally dropped (first parameter)
+_ARCHIVE_TASK_SELECT = """id, task_type, status, CASE WHEN ? THEN NULL ELSE payload END,
+    user_context, created_at, delayed_until, started_at, completed_at, progress_current,
+    progress_total, progress_message, heartbeat_at, error_message, retry_count,
+    max_retries, accepted_at, reverted_at, lease_owner, lease_expires_at, priority"""
+
+_CONTENT_LOG_COLUMNS = "id, task_id, entity_type, entity_id, action, previous_data, created_at"
+
+_FINISHED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED)
+
+# Fair scheduling: each claim scores the oldest ready tasks of every type
+_CLAIM_WINDOW = 16  # candidates per task type
+_AGING_SECONDS = 300.0  # waiting this long is worth one priority lane
+_FAIR_SHARE_PENALTY = 0.5  # lanes per running task of the same type / submitter
+
+# Candidates of one task type: the head of its lanes (idx_tasks_claim_lanes)
+# plus its oldest ready task, which would otherwise never enter the window
+# while the higher lanes stay full and so could not age its way up
+_CLAIM_CANDIDATES = """SELECT * FROM (
+    SELECT id, task_type, user_context, priority, created_at FROM generation_tasks
+    WHERE status = 'pending' AND task_type = ?
+    AND (delayed_until IS NULL OR delayed_until <= ?)
+    ORDER BY priority DESC, created_at ASC
+    LIMIT ?)
+    UNION ALL
+    SELECT * FROM (
+    SELECT id, task_type, user_context, priority, created_at FROM generation_tasks
+    WHERE status = 'pending' AND task_type = ?
+    AND (delayed_until IS NULL OR delayed_until <= ?)
+    ORDER BY created_at ASC
+    LIMIT 1)"""
+
+
+def _content_log_to_row(log: TaskContentLog) -> tuple:
+    """Convert TaskContentLog to database row values (for _INSERT_CONTENT_LOG)."""
+    return (
+        log.id,
+        log.task_id,
+        log.entity_type,
+        log.entity_id,
+        log.action.value,
+        json.dumps(log.previous_data) if log.previous_data else None,
+        log.created_at.isoformat(),
+    )
+
+
+async def insert_content_logs(
+    conn: aiosqlite.Connection, logs: Sequence[TaskContentLog]
+) -> None:
+    """Insert content log entries on a write connection, without committing.
+
+    Lets other repositories log task writes in their own transaction.
+    """
+    if logs:
+        await conn.executemany(_INSERT_CONTENT_LOG, [_content_log_to_row(log) for log in logs])
+
+
 class SQLiteTaskRepository(TaskRepository):
     """SQLite implementation of TaskRepository.
 
@@ -22,13 +110,16 @@ class SQLiteTaskRepository(TaskRepository):
     Suitable for local development and testing.
     """
 
-    def __init__(self, database_path: str):
+    def __init__(self, database_path: str, pool: SQLiteConnectionPool | None = None):
         """Initialize SQLite task repository.
 
         Args:
             database_path: Path to SQLite database file, or ':memory:' for in-memory
+            pool: Optional shared connection pool. When given, connections are
+                  borrowed from the pool and connect()/disconnect() are no-ops.
         """
         self._database_path = database_path
+        self._pool = pool
         self._connection: aiosqlite.Connection | None = None
 
     # -------------------------------------------------------------------------
@@ -37,10 +128,10 @@ class SQLiteTaskRepository(TaskRepository):
 
     async def connect(self) -> None:
         """Establish database connection."""
+        if self._pool is not None:
+            return  # Connections are owned by the pool
         if self._connection is None:
-            self._connection = await aiosqlite.connect(self._database_path)
-            self._connection.row_factory = aiosqlite.Row
-            await self._connection.execute("PRAGMA foreign_keys = ON")
+            self._connection = await open_connection(self._database_path)
 
     async def disconnect(self) -> None:
         """Close database connection."""
@@ -54,24 +145,60 @@ class SQLiteTaskRepository(TaskRepository):
             raise RuntimeError("Repository not connected. Call connect() first.")
         return self._connection
 
-    async def _execute(self, sql: str, params: tuple = ()) -> None:
-        """Execute a SQL statement."""
-        conn = self._ensure_connected()
-        await conn.execute(sql, params)
-        await conn.commit()
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get a connection for read-only queries."""
+        if self._pool is not None:
+            async with self._pool.reader() as conn:
+                yield conn
+        else:
+            yield self._ensure_connected()
+
+    @asynccontextmanager
+    async def _writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get the connection for statements that modify data."""
+        if self._pool is not None:
+            async with self._pool.writer() as conn:
+                yield conn
+        else:
+            yield self._ensure_connected()
+
+    async def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Execute a SQL statement. Returns the number of affected rows."""
+        async with self._writer() as conn:
+            cursor = await conn.execute(sql, params)
+            await conn.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _lease_guard(
+        task_id: str, lease_owner: str | None
+    ) -> tuple[str, str, tuple[Any, ...]]:
+        """Build the lease release and WHERE clause of a runner-side status write.
+
+        Returns:
+            (extra SET assignments, WHERE clause, WHERE parameters)
+        """
+        if lease_owner is None:
+            return "", "id = ?", (task_id,)
+        return (
+            ", lease_owner = NULL, lease_expires_at = NULL",
+            "id = ? AND lease_owner = ? AND status = 'in_progress'",
+            (task_id, lease_owner),
+        )
 
     async def _fetch_one(self, sql: str, params: tuple = ()) -> dict[str, Any] | None:
         """Fetch a single row."""
-        conn = self._ensure_connected()
-        cursor = await conn.execute(sql, params)
-        row = await cursor.fetchone()
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            row = await cursor.fetchone()
         return dict(row) if row else None
 
     async def _fetch_all(self, sql: str, params: tuple = ()) -> list[dict[str, Any]]:
         """Fetch all rows."""
-        conn = self._ensure_connected()
-        cursor = await conn.execute(sql, params)
-        rows = await cursor.fetchall()
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            rows = await cursor.fetchall()
         return [dict(row) for row in rows]
 
     # -------------------------------------------------------------------------
@@ -109,6 +236,7 @@ class SQLiteTaskRepository(TaskRepository):
             task.max_retries,
             self._datetime_to_str(task.accepted_at),
             self._datetime_to_str(task.reverted_at),
+            int(task.priority),
         )
 
     def _row_to_task(self, row: dict[str, Any]) -> GenerationTask:
@@ -117,7 +245,8 @@ class SQLiteTaskRepository(TaskRepository):
             id=row["id"],
             task_type=TaskType(row["task_type"]),
             status=TaskStatus(row["status"]),
-            payload=json.loads(row["payload"]),
+            priority=TaskPriority(row["priority"]),
+            payload=json.loads(row["payload"]) if row["payload"] else {},
             user_context=row["user_context"],
             created_at=self._str_to_datetime(row["created_at"]) or datetime.utcnow(),
             delayed_until=self._str_to_datetime(row["delayed_until"]),
@@ -132,6 +261,9 @@ class SQLiteTaskRepository(TaskRepository):
             max_retries=row["max_retries"] or 3,
             accepted_at=self._str_to_datetime(row["accepted_at"]),
             reverted_at=self._str_to_datetime(row["reverted_at"]),
+            lease_owner=row["lease_owner"],
+            lease_expires_at=self._str_to_datetime(row["lease_expires_at"]),
+            archived_at=self._str_to_datetime(row.get("archived_at")),
         )
 
     def _row_to_content_log(self, row: dict[str, Any]) -> TaskContentLog:
@@ -161,18 +293,23 @@ class SQLiteTaskRepository(TaskRepository):
                (id, task_type, status, payload, user_context,
                 created_at, delayed_until, started_at, completed_at,
                 progress_current, progress_total, progress_message, heartbeat_at,
-                error_message, retry_count, max_retries, accepted_at, reverted_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                error_message, retry_count, max_retries, accepted_at, reverted_at, priority)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             self._task_to_row(task),
         )
         return task
 
     async def get_task_by_id(self, task_id: str) -> GenerationTask | None:
-        """Get a task by ID."""
+        """Get a task by ID, falling back to the archive."""
         row = await self._fetch_one(
             "SELECT * FROM generation_tasks WHERE id = ?",
             (task_id,),
         )
+        if row is None:
+            row = await self._fetch_one(
+                "SELECT * FROM archived_tasks WHERE id = ?",
+                (task_id,),
+            )
         return self._row_to_task(row) if row else None
 
     async def get_tasks(
@@ -183,33 +320,72 @@ class SQLiteTaskRepository(TaskRepository):
         offset: int = 0,
     ) -> list[GenerationTask]:
         """Get tasks with optional filtering."""
-        conditions = []
-        params: list[Any] = []
-
-        if status:
-            conditions.append("status = ?")
-            params.append(status.value)
-        if task_type:
-            conditions.append("task_type = ?")
-            params.append(task_type.value)
-
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
+        where_clause, params = self._task_filter(status, task_type)
         rows = await self._fetch_all(
             f"""SELECT * FROM generation_tasks
                 WHERE {where_clause}
-                ORDER BY created_at DESC
+                ORDER BY created_at DESC, id DESC
                 LIMIT ? OFFSET ?""",
             tuple(params + [limit, offset]),
         )
         return [self._row_to_task(row) for row in rows]
 
+    async def get_task_summaries(
+        self,
+        status: TaskStatus | None = None,
+        task_type: TaskType | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> Page[TaskSummary]:
+        """Get list-view projections of tasks (no payload or content log)."""
+        where_clause, params = self._task_filter(status, task_type)
+        if cursor:
+            created_at, last_id = decode_cursor(cursor, 2)
+            where_clause += " AND (created_at, id) < (?, ?)"
+            params.extend([created_at, last_id])
+            offset = 0
+
+        # Fetch one extra row to know whether another page follows
+        rows = await self._fetch_all(
+            f"""SELECT {_SUMMARY_COLUMNS} FROM generation_tasks
+                WHERE {where_clause}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ? OFFSET ?""",
+            tuple(params + [limit + 1, offset]),
+        )
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            # Raw column value, so the cursor compares exactly as stored
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+
+        # Validated once, straight from the row (pydantic parses the timestamps)
+        return Page(
+            items=[TaskSummary.model_validate(row) for row in rows],
+            next_cursor=next_cursor,
+        )
+
     async def count_tasks(
         self,
         status: TaskStatus | None = None,
         task_type: TaskType | None = None,
     ) -> int:
-        """Count tasks with optional filtering."""
+        """Count tasks with optional filtering (from trigger-maintained counters)."""
+        where_clause, params = self._task_filter(status, task_type)
+        row = await self._fetch_one(
+            f"SELECT COALESCE(SUM(count), 0) as count FROM task_counts WHERE {where_clause}",
+            tuple(params),
+        )
+        return row["count"] if row else 0
+
+    @staticmethod
+    def _task_filter(
+        status: TaskStatus | None,
+        task_type: TaskType | None,
+    ) -> tuple[str, list[Any]]:
+        """Build the WHERE clause for status / task type filters."""
         conditions = []
         params: list[Any] = []
 
@@ -220,13 +396,7 @@ class SQLiteTaskRepository(TaskRepository):
             conditions.append("task_type = ?")
             params.append(task_type.value)
 
-        where_clause = " AND ".join(conditions) if conditions else "1=1"
-
-        row = await self._fetch_one(
-            f"SELECT COUNT(*) as count FROM generation_tasks WHERE {where_clause}",
-            tuple(params),
-        )
-        return row["count"] if row else 0
+        return (" AND ".join(conditions) if conditions else "1=1"), params
 
     async def update_task(self, task: GenerationTask) -> GenerationTask:
         """Update an existing task."""
@@ -235,7 +405,8 @@ class SQLiteTaskRepository(TaskRepository):
                task_type = ?, status = ?, payload = ?, user_context = ?,
                created_at = ?, delayed_until = ?, started_at = ?, completed_at = ?,
                progress_current = ?, progress_total = ?, progress_message = ?, heartbeat_at = ?,
-               error_message = ?, retry_count = ?, max_retries = ?, accepted_at = ?, reverted_at = ?
+               error_message = ?, retry_count = ?, max_retries = ?, accepted_at = ?, reverted_at = ?,
+               priority = ?
                WHERE id = ?""",
             (
                 task.task_type.value,
@@ -255,6 +426,7 @@ class SQLiteTaskRepository(TaskRepository):
                 task.max_retries,
                 self._datetime_to_str(task.accepted_at),
                 self._datetime_to_str(task.reverted_at),
+                int(task.priority),
                 task.id,
             ),
         )
@@ -262,13 +434,13 @@ class SQLiteTaskRepository(TaskRepository):
 
     async def delete_task(self, task_id: str) -> bool:
         """Delete a task. Returns True if deleted, False if not found."""
-        conn = self._ensure_connected()
         # Content log will be deleted by CASCADE
-        cursor = await conn.execute(
-            "DELETE FROM generation_tasks WHERE id = ?",
-            (task_id,),
-        )
-        await conn.commit()
+        async with self._writer() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM generation_tasks WHERE id = ?",
+                (task_id,),
+            )
+            await conn.commit()
         return cursor.rowcount > 0
 
     # -------------------------------------------------------------------------
@@ -276,35 +448,117 @@ class SQLiteTaskRepository(TaskRepository):
     # -------------------------------------------------------------------------
 
     async def get_next_pending_task(self) -> GenerationTask | None:
-        """Get oldest pending task that is ready to run."""
+        """Get the oldest pending task of the highest lane that is ready to run."""
         row = await self._fetch_one(
             """SELECT * FROM generation_tasks
                WHERE status = 'pending'
                AND (delayed_until IS NULL OR delayed_until <= datetime('now'))
-               ORDER BY created_at ASC
+               ORDER BY priority DESC, created_at ASC
                LIMIT 1""",
         )
         return self._row_to_task(row) if row else None
 
+    async def get_next_delayed_until(self) -> datetime | None:
+        """Get the earliest future delayed_until among pending tasks."""
+        row = await self._fetch_one(
+            """SELECT MIN(delayed_until) AS next_at FROM generation_tasks
+               WHERE status = 'pending' AND delayed_until > ?""",
+            (self._datetime_to_str(datetime.utcnow()),),
+        )
+        return self._str_to_datetime(row["next_at"]) if row else None
+
+    async def claim_next_pending_task(
+        self,
+        lease_owner: str,
+        lease_seconds: int,
+        exclude_types: Collection[TaskType] = (),
+    ) -> GenerationTask | None:
+        """Atomically claim the best-scored ready pending task."""
+        task_types = [task_type for task_type in TaskType if task_type not in exclude_types]
+        if not task_types:
+            return None
+
+        now = self._datetime_to_str(datetime.utcnow())
+        lease_expires_at = self._datetime_to_str(
+            datetime.utcnow() + timedelta(seconds=lease_seconds)
+        )
+        candidates = "\n            UNION ALL\n            ".join(
+            [_CLAIM_CANDIDATES] * len(task_types)
+        )
+        candidate_params: list[Any] = []
+        for task_type in task_types:
+            candidate_params.extend([task_type.value, now, _CLAIM_WINDOW, task_type.value, now])
+
+        # Score = lane + aging - fair-share penalty for every running task
+        # of the same type or submitter. Only _CLAIM_WINDOW tasks per type
+        # (plus its oldest) are scored, so the decision stays one bounded,
+        # indexed statement.
+        # delayed_until is stored in ISO format, so compare against an ISO
+        # timestamp rather than datetime('now') (which uses a space separator).
+        # BEGIN IMMEDIATE takes the write lock up front, so workers in other
+        # processes serialize on the claim instead of failing to upgrade.
+        async with self._writer() as conn:
+            await conn.execute("BEGIN IMMEDIATE")
+            cursor = await conn.execute(
+                f"""UPDATE generation_tasks
+                    SET status = 'in_progress',
+                        started_at = ?,
+                        heartbeat_at = datetime('now'),
+                        lease_owner = ?,
+                        lease_expires_at = ?
+                    WHERE id = (
+                        WITH candidates AS (
+            {candidates}
+                        ),
+                        running AS (
+                            SELECT task_type, user_context FROM generation_tasks
+                            WHERE status = 'in_progress'
+                        )
+                        SELECT c.id FROM candidates c
+                        ORDER BY c.priority
+                            + (julianday(?) - julianday(c.created_at)) * 86400.0 / ?
+                            - ? * (
+                                (SELECT COUNT(*) FROM running r WHERE r.task_type = c.task_type)
+                                + (SELECT COUNT(*) FROM running r
+                                   WHERE r.user_context IS c.user_context)
+                            ) DESC,
+                            c.created_at ASC
+                        LIMIT 1
+                    )
+                    AND status = 'pending'
+                    RETURNING *""",
+                (
+                    now, lease_owner, lease_expires_at,
+                    *candidate_params,
+                    now, _AGING_SECONDS, _FAIR_SHARE_PENALTY,
+                ),
+            )
+            row = await cursor.fetchone()
+            await conn.commit()
+        return self._row_to_task(dict(row)) if row else None
+
     async def update_task_status(
         self,
         task_id: str,
         status: TaskStatus,
         error_message: str | None = None,
-    ) -> None:
+        lease_owner: str | None = None,
+    ) -> bool:
         """Update task status and optionally error message."""
+        release, where, where_params = self._lease_guard(task_id, lease_owner)
         if error_message is not None:
-            await self._execute(
-                """UPDATE generation_tasks
-                   SET status = ?, error_message = ?
-                   WHERE id = ?""",
-                (status.value, error_message, task_id),
+            rowcount = await self._execute(
+                f"""UPDATE generation_tasks
+                    SET status = ?, error_message = ?{release}
+                    WHERE {where}""",
+                (status.value, error_message, *where_params),
             )
         else:
-            await self._execute(
-                "UPDATE generation_tasks SET status = ? WHERE id = ?",
-                (status.value, task_id),
+            rowcount = await self._execute(
+                f"UPDATE generation_tasks SET status = ?{release} WHERE {where}",
+                (status.value, *where_params),
             )
+        return rowcount > 0
 
     async def update_task_progress(
         self,
@@ -321,37 +575,113 @@ class SQLiteTaskRepository(TaskRepository):
             (current, total, message, task_id),
         )
 
-    async def update_task_heartbeat(self, task_id: str) -> None:
-        """Update task heartbeat timestamp."""
-        await self._execute(
-            """UPDATE generation_tasks
-               SET heartbeat_at = datetime('now')
-               WHERE id = ?""",
-            (task_id,),
-        )
+    async def update_task_heartbeat(
+        self,
+        task_id: str,
+        lease_owner: str | None = None,
+        lease_seconds: int | None = None,
+        progress: tuple[int, int, str | None] | None = None,
+    ) -> bool:
+        """Update task heartbeat (and optionally progress), renewing the lease if owned."""
+        assignments = ["heartbeat_at = datetime('now')"]
+        params: list[Any] = []
+        if progress is not None:
+            assignments.append("progress_current = ?, progress_total = ?, progress_message = ?")
+            params.extend(progress)
+        conditions = ["id = ?"]
+        where_params: list[Any] = [task_id]
+        if lease_owner is not None:
+            expires_at = datetime.utcnow() + timedelta(seconds=lease_seconds or 0)
+            assignments.append("lease_expires_at = ?")
+            params.append(self._datetime_to_str(expires_at))
+            conditions.append("lease_owner = ? AND status = 'in_progress'")
+            where_params.append(lease_owner)
+
+        async with self._writer() as conn:
+            cursor = await conn.execute(
+                f"""UPDATE generation_tasks
+                    SET {', '.join(assignments)}
+                    WHERE {' AND '.join(conditions)}""",
+                tuple(params + where_params),
+            )
+            await conn.commit()
+        return cursor.rowcount > 0
+
+    async def complete_task(
+        self,
+        task_id: str,
+        lease_owner: str | None = None,
+        content_logs: Sequence[TaskContentLog] = (),
+    ) -> bool:
+        """Mark a task completed, inserting remaining content logs in the same transaction."""
+        release, where, where_params = self._lease_guard(task_id, lease_owner)
+        async with self._writer() as conn:
+            cursor = await conn.execute(
+                f"""UPDATE generation_tasks
+                    SET status = 'completed', completed_at = ?{release}
+                    WHERE {where}""",
+                (self._datetime_to_str(datetime.utcnow()), *where_params),
+            )
+            if cursor.rowcount == 0:
+                await conn.rollback()
+                return False
+            await insert_content_logs(conn, content_logs)
+            await conn.commit()
+        return True
 
     async def get_stuck_tasks(self, timeout_seconds: int) -> list[GenerationTask]:
-        """Get tasks with stale heartbeats."""
+        """Get in_progress tasks with stale heartbeats or expired leases."""
         rows = await self._fetch_all(
             """SELECT * FROM generation_tasks
                WHERE status = 'in_progress'
-               AND heartbeat_at IS NOT NULL
-               AND heartbeat_at < datetime('now', ? || ' seconds')""",
-            (f"-{timeout_seconds}",),
+               AND (
+                   (heartbeat_at IS NOT NULL
+                    AND heartbeat_at < datetime('now', ? || ' seconds'))
+                   OR (lease_expires_at IS NOT NULL AND lease_expires_at < ?)
+               )""",
+            (f"-{timeout_seconds}", self._datetime_to_str(datetime.utcnow())),
         )
         return [self._row_to_task(row) for row in rows]
 
-    async def increment_retry_count(self, task_id: str, delay_seconds: int) -> None:
+    async def increment_retry_count(
+        self,
+        task_id: str,
+        delay_seconds: float,
+        lease_owner: str | None = None,
+    ) -> bool:
         """Increment retry count and set delayed_until for retry."""
         delayed_until = datetime.utcnow() + timedelta(seconds=delay_seconds)
-        await self._execute(
-            """UPDATE generation_tasks
-               SET retry_count = retry_count + 1,
-                   status = 'pending',
-                   delayed_until = ?
-               WHERE id = ?""",
-            (self._datetime_to_str(delayed_until), task_id),
+        release, where, where_params = self._lease_guard(task_id, lease_owner)
+        rowcount = await self._execute(
+            f"""UPDATE generation_tasks
+                SET retry_count = retry_count + 1,
+                    status = 'pending',
+                    delayed_until = ?{release}
+                WHERE {where}""",
+            (self._datetime_to_str(delayed_until), *where_params),
+        )
+        return rowcount > 0
+
+    async def reschedule_task(
+        self,
+        task_id: str,
+        delay_seconds: float,
+        lease_owner: str | None = None,
+    ) -> bool:
+        """Put a task back in the queue without counting a retry."""
+        delayed_until = datetime.utcnow() + timedelta(seconds=delay_seconds)
+        _, where, where_params = self._lease_guard(task_id, lease_owner)
+        rowcount = await self._execute(
+            f"""UPDATE generation_tasks
+                SET status = 'pending',
+                    delayed_until = ?,
+                    started_at = NULL,
+                    lease_owner = NULL,
+                    lease_expires_at = NULL
+                WHERE {where}""",
+            (self._datetime_to_str(delayed_until), *where_params),
         )
+        return rowcount > 0
 
     # -------------------------------------------------------------------------
     # Content Log
@@ -359,37 +689,162 @@ class SQLiteTaskRepository(TaskRepository):
 
     async def create_content_log(self, log: TaskContentLog) -> TaskContentLog:
         """Create a content log entry."""
-        previous_data_json = json.dumps(log.previous_data) if log.previous_data else None
-        await self._execute(
-            """INSERT INTO task_content_log
-               (id, task_id, entity_type, entity_id, action, previous_data, created_at)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                log.id,
-                log.task_id,
-                log.entity_type,
-                log.entity_id,
-                log.action.value,
-                previous_data_json,
-                self._datetime_to_str(log.created_at),
-            ),
-        )
+        await self._execute(_INSERT_CONTENT_LOG, _content_log_to_row(log))
         return log
 
+    async def create_content_logs(
+        self,
+        logs: Sequence[TaskContentLog],
+        lease_owner: str | None = None,
+    ) -> bool:
+        """Create many content log entries in one transaction."""
+        if not logs:
+            return True
+        async with self._writer() as conn:
+            if lease_owner is None:
+                await insert_content_logs(conn, logs)
+                await conn.commit()
+                return True
+            # One statement per row, but the first one takes the write lock,
+            # so either every row sees the lease or none does
+            cursor = await conn.executemany(
+                _INSERT_LEASED_CONTENT_LOG,
+                [(*_content_log_to_row(log), log.task_id, lease_owner) for log in logs],
+            )
+            await conn.commit()
+        return cursor.rowcount > 0
+
     async def get_content_log_by_task(self, task_id: str) -> list[TaskContentLog]:
-        """Get all content log entries for a task."""
+        """Get all content log entries for a task (live or archived)."""
         rows = await self._fetch_all(
-            "SELECT * FROM task_content_log WHERE task_id = ? ORDER BY created_at ASC",
-            (task_id,),
+            f"""SELECT {_CONTENT_LOG_COLUMNS} FROM task_content_log WHERE task_id = ?
+                UNION ALL
+                SELECT {_CONTENT_LOG_COLUMNS} FROM archived_task_content_log WHERE task_id = ?
+                ORDER BY created_at ASC""",
+            (task_id, task_id),
         )
         return [self._row_to_content_log(row) for row in rows]
 
     async def delete_content_log_by_task(self, task_id: str) -> int:
         """Delete all content log entries for a task."""
-        conn = self._ensure_connected()
-        cursor = await conn.execute(
-            "DELETE FROM task_content_log WHERE task_id = ?",
-            (task_id,),
-        )
-        await conn.commit()
+        async with self._writer() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM task_content_log WHERE task_id = ?",
+                (task_id,),
+            )
+            await conn.commit()
         return cursor.rowcount
+
+    # -------------------------------------------------------------------------
+    # Retention
+    # -------------------------------------------------------------------------
+
+    async def archive_available(self) -> bool:
+        """Check if the archive tables exist (the migrations have been run)."""
+        row = await self._fetch_one(
+            """SELECT COUNT(*) AS found FROM sqlite_master
+               WHERE type = 'table'
+               AND name IN ('archived_tasks', 'archived_task_content_log')"""
+        )
+        return row is not None and row["found"] == 2
+
+    async def archive_finished_tasks(
+        self,
+        finished_before: datetime,
+        limit: int,
+        drop_payloads: bool = False,
+    ) -> int:
+        """Move one batch of old finished tasks into the archive tables."""
+        cutoff = self._datetime_to_str(finished_before)
+        statuses = [status.value for status in _FINISHED_STATUSES]
+        drop = 1 if drop_payloads else 0
+
+        # One short write transaction per batch; created_at < cutoff lets the
+        # (status, created_at, id) index bound the scan
+        async with self._writer() as conn:
+            await conn.execute("BEGIN IMMEDIATE")
+            cursor = await conn.execute(
+                f"""SELECT id FROM generation_tasks
+                    WHERE status IN ({', '.join('?' * len(statuses))})
+                    AND created_at < ?
+                    AND COALESCE(completed_at, started_at, created_at) < ?
+                    ORDER BY created_at ASC
+                    LIMIT ?""",
+                (*statuses, cutoff, cutoff, limit),
+            )
+            task_ids = [row[0] for row in await cursor.fetchall()]
+            if not task_ids:
+                await conn.commit()
+                return 0
+
+            placeholders = ", ".join("?" * len(task_ids))
+            await conn.execute(
+                f"""INSERT INTO archived_tasks ({_TASK_COLUMNS}, archived_at)
+                    SELECT {_ARCHIVE_TASK_SELECT}, ?
+                    FROM generation_tasks WHERE id IN ({placeholders})""",
+                (drop, self._datetime_to_str(datetime.utcnow()), *task_ids),
+            )
+            await conn.execute(
+                f"""INSERT INTO archived_task_content_log ({_CONTENT_LOG_COLUMNS})
+                    SELECT id, task_id, entity_type, entity_id, action,
+                           CASE WHEN ? THEN NULL ELSE previous_data END, created_at
+                    FROM task_content_log WHERE task_id IN ({placeholders})""",
+                (drop, *task_ids),
+            )
+            # Content log follows via ON DELETE CASCADE, counters via trigger
+            await conn.execute(
+                f"DELETE FROM generation_tasks WHERE id IN ({placeholders})",
+                tuple(task_ids),
+            )
+            await conn.commit()
+        return len(task_ids)
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    async def upsert_worker(self, worker: TaskWorker) -> None:
+        """Register a worker or refresh its heartbeat and running task count."""
+        await self._execute(
+            """INSERT INTO task_workers
+               (id, hostname, pid, concurrency, running_tasks, started_at, heartbeat_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(id) DO UPDATE SET
+                   concurrency = excluded.concurrency,
+                   running_tasks = excluded.running_tasks,
+                   heartbeat_at = excluded.heartbeat_at,
+                   stopped_at = NULL""",
+            (
+                worker.id,
+                worker.hostname,
+                worker.pid,
+                worker.concurrency,
+                worker.running_tasks,
+                self._datetime_to_str(worker.started_at),
+                self._datetime_to_str(worker.heartbeat_at or datetime.utcnow()),
+            ),
+        )
+
+    async def mark_worker_stopped(self, worker_id: str) -> None:
+        """Record that a worker shut down."""
+        await self._execute(
+            "UPDATE task_workers SET stopped_at = ?, running_tasks = 0 WHERE id = ?",
+            (self._datetime_to_str(datetime.utcnow()), worker_id),
+        )
+
+    async def get_workers(self) -> list[TaskWorker]:
+        """Get all registered workers, most recently started first."""
+        rows = await self._fetch_all("SELECT * FROM task_workers ORDER BY started_at DESC")
+        return [
+            TaskWorker(
+                id=row["id"],
+                hostname=row["hostname"],
+                pid=row["pid"],
+                concurrency=row["concurrency"],
+                running_tasks=row["running_tasks"],
+                started_at=self._str_to_datetime(row["started_at"]),
+                heartbeat_at=self._str_to_datetime(row["heartbeat_at"]),
+                stopped_at=self._str_to_datetime(row["stopped_at"]),
+            )
+            for row in rows
+        ]
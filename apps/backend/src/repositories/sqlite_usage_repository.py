@@ -0,0 +1,219 @@
+"""SQLite implementation of UsageRepository."""
+
+import aiosqlite
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Sequence
+
+from .usage_repository import UsageGranularity, UsageRepository
+from ..db.connection import open_connection
+from ..db.pool import SQLiteConnectionPool
+from ..models.tasks import LLMUsageLog, LLMUsageRollup
+
+# Rollup table and bucket format per granularity (matches m010 triggers)
+_ROLLUPS: dict[str, tuple[str, str]] = {
+    "hour": ("llm_usage_hourly", "%Y-%m-%dT%H:00:00"),
+    "day": ("llm_usage_daily", "%Y-%m-%d"),
+}
+
+_INSERT_USAGE_LOG = """INSERT INTO llm_usage_log
+    (id, created_at, provider, model, prompt_tokens, completion_tokens,
+     total_tokens, cost_cents, source_type, source_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+def _to_utc(dt: datetime) -> datetime:
+    """Convert to a naive UTC datetime."""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _bucket_conditions(
+    bucket_format: str, since: datetime | None, until: datetime | None
+) -> tuple[list[str], list[Any]]:
+    """Build WHERE conditions selecting the buckets that overlap [since, until).
+
+    Buckets are UTC, so aware bounds are converted first (naive ones are
+    taken as UTC, like the stored timestamps). Both bounds are compared in
+    the bucket's own format.
+    """
+    conditions: list[str] = []
+    params: list[Any] = []
+    if since is not None:
+        conditions.append("bucket >= ?")
+        params.append(_to_utc(since).strftime(bucket_format))
+    if until is not None:
+        until = _to_utc(until)
+        bucket = until.strftime(bucket_format)
+        # The bucket containing `until` only counts if it starts before it
+        conditions.append("bucket <= ?" if datetime.fromisoformat(bucket) < until else "bucket < ?")
+        params.append(bucket)
+    return conditions, params
+
+
+class SQLiteUsageRepository(UsageRepository):
+    """SQLite implementation of UsageRepository.
+
+    Uses aiosqlite for async SQLite operations.
+    Suitable for local development and testing.
+    """
+
+    def __init__(self, database_path: str, pool: SQLiteConnectionPool | None = None):
+        """Initialize SQLite usage repository.
+
+        Args:
+            database_path: Path to SQLite database file, or ':memory:' for in-memory
+            pool: Optional shared connection pool. When given, connections are
+                  borrowed from the pool and connect()/disconnect() are no-ops.
+        """
+        self._database_path = database_path
+        self._pool = pool
+        self._connection: aiosqlite.Connection | None = None
+
+    # -------------------------------------------------------------------------
+    # Connection Management
+    # -------------------------------------------------------------------------
+
+    async def connect(self) -> None:
+        """Establish database connection."""
+        if self._pool is not None:
+            return  # Connections are owned by the pool
+        if self._connection is None:
+            self._connection = await open_connection(self._database_path)
+
+    async def disconnect(self) -> None:
+        """Close database connection."""
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def _ensure_connected(self) -> aiosqlite.Connection:
+        """Ensure connection is established."""
+        if self._connection is None:
+            raise RuntimeError("Repository not connected. Call connect() first.")
+        return self._connection
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get a connection for read-only queries."""
+        if self._pool is not None:
+            async with self._pool.reader() as conn:
+                yield conn
+        else:
+            yield self._ensure_connected()
+
+    @asynccontextmanager
+    async def _writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Get the connection for statements that modify data."""
+        if self._pool is not None:
+            async with self._pool.writer() as conn:
+                yield conn
+        else:
+            yield self._ensure_connected()
+
+    async def _fetch_all(self, sql: str, params: tuple = ()) -> list[dict[str, Any]]:
+        """Fetch all rows."""
+        async with self._reader() as conn:
+            cursor = await conn.execute(sql, params)
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    # -------------------------------------------------------------------------
+    # Usage Log
+    # -------------------------------------------------------------------------
+
+    async def create_usage_logs(self, logs: Sequence[LLMUsageLog]) -> None:
+        """Insert many usage entries (and update the rollups) in one transaction."""
+        if not logs:
+            return
+        async with self._writer() as conn:
+            # The m010 trigger updates both rollups within this transaction
+            await conn.executemany(
+                _INSERT_USAGE_LOG,
+                [
+                    (
+                        log.id,
+                        log.created_at.isoformat(),
+                        log.provider,
+                        log.model,
+                        log.prompt_tokens,
+                        log.completion_tokens,
+                        log.total_tokens,
+                        log.cost_cents,
+                        log.source_type,
+                        log.source_id,
+                    )
+                    for log in logs
+                ],
+            )
+            await conn.commit()
+
+    # -------------------------------------------------------------------------
+    # Rollups
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _row_to_rollup(row: dict[str, Any]) -> LLMUsageRollup:
+        """Convert a rollup row ('' source_type means none)."""
+        return LLMUsageRollup.model_validate({**row, "source_type": row["source_type"] or None})
+
+    async def get_usage_rollups(
+        self,
+        granularity: UsageGranularity = "day",
+        since: datetime | None = None,
+        until: datetime | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+        source_type: str | None = None,
+        limit: int = 1000,
+    ) -> list[LLMUsageRollup]:
+        """Get usage per bucket, oldest bucket first."""
+        if granularity not in _ROLLUPS:
+            raise ValueError(f"Unknown usage granularity: {granularity}")
+        table, bucket_format = _ROLLUPS[granularity]
+
+        conditions, params = _bucket_conditions(bucket_format, since, until)
+        for column, value in (("provider", provider), ("model", model), ("source_type", source_type)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+
+        rows = await self._fetch_all(
+            f"""SELECT bucket, provider, model, source_type, requests, prompt_tokens,
+                       completion_tokens, total_tokens, cost_cents
+                FROM {table}
+                WHERE {where_clause}
+                ORDER BY bucket ASC, provider, model, source_type
+                LIMIT ?""",
+            tuple(params + [limit]),
+        )
+        return [self._row_to_rollup(row) for row in rows]
+
+    async def get_usage_totals(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        source_type: str | None = None,
+    ) -> list[LLMUsageRollup]:
+        """Get usage totals per provider and model over whole days."""
+        _, day_format = _ROLLUPS["day"]
+        conditions, params = _bucket_conditions(day_format, since, until)
+        if source_type is not None:
+            conditions.append("source_type = ?")
+            params.append(source_type)
+        where_clause = " AND ".join(conditions) if conditions else "1=1"
+
+        rows = await self._fetch_all(
+            f"""SELECT NULL AS bucket, provider, model, ? AS source_type,
+                       SUM(requests) AS requests, SUM(prompt_tokens) AS prompt_tokens,
+                       SUM(completion_tokens) AS completion_tokens,
+                       SUM(total_tokens) AS total_tokens, SUM(cost_cents) AS cost_cents
+                FROM llm_usage_daily
+                WHERE {where_clause}
+                GROUP BY provider, model
+                ORDER BY cost_cents DESC, total_tokens DESC""",
+            tuple([source_type] + params),
+        )
+        return [self._row_to_rollup(row) for row in rows]
@@ -2,12 +2,16 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
+from typing import Collection, Sequence
 
+from .pagination import Page
 from ..models.tasks import (
     GenerationTask,
     TaskContentLog,
     TaskStatus,
+    TaskSummary,
     TaskType,
+    TaskWorker,
 )
 
 
@@ -44,7 +48,7 @@ class TaskRepository(ABC):
 
     @abstractmethod
     async def get_task_by_id(self, task_id: str) -> GenerationTask | None:
-        """Get a task by ID."""
+        """Get a task by ID (archived tasks included)."""
         ...
 
     @abstractmethod
@@ -58,6 +62,26 @@ class TaskRepository(ABC):
         """Get tasks with optional filtering."""
         ...
 
+    @abstractmethod
+    async def get_task_summaries(
+        self,
+        status: TaskStatus | None = None,
+        task_type: TaskType | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: str | None = None,
+    ) -> Page[TaskSummary]:
+        """Get list-view projections of tasks (no payload or content log).
+
+        Newest first. Pass the returned `next_cursor` to get the following
+        page; cursor paging stays O(page) at any table size, while `offset`
+        is kept for compatibility.
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        ...
+
     @abstractmethod
     async def count_tasks(
         self,
@@ -83,7 +107,41 @@ class TaskRepository(ABC):
 
     @abstractmethod
     async def get_next_pending_task(self) -> GenerationTask | None:
-        """Get oldest pending task that is ready to run (delayed_until <= now)."""
+        """Get the oldest pending task of the highest lane that is ready to run."""
+        ...
+
+    @abstractmethod
+    async def get_next_delayed_until(self) -> datetime | None:
+        """Get the earliest future delayed_until among pending tasks."""
+        ...
+
+    @abstractmethod
+    async def claim_next_pending_task(
+        self,
+        lease_owner: str,
+        lease_seconds: int,
+        exclude_types: Collection[TaskType] = (),
+    ) -> GenerationTask | None:
+        """Atomically claim the best-scored ready pending task.
+
+        Selecting the task, marking it in_progress (with started_at and
+        heartbeat_at) and taking the lease happen in one write, so two
+        workers can never claim the same task.
+
+        Scheduling is fair rather than FIFO: the head of each task type's
+        priority lanes, plus its oldest ready task, are scored by priority
+        lane, plus aging (waiting tasks slowly climb lanes, so low priority
+        work still runs), minus a fair-share penalty per task of the same type or submitter
+        (user_context) already running.
+
+        Args:
+            lease_owner: ID of the claiming worker
+            lease_seconds: Lease duration; renewed by update_task_heartbeat
+            exclude_types: Task types not to claim (e.g. at their concurrency limit)
+
+        Returns:
+            The claimed task in its in_progress state, or None
+        """
         ...
 
     @abstractmethod
@@ -92,8 +150,20 @@ class TaskRepository(ABC):
         task_id: str,
         status: TaskStatus,
         error_message: str | None = None,
-    ) -> None:
-        """Update task status and optionally error message."""
+        lease_owner: str | None = None,
+    ) -> bool:
+        """Update task status and optionally error message.
+
+        Args:
+            task_id: Task to update
+            status: New status
+            error_message: Optional error message
+            lease_owner: If given, only update an in_progress task while
+                         this worker holds its lease (and release the lease)
+
+        Returns:
+            False if the task is gone or (with `lease_owner`) no longer leased
+        """
         ...
 
     @abstractmethod
@@ -108,18 +178,96 @@ class TaskRepository(ABC):
         ...
 
     @abstractmethod
-    async def update_task_heartbeat(self, task_id: str) -> None:
-        """Update task heartbeat timestamp."""
+    async def update_task_heartbeat(
+        self,
+        task_id: str,
+        lease_owner: str | None = None,
+        lease_seconds: int | None = None,
+        progress: tuple[int, int, str | None] | None = None,
+    ) -> bool:
+        """Update task heartbeat timestamp.
+
+        Args:
+            task_id: Task to update
+            lease_owner: If given, only update an in_progress task while this
+                         worker holds the lease, and extend it by `lease_seconds`
+            lease_seconds: Lease extension from now
+            progress: Optional (current, total, message) written in the
+                      same statement as the heartbeat
+
+        Returns:
+            False if the task is gone, no longer in progress or its lease is
+            held by another worker
+        """
+        ...
+
+    @abstractmethod
+    async def complete_task(
+        self,
+        task_id: str,
+        lease_owner: str | None = None,
+        content_logs: Sequence[TaskContentLog] = (),
+    ) -> bool:
+        """Mark a task completed and set completed_at.
+
+        Args:
+            task_id: Task to complete
+            lease_owner: If given, only complete an in_progress task while
+                         this worker holds its lease
+            content_logs: Remaining buffered artifact logs, inserted in the
+                          same transaction so a completed task never lacks them
+
+        Returns:
+            False if the task is gone or (with `lease_owner`) no longer leased
+        """
         ...
 
     @abstractmethod
     async def get_stuck_tasks(self, timeout_seconds: int) -> list[GenerationTask]:
-        """Get tasks with stale heartbeats (in_progress but no recent heartbeat)."""
+        """Get in_progress tasks with stale heartbeats or expired leases."""
         ...
 
     @abstractmethod
-    async def increment_retry_count(self, task_id: str, delay_seconds: int) -> None:
-        """Increment retry count and set delayed_until for retry."""
+    async def increment_retry_count(
+        self,
+        task_id: str,
+        delay_seconds: float,
+        lease_owner: str | None = None,
+    ) -> bool:
+        """Increment retry count and set delayed_until for retry.
+
+        Args:
+            task_id: Task to reschedule
+            delay_seconds: Delay before the task may be claimed again
+            lease_owner: If given, only reschedule an in_progress task while
+                         this worker holds its lease (and release the lease)
+
+        Returns:
+            False if the task is gone or (with `lease_owner`) no longer leased
+        """
+        ...
+
+    @abstractmethod
+    async def reschedule_task(
+        self,
+        task_id: str,
+        delay_seconds: float,
+        lease_owner: str | None = None,
+    ) -> bool:
+        """Put a task back in the queue without counting a retry.
+
+        Sets status pending and delayed_until, clears started_at and the
+        lease; progress and retry_count are left as they are.
+
+        Args:
+            task_id: Task to reschedule
+            delay_seconds: Delay before the task may be claimed again
+            lease_owner: If given, only reschedule an in_progress task while
+                         this worker holds its lease
+
+        Returns:
+            False if the task is gone or (with `lease_owner`) no longer leased
+        """
         ...
 
     # -------------------------------------------------------------------------
@@ -131,12 +279,82 @@ class TaskRepository(ABC):
         """Create a content log entry."""
         ...
 
+    @abstractmethod
+    async def create_content_logs(
+        self,
+        logs: Sequence[TaskContentLog],
+        lease_owner: str | None = None,
+    ) -> bool:
+        """Create many content log entries in one transaction.
+
+        Args:
+            logs: Entries to insert (all of one task)
+            lease_owner: If given, only insert while this worker holds the
+                         lease of the entries' in_progress task
+
+        Returns:
+            False if (with `lease_owner`) the lease is no longer held
+        """
+        ...
+
     @abstractmethod
     async def get_content_log_by_task(self, task_id: str) -> list[TaskContentLog]:
-        """Get all content log entries for a task."""
+        """Get all content log entries for a task (archived tasks included)."""
         ...
 
     @abstractmethod
     async def delete_content_log_by_task(self, task_id: str) -> int:
         """Delete all content log entries for a task. Returns count of deleted entries."""
         ...
+
+    # -------------------------------------------------------------------------
+    # Retention
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def archive_available(self) -> bool:
+        """Check if the archive tables exist (the migrations have been run)."""
+        ...
+
+    @abstractmethod
+    async def archive_finished_tasks(
+        self,
+        finished_before: datetime,
+        limit: int,
+        drop_payloads: bool = False,
+    ) -> int:
+        """Move one batch of old finished tasks into the archive.
+
+        Completed, failed and cancelled tasks that finished before
+        `finished_before` are moved together with their content log in a
+        single short transaction. Archived tasks stay readable through
+        get_task_by_id and get_content_log_by_task.
+
+        Args:
+            finished_before: Only archive tasks finished before this time
+            limit: Maximum number of tasks moved in this batch
+            drop_payloads: Drop task payloads and content log previous_data
+
+        Returns:
+            Number of tasks archived (less than `limit` when done)
+        """
+        ...
+
+    # -------------------------------------------------------------------------
+    # Workers
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def upsert_worker(self, worker: TaskWorker) -> None:
+        """Register a worker or refresh its heartbeat and running task count."""
+        ...
+
+    @abstractmethod
+    async def mark_worker_stopped(self, worker_id: str) -> None:
+        """Record that a worker shut down."""
+        ...
+
+    @abstractmethod
+    async def get_workers(self) -> list[TaskWorker]:
+        """Get all registered workers, most recently started first."""
+        ...
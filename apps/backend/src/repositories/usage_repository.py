@@ -0,0 +1,86 @@
+"""Abstract LLM Usage Repository interface."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Literal, Sequence
+
+from ..models.tasks import LLMUsageLog, LLMUsageRollup
+
+UsageGranularity = Literal["hour", "day"]
+
+
+class UsageRepository(ABC):
+    """Abstract interface for LLM usage data access.
+
+    Raw entries go to llm_usage_log; hourly and daily rollups per
+    provider, model and source_type are maintained alongside, and all
+    reads are served from the rollups.
+
+    Implementations:
+    - SQLiteUsageRepository: For local development and testing
+    """
+
+    # -------------------------------------------------------------------------
+    # Connection Management
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def connect(self) -> None:
+        """Establish connection to data store."""
+        ...
+
+    @abstractmethod
+    async def disconnect(self) -> None:
+        """Close connection to data store."""
+        ...
+
+    # -------------------------------------------------------------------------
+    # Usage Log
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def create_usage_logs(self, logs: Sequence[LLMUsageLog]) -> None:
+        """Insert many usage entries (and update the rollups) in one transaction."""
+        ...
+
+    # -------------------------------------------------------------------------
+    # Rollups
+    # -------------------------------------------------------------------------
+
+    @abstractmethod
+    async def get_usage_rollups(
+        self,
+        granularity: UsageGranularity = "day",
+        since: datetime | None = None,
+        until: datetime | None = None,
+        provider: str | None = None,
+        model: str | None = None,
+        source_type: str | None = None,
+        limit: int = 1000,
+    ) -> list[LLMUsageRollup]:
+        """Get usage per bucket, oldest bucket first.
+
+        Args:
+            granularity: 'hour' or 'day' buckets
+            since: Include the bucket containing this time and later ones
+            until: Include buckets starting before this time
+            provider: Only this provider
+            model: Only this model
+            source_type: Only this source type
+            limit: Maximum number of rows
+        """
+        ...
+
+    @abstractmethod
+    async def get_usage_totals(
+        self,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        source_type: str | None = None,
+    ) -> list[LLMUsageRollup]:
+        """Get usage totals per provider and model over whole days.
+
+        Summed from the daily rollups, most expensive first; `bucket` is
+        None and `source_type` is only set when filtered by it.
+        """
+        ...
@@ -1,13 +1,28 @@
 """Task execution package for background processing."""
 
+from .events import TaskEvent, TaskEventBus, task_events
+from .notifier import TaskNotifier, task_notifier
 from .registry import TaskHandler, TaskHandlerRegistry
+from .retention import TaskRetention
+from .retry import PermanentTaskError, RateLimitError, RetryPolicy
 from .runner import TaskRunner
+from .usage import UsageRecorder
 
 # Import handlers to register them
 from . import handlers  # noqa: F401
 
 __all__ = [
+    "PermanentTaskError",
+    "RateLimitError",
+    "RetryPolicy",
+    "TaskEvent",
+    "TaskEventBus",
     "TaskHandler",
     "TaskHandlerRegistry",
+    "TaskNotifier",
+    "TaskRetention",
     "TaskRunner",
+    "UsageRecorder",
+    "task_events",
+    "task_notifier",
 ]
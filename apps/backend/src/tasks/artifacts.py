@@ -0,0 +1,143 @@
+"""Batched artifact logging for running tasks."""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Sequence
+
+from ..models.tasks import TaskContentLog
+from ..repositories import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_BATCH_SIZE = 100  # logs; flush as soon as this many are buffered
+ARTIFACT_FLUSH_INTERVAL = 2.0  # seconds; max age of a buffered log
+
+
+class ArtifactBuffer:
+    """Buffers task_content_log entries reported through log_artifact.
+
+    Entries are inserted with a single executemany per batch instead of
+    one INSERT and COMMIT each. A batch is written when it reaches
+    `batch_size` entries or `flush_interval` seconds after its first
+    entry, and only while `lease_owner` still holds the task's lease. The
+    last batch is written by the runner in the same transaction that
+    completes the task, so a completed task always has its full log; on
+    failure the runner flushes it before rescheduling.
+
+    Usage:
+        artifacts = ArtifactBuffer(repository, worker_id, on_written=publish)
+        await artifacts.add(log_entry)
+        ...
+        await artifacts.flush(
+            lambda logs: repository.complete_task(task.id, worker_id, logs), force=True
+        )
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        lease_owner: str | None = None,
+        on_written: Callable[[Sequence[TaskContentLog]], None] | None = None,
+        batch_size: int = ARTIFACT_BATCH_SIZE,
+        flush_interval: float = ARTIFACT_FLUSH_INTERVAL,
+    ):
+        """Initialize buffer.
+
+        Args:
+            repository: Task repository for database access
+            lease_owner: Worker holding the task lease (checked on every write)
+            on_written: Called with every batch once it is committed
+            batch_size: Number of buffered entries that triggers a flush
+            flush_interval: Maximum seconds an entry stays buffered
+        """
+        self._repository = repository
+        self._lease_owner = lease_owner
+        self._on_written = on_written
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: list[TaskContentLog] = []
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._written = 0
+        self._batches = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    async def add(self, log: TaskContentLog) -> None:
+        """Buffer a log entry, flushing if the batch is full."""
+        self._pending.append(log)
+        if len(self._pending) >= self._batch_size:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._flush_interval, self._start_timed_flush
+            )
+
+    async def flush(
+        self,
+        write: Callable[[Sequence[TaskContentLog]], Awaitable[bool]] | None = None,
+        force: bool = False,
+    ) -> bool:
+        """Write all buffered entries.
+
+        Args:
+            write: Statement(s) writing the batch in one transaction
+                   (defaults to TaskRepository.create_content_logs)
+            force: Call `write` even if nothing is buffered
+
+        Returns:
+            False if `write` found the lease lost; the batch is dropped
+        """
+        self._cancel_timer()
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch and not force:
+                return True
+            try:
+                if write is None:
+                    written = await self._repository.create_content_logs(
+                        batch, lease_owner=self._lease_owner
+                    )
+                else:
+                    written = await write(batch)
+            except BaseException:
+                # Keep entries (in order) for the next attempt
+                self._pending = batch + self._pending
+                raise
+            if not written:
+                return False
+            if batch:
+                self._written += len(batch)
+                self._batches += 1
+                if self._on_written is not None:
+                    self._on_written(batch)
+            return True
+
+    def discard(self) -> int:
+        """Stop the flush timer and drop buffered entries. Returns how many."""
+        self._cancel_timer()
+        dropped, self._pending = len(self._pending), []
+        return dropped
+
+    def get_stats(self) -> dict:
+        """Get number of entries written and batches used."""
+        return {"written": self._written, "batches": self._batches, "pending": len(self._pending)}
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _start_timed_flush(self) -> None:
+        self._timer = None
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._timed_flush())
+
+    async def _timed_flush(self) -> None:
+        try:
+            if not await self.flush():
+                logger.warning("Dropped artifact log batch: task lease no longer held")
+        except Exception as e:
+            logger.warning(f"Failed to flush {len(self._pending)} artifact log(s): {e}")
@@ -0,0 +1,204 @@
+"""In-process event bus for live task updates."""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"completed", "failed", "cancelled"}
+
+
+@dataclass
+class TaskEvent:
+    """A single task update (status, progress or artifact)."""
+
+    id: int
+    type: str  # 'status', 'progress', 'artifact'
+    task_id: str
+    data: dict[str, Any]
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def is_terminal(self) -> bool:
+        """Check if this event ends the task's lifecycle."""
+        return self.type == "status" and self.data.get("status") in TERMINAL_STATUSES
+
+    def to_sse(self) -> str:
+        """Encode as a Server-Sent Events message."""
+        payload = json.dumps(
+            {"task_id": self.task_id, **self.data, "ts": self.created_at}, default=str
+        )
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class TaskSubscription:
+    """Queue of events for one watcher, optionally filtered to one task.
+
+    The queue is bounded; a slow watcher loses its oldest events rather
+    than slowing down the publisher.
+    """
+
+    def __init__(self, bus: "TaskEventBus", task_id: str | None, max_queue: int):
+        self.task_id = task_id
+        self.dropped = 0
+        self._bus = bus
+        self._queue: asyncio.Queue[TaskEvent] = asyncio.Queue(maxsize=max_queue)
+
+    def _offer(self, event: TaskEvent) -> None:
+        if self.task_id is not None and event.task_id != self.task_id:
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: float | None = None) -> TaskEvent | None:
+        """Wait for the next event; None on timeout."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def open(self) -> None:
+        """Start receiving events."""
+        self._bus._subscriptions.add(self)
+
+    def close(self) -> None:
+        """Stop receiving events."""
+        self._bus._subscriptions.discard(self)
+
+    async def __aenter__(self) -> "TaskSubscription":
+        self.open()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+
+class TaskEventBus:
+    """Fan-out of task events from runners to any number of watchers.
+
+    Runners publish status, progress and artifact events in memory; SSE
+    endpoints subscribe. Watchers cost no database reads: the bus also
+    keeps the latest status/progress per task (LRU) as a snapshot for
+    newly connected watchers. Only reaches watchers in the same process
+    as the runner; without a local runner, single-task streams fall back
+    to polling the database (see stream_events).
+
+    Usage:
+        task_events.publish("progress", task.id, current=3, total=10)
+
+        async with task_events.subscribe(task_id) as subscription:
+            event = await subscription.get(timeout=15)
+    """
+
+    def __init__(self, max_snapshots: int = 1000, max_queue: int = 256):
+        """Initialize event bus.
+
+        Args:
+            max_snapshots: Number of tasks whose latest state is remembered
+            max_queue: Events buffered per watcher before the oldest are dropped
+        """
+        self._max_snapshots = max_snapshots
+        self._max_queue = max_queue
+        self._subscriptions: set[TaskSubscription] = set()
+        self._snapshots: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._ids = itertools.count(1)
+        self._published = 0
+
+    def publish(self, event_type: str, task_id: str, **data: Any) -> TaskEvent:
+        """Publish an event to all matching watchers."""
+        event = TaskEvent(id=next(self._ids), type=event_type, task_id=task_id, data=data)
+        self._published += 1
+        if event_type in ("status", "progress"):
+            snapshot = self._snapshots.setdefault(task_id, {})
+            snapshot.update(data)
+            self._snapshots.move_to_end(task_id)
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+        for subscription in self._subscriptions:
+            subscription._offer(event)
+        return event
+
+    def snapshot(self, task_id: str) -> dict[str, Any] | None:
+        """Get the latest known status/progress of a task, if any."""
+        snapshot = self._snapshots.get(task_id)
+        return dict(snapshot) if snapshot is not None else None
+
+    def subscribe(self, task_id: str | None = None) -> TaskSubscription:
+        """Subscribe to events of one task, or of all tasks if task_id is None.
+
+        The subscription receives events while its `async with` block is
+        active (or between open() and close()).
+        """
+        return TaskSubscription(self, task_id, self._max_queue)
+
+    def get_stats(self) -> dict:
+        """Get bus statistics."""
+        return {
+            "watchers": len(self._subscriptions),
+            "published": self._published,
+            "snapshots": len(self._snapshots),
+            "dropped": sum(s.dropped for s in self._subscriptions),
+        }
+
+
+async def stream_events(
+    subscription: TaskSubscription,
+    initial: list[TaskEvent] | None = None,
+    keepalive_seconds: float = 15.0,
+    is_disconnected=None,
+    poll: Callable[[], Awaitable[list[TaskEvent] | None]] | None = None,
+    poll_seconds: float = 2.0,
+) -> AsyncIterator[str]:
+    """Yield SSE messages for a subscription until a terminal event (single task) or disconnect.
+
+    Args:
+        subscription: Active subscription
+        initial: Events sent first (e.g. the current snapshot)
+        keepalive_seconds: Interval of SSE comment lines keeping proxies from timing out
+        is_disconnected: Optional async callable returning True once the client is gone
+        poll: Optional async callable reading changes from the database, for
+              tasks no local runner publishes events of; returns None once
+              the task is gone, which ends the stream
+        poll_seconds: Idle time after which `poll` is called
+    """
+    single_task = subscription.task_id is not None
+    for event in initial or []:
+        yield event.to_sse()
+        if single_task and event.is_terminal:
+            return
+
+    wait = poll_seconds if poll is not None else keepalive_seconds
+    idle = 0.0
+    while True:
+        event = await subscription.get(timeout=wait)
+        if is_disconnected is not None and await is_disconnected():
+            return
+        events = [event] if event is not None else []
+        if event is None and poll is not None:
+            polled = await poll()
+            if polled is None:
+                return
+            events = polled
+        if not events:
+            idle += wait
+            if idle >= keepalive_seconds:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            continue
+        idle = 0.0
+        for event in events:
+            yield event.to_sse()
+            if single_task and event.is_terminal:
+                return
+
+
+# Process-wide event bus shared by runners and the API
+task_events = TaskEventBus()
@@ -4,8 +4,10 @@ Import this module to register all handlers with the TaskHandlerRegistry.
 """
 
 # Import handlers to trigger registration
+from .revert_handler import RevertHandler
 from .stub_handler import StubHandler
 
 __all__ = [
+    "RevertHandler",
     "StubHandler",
 ]
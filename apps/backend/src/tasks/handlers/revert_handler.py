@@ -0,0 +1,39 @@
+"""Handler reverting the content written by another task."""
+
+import logging
+from typing import Callable, Any
+
+from ..registry import TaskHandler, TaskHandlerRegistry
+from ..retry import PermanentTaskError
+from ..revert import RevertEngine
+from ...models.tasks import GenerationTask
+
+logger = logging.getLogger(__name__)
+
+
+@TaskHandlerRegistry.register("revert_task")
+class RevertHandler(TaskHandler):
+    """Runs a RevertEngine for the task given in the payload.
+
+    Queued by POST /tasks/{task_id}/revert, so large reverts run in the
+    background with progress instead of inside the request.
+
+    Configuration via payload:
+    - target_task_id: Task whose content changes are reverted
+    """
+
+    async def run(
+        self,
+        task: GenerationTask,
+        update_progress: Callable[[int, int, str | None], Any],
+        log_artifact: Callable[[str, str, str, dict | None], Any],
+    ) -> None:
+        """Revert the target task's content log."""
+        target_task_id = task.payload.get("target_task_id")
+        if not target_task_id:
+            raise PermanentTaskError("revert_task payload requires 'target_task_id'")
+        if self.task_repository is None or self.content_repository is None:
+            raise RuntimeError("RevertHandler needs task and content repositories")
+
+        engine = RevertEngine(self.task_repository, self.content_repository)
+        await engine.revert(target_task_id, update_progress)
@@ -0,0 +1,50 @@
+"""In-process wake-up channel between task producers and runners."""
+
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TaskNotifier:
+    """Wakes task runners as soon as work may be available.
+
+    Producers (task creation, retries, rescheduling) call `notify()`;
+    every registered runner gets its wake-up event set and claims
+    immediately instead of waiting for the next poll. Only reaches runners
+    in the same process; other processes rely on their safety-net poll.
+
+    Usage:
+        task_notifier.register(wakeup_event)
+        ...
+        task_notifier.notify()
+    """
+
+    def __init__(self):
+        self._listeners: set[asyncio.Event] = set()
+        self._notifications = 0
+
+    def register(self, event: asyncio.Event) -> None:
+        """Register a runner's wake-up event."""
+        self._listeners.add(event)
+
+    def unregister(self, event: asyncio.Event) -> None:
+        """Remove a runner's wake-up event."""
+        self._listeners.discard(event)
+
+    def notify(self) -> None:
+        """Signal all registered runners that the queue changed."""
+        self._notifications += 1
+        for event in self._listeners:
+            event.set()
+
+    def get_stats(self) -> dict:
+        """Get notifier statistics."""
+        return {
+            "listeners": len(self._listeners),
+            "notifications": self._notifications,
+        }
+
+
+# Process-wide notifier shared by the API and all runners
+task_notifier = TaskNotifier()
@@ -0,0 +1,123 @@
+"""Write coalescing for task progress and heartbeats."""
+
+import asyncio
+import logging
+import time
+
+from ..repositories import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FLUSH_INTERVAL = 1.0  # seconds; max one progress write per task per interval
+
+
+class ProgressCoalescer:
+    """Buffers progress updates of one running task.
+
+    Handlers may report progress per item; instead of one UPDATE and
+    COMMIT per call, only the latest value is kept and written at most
+    once per `min_interval`. A trailing flush makes sure the last value of
+    a burst is written. Heartbeats go through the same writer, so pending
+    progress is persisted together with the heartbeat and lease renewal in
+    one statement. `close()` writes the final state exactly.
+
+    Usage:
+        progress = ProgressCoalescer(repository, task.id, worker_id, lease_seconds)
+        await progress.update(1, 1000, "Item 1")   # buffered
+        await progress.heartbeat()                 # heartbeat + pending progress
+        await progress.close()                     # final flush
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        task_id: str,
+        lease_owner: str | None = None,
+        lease_seconds: int | None = None,
+        min_interval: float = PROGRESS_FLUSH_INTERVAL,
+    ):
+        """Initialize coalescer.
+
+        Args:
+            repository: Task repository for database access
+            task_id: Task whose progress is buffered
+            lease_owner: Worker holding the task lease (renewed on every write)
+            lease_seconds: Lease extension per write
+            min_interval: Minimum seconds between progress writes
+        """
+        self._repository = repository
+        self._task_id = task_id
+        self._lease_owner = lease_owner
+        self._lease_seconds = lease_seconds
+        self._min_interval = min_interval
+        self._pending: tuple[int, int, str | None] | None = None
+        self._last_write = 0.0
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._updates = 0
+        self._writes = 0
+
+    async def update(self, current: int, total: int, message: str | None = None) -> None:
+        """Record progress; written now if the interval elapsed, else later."""
+        self._pending = (current, total, message)
+        self._updates += 1
+        wait = self._last_write + self._min_interval - time.monotonic()
+        if wait <= 0 and not self._lock.locked():
+            await self._write()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                max(wait, 0.0), self._start_trailing_flush
+            )
+
+    async def heartbeat(self) -> bool:
+        """Write a heartbeat together with any pending progress.
+
+        Returns:
+            False if the lease is no longer held by this worker
+        """
+        return await self._write()
+
+    async def close(self) -> None:
+        """Stop trailing flushes and persist the final progress exactly."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._pending is not None:
+            await self._write()
+
+    def get_stats(self) -> dict:
+        """Get number of progress updates received and rows written."""
+        return {"updates": self._updates, "writes": self._writes}
+
+    def _start_trailing_flush(self) -> None:
+        self._timer = None
+        if self._pending is not None and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._trailing_flush())
+
+    async def _trailing_flush(self) -> None:
+        try:
+            await self._write()
+        except Exception as e:
+            logger.warning(f"Failed to flush progress for task {self._task_id}: {e}")
+
+    async def _write(self) -> bool:
+        async with self._lock:
+            progress, self._pending = self._pending, None
+            try:
+                renewed = await self._repository.update_task_heartbeat(
+                    self._task_id,
+                    lease_owner=self._lease_owner,
+                    lease_seconds=self._lease_seconds,
+                    progress=progress,
+                )
+            except BaseException:
+                # Keep the value for the next write unless a newer one arrived
+                if self._pending is None:
+                    self._pending = progress
+                raise
+            self._last_write = time.monotonic()
+            self._writes += 1
+            return renewed
@@ -4,6 +4,9 @@ from abc import ABC, abstractmethod
 from typing import Callable, Any
 
 from ..models.tasks import GenerationTask
+from ..repositories import ContentRepository, TaskRepository
+from .retry import DEFAULT_RETRY_POLICY, RetryPolicy
+from .usage import UsageRecorder
 
 
 class TaskHandler(ABC):
@@ -11,8 +14,29 @@ class TaskHandler(ABC):
 
     Implementations should be registered with TaskHandlerRegistry
     using the @TaskHandlerRegistry.register decorator.
+
+    The TaskRunner sets `task_repository`, `content_repository` and
+    `usage_recorder` on the handler instance before calling run(), so
+    handlers share its connections (and content cache) instead of opening
+    their own. Handlers report every LLM request to `usage_recorder`.
+
+    `content_repository` is scoped to the task: everything written through
+    it is logged to task_content_log in the same transaction, so handlers
+    must not also call log_artifact for it.
     """
 
+    # Names of the CircuitBreakers the handler calls through. While one of
+    # them is open, the runner leaves tasks of this type in the queue.
+    circuit_breakers: tuple[str, ...] = ()
+
+    # Backoff schedule for failed attempts; handlers raise RateLimitError /
+    # PermanentTaskError to pick the rate-limit schedule or fail fast.
+    retry_policy: RetryPolicy = DEFAULT_RETRY_POLICY
+
+    task_repository: TaskRepository | None = None
+    content_repository: ContentRepository | None = None
+    usage_recorder: UsageRecorder | None = None
+
     @abstractmethod
     async def run(
         self,
@@ -25,11 +49,14 @@ class TaskHandler(ABC):
         Args:
             task: The task to execute (with parsed payload)
             update_progress: Callback to update progress (current, total, message)
-            log_artifact: Callback to log created artifacts
+            log_artifact: Callback to log artifacts written outside
+                         `content_repository`
                          (entity_type, entity_id, action, previous_data)
 
         Raises:
-            Exception: On failure (will trigger retry logic)
+            RateLimitError: Provider rate limit (retried on the rate-limit schedule)
+            PermanentTaskError: Failure a retry cannot fix (fails without retries)
+            Exception: On other failures (will trigger retry logic)
         """
         pass
 
@@ -83,6 +110,18 @@ class TaskHandlerRegistry:
             raise ValueError(f"No handler registered for task type: {task_type}")
         return cls._handlers[task_type]()
 
+    @classmethod
+    def get_circuit_breakers(cls, task_type: str) -> tuple[str, ...]:
+        """Get the circuit breaker names a task type depends on."""
+        handler_class = cls._handlers.get(task_type)
+        return handler_class.circuit_breakers if handler_class else ()
+
+    @classmethod
+    def get_retry_policy(cls, task_type: str) -> RetryPolicy:
+        """Get the retry policy of a task type."""
+        handler_class = cls._handlers.get(task_type)
+        return handler_class.retry_policy if handler_class else DEFAULT_RETRY_POLICY
+
     @classmethod
     def is_registered(cls, task_type: str) -> bool:
         """Check if a handler is registered for a task type."""
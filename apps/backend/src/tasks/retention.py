@@ -0,0 +1,84 @@
+"""Retention policy for finished tasks."""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from ..config import settings
+from ..repositories import TaskRepository
+
+logger = logging.getLogger(__name__)
+
+RETENTION_INTERVAL = 3600  # seconds between retention runs
+ARCHIVE_BATCH_PAUSE = 0.1  # seconds between batches, lets other writers in
+
+
+class TaskRetention:
+    """Moves finished tasks older than the retention period to the archive.
+
+    Work is done in batches of `batch_size` tasks, each in its own short
+    write transaction with a pause in between, so the claim loop and
+    heartbeats never wait behind one long archival transaction.
+
+    Usage:
+        retention = TaskRetention(repository, retention_days=30)
+        archived = await retention.run_once()
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        retention_days: int | None = None,
+        batch_size: int | None = None,
+        drop_payloads: bool | None = None,
+    ):
+        """Initialize retention policy.
+
+        Args:
+            repository: Task repository for database access
+            retention_days: Archive tasks finished more than this many days ago;
+                            0 disables archival (defaults to settings)
+            batch_size: Tasks moved per transaction (defaults to settings)
+            drop_payloads: Drop payload / previous_data blobs when archiving
+                           (defaults to settings)
+        """
+        self._repository = repository
+        self._retention_days = (
+            settings.task_retention_days if retention_days is None else retention_days
+        )
+        self._batch_size = max(1, batch_size or settings.task_archive_batch_size)
+        self._drop_payloads = (
+            settings.task_archive_drop_payloads if drop_payloads is None else drop_payloads
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Check if a retention period is configured."""
+        return self._retention_days > 0
+
+    async def run_once(self, stop_event: asyncio.Event | None = None) -> int:
+        """Archive all tasks past the retention period.
+
+        Args:
+            stop_event: Stop between batches once this is set
+
+        Returns:
+            Number of tasks archived
+        """
+        if not self.enabled:
+            return 0
+
+        cutoff = datetime.utcnow() - timedelta(days=self._retention_days)
+        total = 0
+        while stop_event is None or not stop_event.is_set():
+            archived = await self._repository.archive_finished_tasks(
+                cutoff, self._batch_size, drop_payloads=self._drop_payloads
+            )
+            total += archived
+            if archived < self._batch_size:
+                break
+            await asyncio.sleep(ARCHIVE_BATCH_PAUSE)
+
+        if total:
+            logger.info(f"Archived {total} task(s) finished before {cutoff.isoformat()}")
+        return total
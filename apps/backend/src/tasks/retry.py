@@ -0,0 +1,182 @@
+"""Retry scheduling for failed tasks."""
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import Enum
+
+DEFAULT_RETRY_BASE_DELAY = 10.0  # seconds
+DEFAULT_RETRY_MAX_DELAY = 300.0  # seconds (5 minutes)
+DEFAULT_RATE_LIMIT_BASE_DELAY = 30.0  # seconds
+DEFAULT_RATE_LIMIT_MAX_DELAY = 900.0  # seconds (15 minutes)
+RETRY_AFTER_SPREAD = 0.1  # fraction added on top of a Retry-After hint
+
+JITTER_MODES = {"none", "full", "decorrelated"}
+
+# HTTP statuses a retry can fix; other 4xx responses are permanent
+_RETRYABLE_STATUSES = {408, 409, 425}
+
+
+class ErrorClass(str, Enum):
+    """Retry class of a task failure."""
+
+    TRANSIENT = "transient"
+    RATE_LIMIT = "rate_limit"
+    PERMANENT = "permanent"
+
+
+class RateLimitError(Exception):
+    """Raised by handlers when a provider rejects a request as rate limited.
+
+    Attributes:
+        retry_after: Seconds the provider asked to wait, if it said so
+    """
+
+    def __init__(self, message: str = "Rate limited", retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class PermanentTaskError(Exception):
+    """Raised by handlers for failures a retry cannot fix."""
+
+
+def _status_code(error: BaseException) -> int | None:
+    """Get the HTTP status of a provider SDK / HTTP client error."""
+    for source in (error, getattr(error, "response", None)):
+        status = getattr(source, "status_code", None) or getattr(source, "status", None)
+        if isinstance(status, int):
+            return status
+    return None
+
+
+def _parse_retry_after(value: object) -> float | None:
+    """Parse a Retry-After value (seconds or an HTTP date)."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def get_retry_after(error: BaseException) -> float | None:
+    """Get the Retry-After hint carried by an error, in seconds.
+
+    Checks a `retry_after` attribute first (RateLimitError and some SDKs),
+    then the `Retry-After` header of an attached HTTP response.
+    """
+    retry_after = _parse_retry_after(getattr(error, "retry_after", None))
+    if retry_after is not None:
+        return retry_after
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        return None
+    try:
+        return _parse_retry_after(headers.get("retry-after") or headers.get("Retry-After"))
+    except AttributeError:
+        return None
+
+
+def classify_error(error: BaseException) -> ErrorClass:
+    """Decide how a task failure should be retried.
+
+    RateLimitError and HTTP 429 responses are rate limits. Only
+    PermanentTaskError and non-retryable 4xx responses are permanent;
+    everything else (timeouts, 5xx, connection errors, malformed LLM
+    output failing to parse or validate) is transient.
+    """
+    if isinstance(error, RateLimitError):
+        return ErrorClass.RATE_LIMIT
+    if isinstance(error, PermanentTaskError):
+        return ErrorClass.PERMANENT
+
+    status = _status_code(error)
+    if status == 429:
+        return ErrorClass.RATE_LIMIT
+    if status is not None and 400 <= status < 500 and status not in _RETRYABLE_STATUSES:
+        return ErrorClass.PERMANENT
+    return ErrorClass.TRANSIENT
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Backoff schedule for the retries of one task type.
+
+    Transient errors back off exponentially from `base_delay` up to
+    `max_delay`; rate limits use the slower `rate_limit_base_delay` /
+    `rate_limit_max_delay` schedule. Permanent errors are not retried.
+    Jitter spreads the retries of tasks that failed together (e.g. during
+    a provider outage) so they don't all come back in the same second:
+
+    - "full": uniform between 0 and the exponential delay
+    - "decorrelated": uniform between the base delay and three times the
+      previous attempt's delay (capped)
+    - "none": the plain exponential delay
+
+    A Retry-After hint from the provider replaces the schedule; a small
+    random spread is added on top of it for the same reason.
+    """
+
+    base_delay: float = DEFAULT_RETRY_BASE_DELAY
+    max_delay: float = DEFAULT_RETRY_MAX_DELAY
+    rate_limit_base_delay: float = DEFAULT_RATE_LIMIT_BASE_DELAY
+    rate_limit_max_delay: float = DEFAULT_RATE_LIMIT_MAX_DELAY
+    jitter: str = "full"
+
+    def __post_init__(self) -> None:
+        if self.jitter not in JITTER_MODES:
+            raise ValueError(f"Invalid retry jitter mode: {self.jitter}")
+
+    def get_delay(
+        self,
+        retry_count: int,
+        error_class: ErrorClass = ErrorClass.TRANSIENT,
+        retry_after: float | None = None,
+    ) -> float | None:
+        """Calculate the delay before the next attempt.
+
+        Args:
+            retry_count: Retries already made (0 for the first failure)
+            error_class: Class of the failure
+            retry_after: Provider Retry-After hint in seconds, if any
+
+        Returns:
+            Delay in seconds, or None if the task should not be retried
+        """
+        if error_class == ErrorClass.PERMANENT:
+            return None
+
+        if retry_after is not None:
+            return retry_after * (1 + random.uniform(0, RETRY_AFTER_SPREAD))
+
+        if error_class == ErrorClass.RATE_LIMIT:
+            base, cap = self.rate_limit_base_delay, self.rate_limit_max_delay
+        else:
+            base, cap = self.base_delay, self.max_delay
+
+        backoff = min(cap, base * 2 ** max(0, retry_count))
+        if self.jitter == "full":
+            delay = random.uniform(0, backoff)
+        elif self.jitter == "decorrelated":
+            # Stateless: the previous delay is taken as the previous backoff step
+            previous = min(cap, base * 2 ** max(0, retry_count - 1))
+            delay = min(cap, random.uniform(base, max(base, previous * 3)))
+        else:
+            delay = backoff
+        return delay
+
+    def get_delay_for(self, retry_count: int, error: BaseException) -> float | None:
+        """Calculate the delay before retrying after `error` (None = don't retry)."""
+        return self.get_delay(retry_count, classify_error(error), get_retry_after(error))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
@@ -0,0 +1,164 @@
+"""Revert of content written by a task."""
+
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable
+from uuid import NAMESPACE_URL, uuid5
+
+from ..models.tasks import ContentAction, TaskContentLog
+from ..repositories import ContentRepository, TaskRepository
+
+logger = logging.getLogger(__name__)
+
+REVERT_CHUNK_SIZE = 500  # entities per transaction
+
+# Restores run parents first, then deletes run dependents first
+_DELETE_ORDER = ("answer", "variant", "cluster", "subject")
+_RESTORE_ORDER = tuple(reversed(_DELETE_ORDER))
+
+_REVERT_NAMESPACE = uuid5(NAMESPACE_URL, "mindforge:revert_task")
+
+
+def revert_task_id_for(task_id: str) -> str:
+    """Get the (deterministic) ID of the revert task for a task.
+
+    One revert task exists per reverted task, so a second revert request
+    finds the first one instead of queueing a duplicate.
+    """
+    return str(uuid5(_REVERT_NAMESPACE, task_id))
+
+
+def count_by_entity_type(logs: list[TaskContentLog]) -> dict[str, int]:
+    """Count content log entries per (pluralized) entity type."""
+    counts: dict[str, int] = {}
+    for log in logs:
+        entity_plural = f"{log.entity_type}s"  # Simple pluralization
+        counts[entity_plural] = counts.get(entity_plural, 0) + 1
+    return counts
+
+
+class RevertEngine:
+    """Undoes the content changes recorded in a task's content log.
+
+    Entities the task created are deleted; entities it updated or deleted
+    are restored from the `previous_data` of their first log entry. Work
+    is grouped per entity type and applied with set-based statements in
+    chunks of `chunk_size`, each chunk in its own short transaction.
+
+    Restores run first, parents first (subjects -> clusters -> variants ->
+    answers). That moves entities the task re-parented (e.g. existing
+    variants moved into a cluster it created) back to their old parent
+    before anything is deleted, so they and their answers don't go down
+    with the created parent. Deletes then run dependents first (answers ->
+    variants -> clusters). Every step is idempotent, so a revert
+    interrupted midway can simply run again.
+
+    Usage:
+        engine = RevertEngine(task_repository, content_repository)
+        counts = await engine.revert(task_id, update_progress)
+    """
+
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        content_repository: ContentRepository,
+        chunk_size: int = REVERT_CHUNK_SIZE,
+    ):
+        """Initialize revert engine.
+
+        Args:
+            task_repository: Task repository (content log and reverted_at)
+            content_repository: Repository the content is written through
+            chunk_size: Maximum entities per statement batch / transaction
+        """
+        self._tasks = task_repository
+        self._content = content_repository
+        self._chunk_size = max(1, chunk_size)
+
+    @staticmethod
+    def plan(
+        logs: list[TaskContentLog],
+    ) -> tuple[dict[str, list[str]], dict[str, list[dict[str, Any]]]]:
+        """Reduce a content log to the IDs to delete and snapshots to restore.
+
+        Only the first entry per entity matters: it tells whether the
+        entity existed before the task and, if so, what it looked like.
+
+        Returns:
+            (entity IDs to delete, snapshots to restore), both by entity type
+        """
+        deletes: dict[str, list[str]] = {}
+        restores: dict[str, list[dict[str, Any]]] = {}
+        seen: set[tuple[str, str]] = set()
+        for log in sorted(logs, key=lambda entry: entry.created_at):
+            key = (log.entity_type, log.entity_id)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            if log.entity_type not in _DELETE_ORDER:
+                logger.warning(f"Revert skipping unknown entity type: {log.entity_type}")
+            elif log.action == ContentAction.CREATED:
+                deletes.setdefault(log.entity_type, []).append(log.entity_id)
+            elif log.previous_data is not None:
+                restores.setdefault(log.entity_type, []).append(
+                    {**log.previous_data, "id": log.entity_id}
+                )
+            else:
+                logger.warning(
+                    f"Revert cannot restore {log.entity_type} {log.entity_id}: "
+                    f"no previous_data"
+                )
+        return deletes, restores
+
+    async def revert(
+        self,
+        task_id: str,
+        update_progress: Callable[[int, int, str | None], Awaitable[Any]] | None = None,
+    ) -> dict[str, int]:
+        """Revert all content changes of a task and mark it reverted.
+
+        Args:
+            task_id: Task whose content log is reverted
+            update_progress: Optional callback (current, total, message)
+
+        Returns:
+            Number of reverted entities per (pluralized) entity type
+        """
+        logs = await self._tasks.get_content_log_by_task(task_id)
+        deletes, restores = self.plan(logs)
+        total = sum(map(len, deletes.values())) + sum(map(len, restores.values()))
+        done = 0
+        counts: dict[str, int] = {}
+
+        async def report(message: str) -> None:
+            if update_progress is not None:
+                await update_progress(done, total, message)
+
+        for entity_type in _RESTORE_ORDER:
+            rows = restores.get(entity_type, [])
+            for start in range(0, len(rows), self._chunk_size):
+                chunk = rows[start:start + self._chunk_size]
+                await self._content.restore_entities(entity_type, chunk)
+                done += len(chunk)
+                await report(f"Restored {done} of {total} ({entity_type}s)")
+            if rows:
+                counts[f"{entity_type}s"] = counts.get(f"{entity_type}s", 0) + len(rows)
+
+        for entity_type in _DELETE_ORDER:
+            ids = deletes.get(entity_type, [])
+            for start in range(0, len(ids), self._chunk_size):
+                chunk = ids[start:start + self._chunk_size]
+                await self._content.delete_entities(entity_type, chunk)
+                done += len(chunk)
+                await report(f"Deleted {done} of {total} ({entity_type}s)")
+            if ids:
+                counts[f"{entity_type}s"] = counts.get(f"{entity_type}s", 0) + len(ids)
+
+        task = await self._tasks.get_task_by_id(task_id)
+        if task is not None and task.reverted_at is None:
+            task.reverted_at = datetime.utcnow()
+            await self._tasks.update_task(task)
+
+        logger.info(f"Reverted task {task_id}: {counts or 'nothing to revert'}")
+        return counts
@@ -2,85 +2,154 @@
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Callable, Any
-
-from ..repositories import TaskRepository
-from ..models.tasks import GenerationTask, TaskStatus, TaskContentLog, ContentAction
-from ..core.circuit_breaker import CircuitOpenError
+import os
+import socket
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence
+from uuid import uuid4
+
+from ..config import settings
+from ..repositories import ContentCache, ContentRepository, TaskRepository
+from ..models.tasks import (
+    GenerationTask, TaskStatus, TaskType, TaskContentLog, TaskWorker, ContentAction,
+)
+from ..core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from .artifacts import ArtifactBuffer
+from .events import task_events
+from .notifier import task_notifier
+from .progress import ProgressCoalescer
 from .registry import TaskHandlerRegistry
+from .retention import RETENTION_INTERVAL, TaskRetention
+from .retry import ErrorClass, PermanentTaskError, classify_error, get_retry_after
+from .usage import UsageRecorder
 
 logger = logging.getLogger(__name__)
 
 # Configuration
-POLL_INTERVAL = 5  # seconds
+POLL_INTERVAL = 60  # seconds; safety net only, new work wakes the runner via task_notifier
+ERROR_BACKOFF = 5  # seconds to wait after a poll loop error
+MIN_TIMER_DELAY = 0.05  # seconds; lower bound for delayed_until wake-up timers
 HEARTBEAT_INTERVAL = 30  # seconds
 HEARTBEAT_TIMEOUT = 90  # seconds
-DEFAULT_RETRY_BASE_DELAY = 10  # seconds
-DEFAULT_RETRY_MAX_DELAY = 300  # seconds (5 minutes)
-
+LEASE_DURATION = HEARTBEAT_TIMEOUT  # seconds, renewed by every heartbeat
+DRAIN_TIMEOUT = 30  # seconds to let running tasks finish on shutdown
+CIRCUIT_RETRY_DELAY = 60  # seconds; reschedule delay when an open circuit gives no hint
 
-def calculate_retry_delay(retry_count: int) -> int:
-    """Calculate exponential backoff delay for retry.
 
-    Args:
-        retry_count: Current retry count (0-indexed)
+class LeaseLostError(Exception):
+    """Raised when another worker took over the lease of a running task."""
 
-    Returns:
-        Delay in seconds before next retry
-    """
-    delay = DEFAULT_RETRY_BASE_DELAY * (2 ** retry_count)
-    return min(delay, DEFAULT_RETRY_MAX_DELAY)
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        super().__init__(f"Lease on task {task_id} was lost")
 
 
 class TaskRunner:
     """Background task runner that processes tasks from the queue.
 
+    Runs up to `concurrency` tasks at once (handlers are I/O-bound LLM
+    calls), with optional per-type limits. Tasks are claimed atomically,
+    so several runners can share one queue without double execution.
+
     Usage:
-        runner = TaskRunner(repository)
+        runner = TaskRunner(repository, concurrency=4)
         await runner.start()
         # ... application runs ...
         await runner.stop()
     """
 
-    def __init__(self, repository: TaskRepository):
+    def __init__(
+        self,
+        repository: TaskRepository,
+        content_cache: ContentCache | None = None,
+        content_repository: ContentRepository | None = None,
+        usage_recorder: UsageRecorder | None = None,
+        concurrency: int | None = None,
+        type_limits: dict[str, int] | None = None,
+        worker_id: str | None = None,
+        poll_interval: float = POLL_INTERVAL,
+    ):
         """Initialize task runner.
 
         Args:
             repository: Task repository for database access
+            content_cache: Content cache to invalidate for artifacts written by handlers
+            content_repository: Content repository handed to handlers (e.g. revert_task)
+            usage_recorder: LLM usage recorder handed to handlers
+            concurrency: Maximum number of tasks executed at once
+                         (defaults to settings.task_concurrency)
+            type_limits: Maximum concurrent tasks per task type value
+                         (defaults to settings.task_type_concurrency)
+            worker_id: Lease owner ID written to claimed tasks
+                       (defaults to host:pid:random)
+            poll_interval: Maximum time between queue checks when not woken
         """
         self._repository = repository
+        self._worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._content_cache = content_cache
+        self._content_repository = content_repository
+        self._usage_recorder = usage_recorder
+        self._concurrency = max(1, concurrency or settings.task_concurrency)
+        limits = settings.task_type_concurrency if type_limits is None else type_limits
+        self._type_limits = {TaskType(key): value for key, value in limits.items()}
+        self._poll_interval = poll_interval
         self._shutdown_event = asyncio.Event()
-        self._current_task_id: str | None = None
+        self._wakeup_event = asyncio.Event()
+        self._running: dict[str, asyncio.Task] = {}
+        self._running_types: Counter[TaskType] = Counter()
+        self._parked_types: set[TaskType] = set()
+        self._circuit_wait: float | None = None
+        self._started_at = datetime.utcnow()
         self._poll_task: asyncio.Task | None = None
         self._stuck_checker_task: asyncio.Task | None = None
+        self._worker_heartbeat_task: asyncio.Task | None = None
+        self._retention = TaskRetention(repository)
+        self._retention_task: asyncio.Task | None = None
 
     @property
     def is_running(self) -> bool:
         """Check if the runner is currently running."""
         return not self._shutdown_event.is_set()
 
+    @property
+    def worker_id(self) -> str:
+        """Get the lease owner ID of this runner."""
+        return self._worker_id
+
+    @property
+    def running_task_ids(self) -> list[str]:
+        """Get the IDs of all currently executing tasks."""
+        return list(self._running)
+
     @property
     def current_task_id(self) -> str | None:
-        """Get the ID of the currently executing task."""
-        return self._current_task_id
+        """Get the ID of a currently executing task (oldest first)."""
+        return next(iter(self._running), None)
 
     async def start(self) -> None:
         """Start the task runner loop."""
-        logger.info("Task runner starting...")
+        logger.info(f"Task runner starting (concurrency {self._concurrency})...")
         self._shutdown_event.clear()
+        self._started_at = datetime.utcnow()
         await self._repository.connect()
+        task_notifier.register(self._wakeup_event)
 
         # Start background tasks
         self._poll_task = asyncio.create_task(self._poll_loop())
         self._stuck_checker_task = asyncio.create_task(self._stuck_task_checker())
+        self._worker_heartbeat_task = asyncio.create_task(self._worker_heartbeat_loop())
+        if self._retention.enabled:
+            self._retention_task = asyncio.create_task(self._retention_loop())
 
-        logger.info("Task runner started")
+        logger.info(f"Task runner started as worker {self._worker_id}")
 
     async def stop(self) -> None:
         """Stop the task runner gracefully."""
         logger.info("Task runner stopping...")
         self._shutdown_event.set()
+        task_notifier.unregister(self._wakeup_event)
+        self._wakeup_event.set()
 
         # Wait for background tasks to complete
         if self._poll_task:
@@ -90,6 +159,19 @@ class TaskRunner:
                 logger.warning("Poll loop did not stop gracefully, cancelling")
                 self._poll_task.cancel()
 
+        # Drain running tasks; anything cancelled is picked up again by
+        # the stuck task checker once its heartbeat goes stale
+        if self._running:
+            logger.info(f"Waiting for {len(self._running)} running task(s) to finish")
+            _, pending = await asyncio.wait(
+                list(self._running.values()), timeout=DRAIN_TIMEOUT
+            )
+            for execution in pending:
+                execution.cancel()
+            if pending:
+                logger.warning(f"Cancelled {len(pending)} task(s) still running after drain")
+                await asyncio.gather(*pending, return_exceptions=True)
+
         if self._stuck_checker_task:
             try:
                 await asyncio.wait_for(self._stuck_checker_task, timeout=5.0)
@@ -97,36 +179,175 @@ class TaskRunner:
                 logger.warning("Stuck checker did not stop gracefully, cancelling")
                 self._stuck_checker_task.cancel()
 
+        if self._worker_heartbeat_task:
+            try:
+                await asyncio.wait_for(self._worker_heartbeat_task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._worker_heartbeat_task.cancel()
+        if self._retention_task:
+            try:
+                await asyncio.wait_for(self._retention_task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._retention_task.cancel()
+        try:
+            await self._repository.mark_worker_stopped(self._worker_id)
+        except Exception as e:
+            logger.warning(f"Failed to unregister worker {self._worker_id}: {e}")
+
         await self._repository.disconnect()
         logger.info("Task runner stopped")
 
     async def _poll_loop(self) -> None:
-        """Main polling loop that fetches and executes tasks."""
+        """Main polling loop that claims tasks while execution slots are free."""
         while not self._shutdown_event.is_set():
+            # Cleared before claiming, so a slot freed meanwhile is not missed
+            self._wakeup_event.clear()
             try:
-                task = await self._repository.get_next_pending_task()
-
+                if len(self._running) >= self._concurrency:
+                    await self._wait_for_wakeup(None)
+                    continue
+
+                # Types behind an open circuit stay in the queue untouched
+                task = await self._repository.claim_next_pending_task(
+                    lease_owner=self._worker_id,
+                    lease_seconds=LEASE_DURATION,
+                    exclude_types=[*self._saturated_types(), *self._park_blocked_types()],
+                )
                 if task:
-                    await self._execute_task(task)
+                    self._start_execution(task)
                 else:
-                    # No task available - wait before next poll
-                    try:
-                        await asyncio.wait_for(
-                            self._shutdown_event.wait(),
-                            timeout=POLL_INTERVAL
-                        )
-                    except asyncio.TimeoutError:
-                        pass  # Continue polling
+                    # No task available - sleep until notified, a slot is
+                    # freed, the next delayed task is due or the safety poll
+                    await self._wait_for_wakeup(await self._idle_timeout())
 
             except Exception as e:
                 logger.error(f"Poll loop error: {e}", exc_info=True)
-                try:
-                    await asyncio.wait_for(
-                        self._shutdown_event.wait(),
-                        timeout=POLL_INTERVAL
-                    )
-                except asyncio.TimeoutError:
-                    pass
+                await self._wait_for_wakeup(ERROR_BACKOFF)
+
+    async def _wait_for_wakeup(self, timeout: float | None) -> None:
+        """Sleep until a slot is freed, shutdown is requested or timeout expires."""
+        try:
+            await asyncio.wait_for(self._wakeup_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _idle_timeout(self) -> float:
+        """Get the time until the earliest delayed task is due or a parked
+        task type's circuit lets calls through, capped at the poll interval."""
+        timeout = self._poll_interval
+        if self._circuit_wait is not None:
+            timeout = min(max(self._circuit_wait, MIN_TIMER_DELAY), timeout)
+
+        next_at = await self._repository.get_next_delayed_until()
+        if next_at is None:
+            return timeout
+        if next_at.tzinfo is not None:
+            next_at = next_at.astimezone(timezone.utc).replace(tzinfo=None)
+        delay = (next_at - datetime.utcnow()).total_seconds()
+        return min(max(delay, MIN_TIMER_DELAY), timeout)
+
+    def _saturated_types(self) -> list[TaskType]:
+        """Get task types that reached their concurrency limit."""
+        return [
+            task_type for task_type, limit in self._type_limits.items()
+            if self._running_types[task_type] >= limit
+        ]
+
+    def _park_blocked_types(self) -> list[TaskType]:
+        """Get task types with an open circuit breaker and remember when to retry.
+
+        A type is parked until all of its open breakers allow calls again;
+        `_circuit_wait` holds the time until the first parked type returns.
+        """
+        parked: list[TaskType] = []
+        wait: float | None = None
+        for task_type in TaskType:
+            retry_afters = [
+                breaker.retry_after
+                for name in TaskHandlerRegistry.get_circuit_breakers(task_type.value)
+                if (breaker := CircuitBreaker.get(name)) is not None and breaker.retry_after
+            ]
+            if retry_afters:
+                parked.append(task_type)
+                wait = max(retry_afters) if wait is None else min(wait, max(retry_afters))
+
+        if set(parked) != self._parked_types:
+            logger.info(
+                f"Task types parked by open circuits: "
+                f"{', '.join(t.value for t in parked) or 'none'}"
+            )
+            self._parked_types = set(parked)
+        self._circuit_wait = wait
+        return parked
+
+    def _start_execution(self, task: GenerationTask) -> None:
+        """Run a claimed task in the background and track it until done."""
+        self._running[task.id] = asyncio.create_task(self._execute_task(task))
+        self._running_types[task.task_type] += 1
+
+        def on_done(_: asyncio.Task) -> None:
+            self._running.pop(task.id, None)
+            self._running_types[task.task_type] -= 1
+            self._wakeup_event.set()
+
+        self._running[task.id].add_done_callback(on_done)
+
+    async def _worker_heartbeat_loop(self) -> None:
+        """Register this runner in task_workers and keep its row fresh."""
+        while not self._shutdown_event.is_set():
+            try:
+                await self._repository.upsert_worker(TaskWorker(
+                    id=self._worker_id,
+                    hostname=socket.gethostname(),
+                    pid=os.getpid(),
+                    concurrency=self._concurrency,
+                    running_tasks=len(self._running),
+                    started_at=self._started_at,
+                    heartbeat_at=datetime.utcnow(),
+                ))
+            except Exception as e:
+                logger.warning(f"Failed to update worker heartbeat for {self._worker_id}: {e}")
+
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=HEARTBEAT_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _retention_loop(self) -> None:
+        """Periodically move old finished tasks to the archive.
+
+        Checked once at start: without the archive tables (migrations not
+        run yet) the loop is disabled until the next restart instead of
+        failing every interval.
+        """
+        try:
+            available = await self._repository.archive_available()
+        except Exception as e:
+            logger.error(f"Task retention disabled, archive check failed: {e}")
+            return
+        if not available:
+            logger.warning(
+                "Task retention disabled: archive tables are missing. "
+                "Run the migrations and restart to enable it."
+            )
+            return
+
+        while not self._shutdown_event.is_set():
+            try:
+                await self._retention.run_once(self._shutdown_event)
+            except Exception as e:
+                logger.error(f"Task retention error: {e}", exc_info=True)
+
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=RETENTION_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
 
     async def _stuck_task_checker(self) -> None:
         """Periodically check for stuck tasks and reset them."""
@@ -137,17 +358,34 @@ class TaskRunner:
                 for task in stuck_tasks:
                     logger.warning(f"Found stuck task: {task.id}")
 
+                    # Guarded by the lease seen here: if the task was reclaimed
+                    # (or its owner renewed the lease) meanwhile, leave it alone
                     if task.retry_count < task.max_retries:
                         # Reset for retry
-                        delay = calculate_retry_delay(task.retry_count)
-                        await self._repository.increment_retry_count(task.id, delay)
+                        policy = TaskHandlerRegistry.get_retry_policy(task.task_type.value)
+                        delay = policy.get_delay(task.retry_count)
+                        if not await self._repository.increment_retry_count(
+                            task.id, delay, lease_owner=task.lease_owner
+                        ):
+                            continue
+                        task_notifier.notify()
+                        task_events.publish(
+                            "status", task.id, status=TaskStatus.PENDING.value,
+                            retry_count=task.retry_count + 1, retry_in=round(delay, 1),
+                        )
                         logger.info(f"Task {task.id} reset for retry (attempt {task.retry_count + 1})")
                     else:
                         # Mark as failed
-                        await self._repository.update_task_status(
+                        if not await self._repository.update_task_status(
                             task.id,
                             TaskStatus.FAILED,
-                            "Task timed out (no heartbeat)"
+                            "Task timed out (no heartbeat)",
+                            lease_owner=task.lease_owner,
+                        ):
+                            continue
+                        task_events.publish(
+                            "status", task.id, status=TaskStatus.FAILED.value,
+                            error_message="Task timed out (no heartbeat)",
                         )
                         logger.error(f"Task {task.id} marked as failed (max retries exceeded)")
 
@@ -164,41 +402,97 @@ class TaskRunner:
                 pass
 
     async def _execute_task(self, task: GenerationTask) -> None:
-        """Execute a single task with heartbeat and error handling."""
-        self._current_task_id = task.id
+        """Execute a claimed (already in_progress) task with heartbeat and error handling."""
         logger.info(f"Starting task {task.id} ({task.task_type.value})")
+        task_events.publish(
+            "status", task.id, status=TaskStatus.IN_PROGRESS.value,
+            task_type=task.task_type.value, lease_owner=self._worker_id,
+        )
 
-        # Mark as in_progress
-        await self._repository.update_task_status(task.id, TaskStatus.IN_PROGRESS)
-        task.started_at = datetime.utcnow()
-        task.status = TaskStatus.IN_PROGRESS
-        await self._repository.update_task(task)
-
-        # Start heartbeat
+        # Progress and heartbeats share one coalesced writer
+        progress = ProgressCoalescer(
+            self._repository, task.id,
+            lease_owner=self._worker_id, lease_seconds=LEASE_DURATION,
+        )
         heartbeat_stop = asyncio.Event()
+        handler_run: asyncio.Task | None = None
+        lease_lost = False
+
+        def on_lease_lost() -> None:
+            # Stop the handler: another worker owns the task now
+            nonlocal lease_lost
+            lease_lost = True
+            if handler_run is not None:
+                handler_run.cancel()
+
         heartbeat_task = asyncio.create_task(
-            self._heartbeat_loop(task.id, heartbeat_stop)
+            self._heartbeat_loop(task.id, progress, heartbeat_stop, on_lease_lost)
+        )
+        artifacts = ArtifactBuffer(
+            self._repository, lease_owner=self._worker_id, on_written=self._publish_artifacts
         )
 
         try:
             # Check if handler exists
             if not TaskHandlerRegistry.is_registered(task.task_type.value):
-                raise ValueError(f"No handler registered for task type: {task.task_type.value}")
+                raise PermanentTaskError(f"No handler registered for task type: {task.task_type.value}")
 
-            # Get handler and execute
+            # Get handler and execute; final progress is persisted before
+            # the status changes
             handler = TaskHandlerRegistry.get_handler(task.task_type.value)
-            await handler.run(
+            handler.task_repository = self._repository
+            # Content written through it is logged in the same transaction
+            handler.content_repository = None
+            if self._content_repository is not None:
+                handler.content_repository = self._content_repository.for_task(
+                    task.id, on_logged=self._publish_artifacts
+                )
+            handler.usage_recorder = self._usage_recorder
+            handler_run = asyncio.create_task(handler.run(
                 task=task,
-                update_progress=self._make_progress_callback(task.id),
-                log_artifact=self._make_artifact_callback(task.id),
-            )
-
-            # Success
+                update_progress=self._make_progress_callback(task.id, progress),
+                log_artifact=self._make_artifact_callback(task.id, artifacts),
+            ))
+            if lease_lost:
+                handler_run.cancel()
+            try:
+                await handler_run
+            except asyncio.CancelledError:
+                current = asyncio.current_task()
+                if lease_lost and not (current and current.cancelling()):
+                    raise LeaseLostError(task.id)
+                # Content written so far must stay revertable
+                await self._flush_artifacts(task.id, artifacts)
+                raise
+            except Exception:
+                await self._flush_artifacts(task.id, artifacts)
+                raise
+            finally:
+                await self._stop_heartbeat(heartbeat_task, heartbeat_stop)
+                try:
+                    await progress.close()
+                except Exception as e:
+                    # Must not replace the handler's own exception
+                    logger.warning(f"Failed to write final progress of task {task.id}: {e}")
+
+            # Remaining artifact logs go in with the status change
+            if not await artifacts.flush(
+                lambda logs: self._repository.complete_task(
+                    task.id, lease_owner=self._worker_id, content_logs=logs
+                ),
+                force=True,
+            ):
+                raise LeaseLostError(task.id)
             logger.info(f"Task {task.id} completed successfully")
-            await self._repository.update_task_status(task.id, TaskStatus.COMPLETED)
-            task.completed_at = datetime.utcnow()
-            task.status = TaskStatus.COMPLETED
-            await self._repository.update_task(task)
+            task_events.publish("status", task.id, status=TaskStatus.COMPLETED.value)
+
+        except LeaseLostError:
+            # The new lease holder (or whoever cancelled the task) decides its
+            # status; this worker must not complete, fail or reschedule it
+            logger.warning(
+                f"Task {task.id} is no longer leased by {self._worker_id}, "
+                f"dropping its result"
+            )
 
         except CircuitOpenError as e:
             # Circuit breaker is open - reschedule task without counting as failure
@@ -206,30 +500,69 @@ class TaskRunner:
                 f"Task {task.id} blocked by circuit breaker '{e.name}', "
                 f"rescheduling"
             )
-            delay = int(e.retry_after or 60)
-            # Reset status to pending with delay, don't increment retry count
-            task.status = TaskStatus.PENDING
-            task.delayed_until = datetime.utcnow() + timedelta(seconds=delay)
-            task.started_at = None
-            await self._repository.update_task(task)
+            # Jittered, so tasks blocked by the same circuit don't all return together
+            policy = TaskHandlerRegistry.get_retry_policy(task.task_type.value)
+            delay = policy.get_delay(0, ErrorClass.TRANSIENT, e.retry_after or CIRCUIT_RETRY_DELAY)
+            # Back to pending with delay, don't increment retry count
+            if not await self._repository.reschedule_task(
+                task.id, delay, lease_owner=self._worker_id
+            ):
+                logger.warning(f"Task {task.id} is no longer leased by {self._worker_id}, not rescheduling")
+                return
+            task_notifier.notify()
+            task_events.publish(
+                "status", task.id, status=TaskStatus.PENDING.value,
+                retry_in=round(delay, 1), circuit=e.name,
+            )
 
         except Exception as e:
             logger.error(f"Task {task.id} failed: {e}", exc_info=True)
-            await self._handle_failure(task, str(e))
+            await self._flush_artifacts(task.id, artifacts)
+            await self._handle_failure(task, e)
 
         finally:
-            heartbeat_stop.set()
-            try:
-                await asyncio.wait_for(heartbeat_task, timeout=5.0)
-            except asyncio.TimeoutError:
-                heartbeat_task.cancel()
-            self._current_task_id = None
+            await self._stop_heartbeat(heartbeat_task, heartbeat_stop)
+            dropped = artifacts.discard()
+            if dropped:
+                logger.warning(f"Dropped {dropped} unwritten artifact log(s) of task {task.id}")
+
+    async def _flush_artifacts(self, task_id: str, artifacts: ArtifactBuffer) -> None:
+        """Write buffered artifact logs, logging instead of raising on errors."""
+        if not len(artifacts):
+            return
+        try:
+            if not await artifacts.flush():
+                logger.warning(f"Task {task_id} is no longer leased by {self._worker_id}, dropped its artifact logs")
+        except Exception as e:
+            logger.error(f"Failed to write {len(artifacts)} artifact log(s) for task {task_id}: {e}")
 
-    async def _heartbeat_loop(self, task_id: str, stop_event: asyncio.Event) -> None:
-        """Send periodic heartbeats while task is running."""
+    async def _stop_heartbeat(self, heartbeat_task: asyncio.Task, stop_event: asyncio.Event) -> None:
+        """Stop a task's heartbeat loop (idempotent)."""
+        stop_event.set()
+        try:
+            await asyncio.wait_for(heartbeat_task, timeout=5.0)
+        except asyncio.TimeoutError:
+            heartbeat_task.cancel()
+
+    async def _heartbeat_loop(
+        self,
+        task_id: str,
+        progress: ProgressCoalescer,
+        stop_event: asyncio.Event,
+        on_lease_lost: Callable[[], None],
+    ) -> None:
+        """Send periodic heartbeats (with pending progress) while task is running.
+
+        Calls `on_lease_lost` and stops once a heartbeat finds the lease
+        taken over by another worker (or the task no longer in progress).
+        """
         while not stop_event.is_set():
             try:
-                await self._repository.update_task_heartbeat(task_id)
+                renewed = await progress.heartbeat()
+                if not renewed:
+                    logger.warning(f"Lease on task {task_id} is no longer held by {self._worker_id}")
+                    on_lease_lost()
+                    return
             except Exception as e:
                 logger.warning(f"Failed to update heartbeat for task {task_id}: {e}")
 
@@ -238,41 +571,74 @@ class TaskRunner:
             except asyncio.TimeoutError:
                 pass
 
-    async def _handle_failure(self, task: GenerationTask, error_message: str) -> None:
-        """Handle task failure with retry logic."""
+    async def _handle_failure(self, task: GenerationTask, error: Exception) -> None:
+        """Handle task failure with retry logic.
+
+        The task type's RetryPolicy picks the (jittered) delay from the
+        error class: rate limits back off on their own schedule and honor
+        Retry-After hints, permanent errors fail without further retries.
+        """
+        error_message = str(error)
+        error_class = classify_error(error)
         task.retry_count += 1
 
+        delay = None
         if task.retry_count < task.max_retries:
-            # Schedule for retry with exponential backoff
-            delay = calculate_retry_delay(task.retry_count - 1)
-            await self._repository.increment_retry_count(task.id, delay)
+            policy = TaskHandlerRegistry.get_retry_policy(task.task_type.value)
+            delay = policy.get_delay(task.retry_count - 1, error_class, get_retry_after(error))
+
+        if delay is not None:
+            # Schedule for retry (one UPDATE: retry_count, status, delayed_until)
+            if not await self._repository.increment_retry_count(
+                task.id, delay, lease_owner=self._worker_id
+            ):
+                logger.warning(f"Task {task.id} is no longer leased by {self._worker_id}, not retrying")
+                return
+            task_notifier.notify()
+            task_events.publish(
+                "status", task.id, status=TaskStatus.PENDING.value,
+                retry_count=task.retry_count, retry_in=round(delay, 1),
+                error_message=error_message, error_class=error_class.value,
+            )
             logger.info(
-                f"Task {task.id} scheduled for retry in {delay}s "
-                f"(attempt {task.retry_count}/{task.max_retries})"
+                f"Task {task.id} scheduled for retry in {delay:.1f}s after "
+                f"{error_class.value} error (attempt {task.retry_count}/{task.max_retries})"
             )
         else:
-            # Max retries exceeded - mark as failed
-            await self._repository.update_task_status(
+            # Permanent error or max retries exceeded - mark as failed
+            if not await self._repository.update_task_status(
                 task.id,
                 TaskStatus.FAILED,
-                error_message
+                error_message,
+                lease_owner=self._worker_id,
+            ):
+                logger.warning(f"Task {task.id} is no longer leased by {self._worker_id}, not failing it")
+                return
+            task_events.publish(
+                "status", task.id, status=TaskStatus.FAILED.value, error_message=error_message,
             )
             logger.error(f"Task {task.id} failed permanently: {error_message}")
 
     def _make_progress_callback(
-        self, task_id: str
+        self, task_id: str, progress: ProgressCoalescer
     ) -> Callable[[int, int, str | None], Any]:
-        """Create a progress update callback for a task."""
+        """Create a (coalescing) progress update callback for a task."""
         async def update_progress(current: int, total: int, message: str | None = None):
-            await self._repository.update_task_progress(task_id, current, total, message)
+            await progress.update(current, total, message)
+            task_events.publish("progress", task_id, current=current, total=total, message=message)
             logger.debug(f"Task {task_id} progress: {current}/{total} - {message}")
 
         return update_progress
 
     def _make_artifact_callback(
-        self, task_id: str
+        self, task_id: str, artifacts: ArtifactBuffer
     ) -> Callable[[str, str, str, dict | None], Any]:
-        """Create an artifact logging callback for a task."""
+        """Create a (batching) artifact logging callback for a task.
+
+        Only needed for content written outside `handler.content_repository`;
+        writes through it are logged by the repository itself. Events are
+        published once a batch is committed.
+        """
         async def log_artifact(
             entity_type: str,
             entity_id: str,
@@ -286,7 +652,17 @@ class TaskRunner:
                 action=ContentAction(action),
                 previous_data=previous_data,
             )
-            await self._repository.create_content_log(log_entry)
-            logger.debug(f"Task {task_id} artifact: {action} {entity_type} {entity_id}")
+            await artifacts.add(log_entry)
+            if self._content_cache is not None:
+                self._content_cache.invalidate_entity(entity_type, entity_id)
 
         return log_artifact
+
+    def _publish_artifacts(self, logs: Sequence[TaskContentLog]) -> None:
+        """Publish artifact events for committed content log entries."""
+        for log in logs:
+            task_events.publish(
+                "artifact", log.task_id,
+                entity_type=log.entity_type, entity_id=log.entity_id, action=log.action.value,
+            )
+            logger.debug(f"Task {log.task_id} artifact: {log.action.value} {log.entity_type} {log.entity_id}")
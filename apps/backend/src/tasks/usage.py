@@ -0,0 +1,155 @@
+"""Buffered recording of LLM usage."""
+
+import asyncio
+import logging
+
+from ..models.tasks import LLMUsageLog
+from ..repositories import UsageRepository
+
+logger = logging.getLogger(__name__)
+
+USAGE_BATCH_SIZE = 200  # entries; flush as soon as this many are buffered
+USAGE_FLUSH_INTERVAL = 5.0  # seconds; max age of a buffered entry
+USAGE_MAX_PENDING = 10000  # entries kept while the database is unavailable
+
+
+class UsageRecorder:
+    """Collects LLM usage entries and bulk-inserts them in the background.
+
+    `record()` only appends to an in-memory buffer, so handlers never wait
+    on the database per LLM call. The buffer is written with one
+    executemany per batch when it reaches `batch_size` entries or
+    `flush_interval` seconds after its first entry; `close()` writes the
+    rest on shutdown. If writes keep failing, the oldest entries beyond
+    `max_pending` are dropped rather than growing without bound.
+
+    Usage:
+        recorder = UsageRecorder(usage_repository)
+        recorder.record("openai", "gpt-4o", 812, 230, cost_cents=1,
+                        source_type="task", source_id=task.id)
+        ...
+        await recorder.close()
+    """
+
+    def __init__(
+        self,
+        repository: UsageRepository,
+        batch_size: int = USAGE_BATCH_SIZE,
+        flush_interval: float = USAGE_FLUSH_INTERVAL,
+        max_pending: int = USAGE_MAX_PENDING,
+    ):
+        """Initialize recorder.
+
+        Args:
+            repository: Usage repository for database access
+            batch_size: Number of buffered entries that triggers a flush
+            flush_interval: Maximum seconds an entry stays buffered
+            max_pending: Maximum buffered entries (oldest dropped beyond)
+        """
+        self._repository = repository
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending: list[LLMUsageLog] = []
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._written = 0
+        self._batches = 0
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cost_cents: int | None = None,
+        source_type: str | None = None,
+        source_id: str | None = None,
+    ) -> None:
+        """Buffer the usage of one LLM request (never blocks)."""
+        self.add(LLMUsageLog(
+            provider=provider,
+            model=model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+            cost_cents=cost_cents,
+            source_type=source_type,
+            source_id=source_id,
+        ))
+
+    def add(self, log: LLMUsageLog) -> None:
+        """Buffer a usage entry, scheduling a flush."""
+        self._pending.append(log)
+        overflow = len(self._pending) - self._max_pending
+        if overflow > 0:
+            del self._pending[:overflow]
+            self._dropped += overflow
+            logger.warning(f"LLM usage buffer full, dropped {overflow} entries")
+
+        if len(self._pending) >= self._batch_size:
+            self._start_flush()
+        # Also covers a full batch arriving while a flush is in progress
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._flush_interval, self._start_flush
+            )
+
+    async def flush(self) -> None:
+        """Write all buffered entries."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                await self._repository.create_usage_logs(batch)
+            except BaseException:
+                # Keep entries (in order) for the next attempt
+                self._pending = batch + self._pending
+                raise
+            self._written += len(batch)
+            self._batches += 1
+
+    async def close(self) -> None:
+        """Write remaining entries (called on shutdown)."""
+        if self._flush_task is not None and not self._flush_task.done():
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"Failed to write {len(self._pending)} LLM usage entries: {e}")
+
+    def get_stats(self) -> dict:
+        """Get number of entries written, batches used and entries dropped."""
+        return {
+            "written": self._written,
+            "batches": self._batches,
+            "pending": len(self._pending),
+            "dropped": self._dropped,
+        }
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._background_flush())
+
+    async def _background_flush(self) -> None:
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Failed to flush {len(self._pending)} LLM usage entries: {e}")
+            # Retry later instead of on the next record() only
+            if self._pending and self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(
+                    self._flush_interval, self._start_flush
+                )
@@ -0,0 +1,106 @@
+"""Standalone task worker process.
+
+Runs a TaskRunner against the configured database outside the API
+process, so generation work does not compete with request handling and
+can be scaled across processes and machines. Tasks are claimed with a
+lease, so any number of workers (and the in-API runner, unless disabled
+with TASK_RUNNER_ENABLED=false) can share one queue.
+
+Usage:
+    python -m src.tasks.worker --concurrency 8
+    python -m src.tasks.worker --worker-id gpu-box-1 --poll-interval 2
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from ..config import settings
+from ..db import SQLiteConnectionPool, database_path_from_url
+from ..repositories import SQLiteContentRepository, SQLiteTaskRepository, SQLiteUsageRepository
+from .runner import TaskRunner
+from .usage import UsageRecorder
+
+logger = logging.getLogger(__name__)
+
+# Without the in-process notifier, this is the enqueue-to-start latency
+DEFAULT_WORKER_POLL_INTERVAL = 5.0  # seconds
+
+
+async def run_worker(
+    concurrency: int | None = None,
+    worker_id: str | None = None,
+    poll_interval: float = DEFAULT_WORKER_POLL_INTERVAL,
+) -> None:
+    """Run a task worker until SIGINT/SIGTERM.
+
+    Args:
+        concurrency: Maximum concurrent tasks (defaults to settings.task_concurrency)
+        worker_id: Worker identity used as lease owner (defaults to host:pid:random)
+        poll_interval: Seconds between queue checks while idle
+    """
+    pool = SQLiteConnectionPool(
+        database_path_from_url(settings.database_url), readers=settings.db_pool_readers
+    )
+    await pool.open()
+    await pool.verify_profile()
+
+    usage_recorder = UsageRecorder(SQLiteUsageRepository(pool.database_path, pool=pool))
+    runner = TaskRunner(
+        SQLiteTaskRepository(pool.database_path, pool=pool),
+        # No content cache here: the API processes notice this worker's
+        # writes through the content_versions counters
+        content_repository=SQLiteContentRepository(pool.database_path, pool=pool),
+        usage_recorder=usage_recorder,
+        concurrency=concurrency,
+        worker_id=worker_id,
+        poll_interval=poll_interval,
+    )
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl+C cancels the main task instead
+
+    await runner.start()
+    try:
+        await stop_event.wait()
+    finally:
+        await runner.stop()
+        await usage_recorder.close()
+        await pool.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="MindForge task worker")
+    parser.add_argument(
+        "--concurrency", type=int, default=None,
+        help=f"Maximum concurrent tasks (default: {settings.task_concurrency})",
+    )
+    parser.add_argument(
+        "--worker-id", default=None,
+        help="Worker identity shown in task rows and /health/workers",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=DEFAULT_WORKER_POLL_INTERVAL,
+        help="Seconds between queue checks while idle",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if settings.debug else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    try:
+        asyncio.run(run_worker(args.concurrency, args.worker_id, args.poll_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Shared fixtures: repositories on a migrated SQLite database in a temp directory."""
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from src.db.migrations import MigrationRunner
+from src.db.pool import SQLiteConnectionPool
+from src.db.sqlite_adapter import SQLiteAdapter
+from src.main import app
+from src.repositories import (
+    ContentCache,
+    SQLiteContentRepository,
+    SQLiteTaskRepository,
+    SQLiteUsageRepository,
+)
+
+
+@pytest_asyncio.fixture
+async def pool(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "test.db"), readers=2)
+    await pool.open()
+    await MigrationRunner(SQLiteAdapter(pool.database_path, pool=pool)).run_pending()
+    yield pool
+    await pool.close()
+
+
+@pytest.fixture
+def content_repository(pool) -> SQLiteContentRepository:
+    return SQLiteContentRepository(pool.database_path, pool=pool)
+
+
+@pytest.fixture
+def task_repository(pool) -> SQLiteTaskRepository:
+    return SQLiteTaskRepository(pool.database_path, pool=pool)
+
+
+@pytest.fixture
+def usage_repository(pool) -> SQLiteUsageRepository:
+    return SQLiteUsageRepository(pool.database_path, pool=pool)
+
+
+@pytest_asyncio.fixture
+async def client(pool):
+    """API client on the test database, as with standalone workers (no task runner)."""
+    app.state.db_pool = pool
+    app.state.content_cache = ContentCache.from_settings()
+    app.state.task_runner = None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
@@ -0,0 +1,67 @@
+"""Tests for reading and guarding tasks moved to the archive."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.tasks import ContentAction, GenerationTask, TaskContentLog, TaskStatus, TaskType
+
+pytestmark = pytest.mark.asyncio
+
+
+async def archived_task(repo, status: TaskStatus = TaskStatus.COMPLETED) -> GenerationTask:
+    finished = datetime.utcnow() - timedelta(days=40)
+    task = await repo.create_task(GenerationTask(
+        task_type=TaskType.GENERATE_VARIANTS,
+        payload={"count": 3},
+        status=status,
+        created_at=finished - timedelta(minutes=5),
+        completed_at=finished,
+    ))
+    await repo.create_content_log(TaskContentLog(
+        task_id=task.id,
+        entity_type="variant",
+        entity_id="variant-1",
+        action=ContentAction.UPDATED,
+        previous_data={"question_text": "Q"},
+    ))
+    assert await repo.archive_finished_tasks(datetime.utcnow() - timedelta(days=30), 100) == 1
+    return task
+
+
+async def test_archived_tasks_stay_readable(task_repository):
+    task = await archived_task(task_repository)
+
+    stored = await task_repository.get_task_by_id(task.id)
+    assert stored.archived_at is not None
+    assert stored.payload == {"count": 3}
+    [log] = await task_repository.get_content_log_by_task(task.id)
+    assert log.previous_data == {"question_text": "Q"}
+    assert await task_repository.get_tasks() == []
+
+
+async def test_recent_and_running_tasks_are_not_archived(task_repository):
+    await task_repository.create_task(GenerationTask(
+        task_type=TaskType.GENERATE_VARIANTS, payload={}, status=TaskStatus.COMPLETED,
+        completed_at=datetime.utcnow(),
+    ))
+    await task_repository.create_task(GenerationTask(
+        task_type=TaskType.GENERATE_VARIANTS, payload={}, status=TaskStatus.IN_PROGRESS,
+        created_at=datetime.utcnow() - timedelta(days=40),
+    ))
+    assert await task_repository.archive_finished_tasks(datetime.utcnow() - timedelta(days=30), 100) == 0
+
+
+async def test_api_reads_archived_tasks_but_rejects_changes(client, task_repository):
+    completed = await archived_task(task_repository)
+    failed = await archived_task(task_repository, TaskStatus.FAILED)
+
+    response = await client.get(f"/tasks/{completed.id}")
+    assert response.status_code == 200
+    assert response.json()["archived_at"] is not None
+    assert len(response.json()["content_log"]) == 1
+
+    for path in (f"/tasks/{completed.id}/accept", f"/tasks/{completed.id}/revert", f"/tasks/{failed.id}/retry"):
+        response = await client.post(path)
+        assert response.status_code == 400, path
+        assert response.json()["detail"] == "Task is archived and read-only"
@@ -0,0 +1,66 @@
+"""Tests for batching the artifact logs of a running task."""
+
+import pytest
+
+from src.models.tasks import ContentAction, GenerationTask, TaskContentLog, TaskStatus, TaskType
+from src.tasks.artifacts import ArtifactBuffer
+
+pytestmark = pytest.mark.asyncio
+
+
+def log(task_id: str, i: int) -> TaskContentLog:
+    return TaskContentLog(
+        task_id=task_id,
+        entity_type="variant",
+        entity_id=f"variant-{i}",
+        action=ContentAction.CREATED,
+    )
+
+
+async def running_task(repo) -> GenerationTask:
+    await repo.create_task(GenerationTask(task_type=TaskType.GENERATE_VARIANTS, payload={}))
+    return await repo.claim_next_pending_task("worker-1", 60)
+
+
+async def test_full_batches_are_written_together(task_repository):
+    task = await running_task(task_repository)
+    written = []
+    artifacts = ArtifactBuffer(
+        task_repository, lease_owner="worker-1", on_written=written.append, batch_size=3
+    )
+    for i in range(4):
+        await artifacts.add(log(task.id, i))
+
+    assert [len(batch) for batch in written] == [3]
+    assert len(artifacts) == 1
+    assert len(await task_repository.get_content_log_by_task(task.id)) == 3
+    artifacts.discard()
+
+
+async def test_last_batch_is_written_with_completion(task_repository):
+    task = await running_task(task_repository)
+    artifacts = ArtifactBuffer(task_repository, lease_owner="worker-1")
+    await artifacts.add(log(task.id, 0))
+
+    assert await artifacts.flush(
+        lambda logs: task_repository.complete_task(task.id, "worker-1", content_logs=logs),
+        force=True,
+    )
+    assert (await task_repository.get_task_by_id(task.id)).status == TaskStatus.COMPLETED
+    assert len(await task_repository.get_content_log_by_task(task.id)) == 1
+
+
+async def test_nothing_is_written_without_the_lease(task_repository):
+    task = await running_task(task_repository)
+    written = []
+    artifacts = ArtifactBuffer(task_repository, lease_owner="worker-2", on_written=written.append)
+    await artifacts.add(log(task.id, 0))
+
+    assert not await artifacts.flush()
+    assert not await artifacts.flush(
+        lambda logs: task_repository.complete_task(task.id, "worker-2", content_logs=logs),
+        force=True,
+    )
+    assert written == []
+    assert await task_repository.get_content_log_by_task(task.id) == []
+    assert (await task_repository.get_task_by_id(task.id)).status == TaskStatus.IN_PROGRESS
@@ -0,0 +1,279 @@
+"""Tests for the circuit breaker state machine."""
+
+import asyncio
+
+import pytest
+
+from src.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    CircuitState,
+    SlidingWindow,
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+class Clock:
+    """Stand-in for the time module as used by the circuit breaker."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr("src.core.circuit_breaker.time", clock)
+    return clock
+
+
+def breaker(**config) -> CircuitBreaker:
+    settings = {
+        "name": "test",
+        "failure_threshold": 5,
+        "minimum_calls": 10,
+        "failure_rate_threshold": 0.5,
+        "window_seconds": 60,
+        "window_buckets": 6,
+        "timeout_seconds": 30,
+    }
+    settings.update(config)
+    return CircuitBreaker(CircuitBreakerConfig(**settings))
+
+
+async def succeed() -> str:
+    return "ok"
+
+
+async def fail() -> None:
+    raise RuntimeError("down")
+
+
+async def calls(cb: CircuitBreaker, successes: int = 0, failures: int = 0) -> None:
+    for _ in range(successes):
+        await cb.call(succeed)
+    for _ in range(failures):
+        with pytest.raises(RuntimeError):
+            await cb.call(fail)
+
+
+# -----------------------------------------------------------------------------
+# SlidingWindow
+# -----------------------------------------------------------------------------
+
+async def test_window_counts_recent_buckets_only():
+    window = SlidingWindow(window_seconds=60, buckets=6)
+    window.record(failed=True, slow=False, now=0)
+    window.record(failed=False, slow=True, now=15)
+    window.record(failed=False, slow=False, now=59)
+    assert window.totals(now=59) == (3, 1, 1)
+
+    # The first bucket [0, 10) leaves the window once [60, 70) starts
+    assert window.totals(now=60) == (2, 0, 1)
+    assert window.totals(now=200) == (0, 0, 0)
+
+
+async def test_window_reuses_bucket_slots():
+    window = SlidingWindow(window_seconds=60, buckets=6)
+    window.record(failed=True, slow=False, now=5)
+    window.record(failed=False, slow=False, now=65)  # same slot, next round
+    assert window.totals(now=65) == (1, 0, 0)
+
+    window.clear()
+    assert window.totals(now=65) == (0, 0, 0)
+
+
+# -----------------------------------------------------------------------------
+# Opening on the failure rate
+# -----------------------------------------------------------------------------
+
+async def test_needs_minimum_calls_before_opening(clock):
+    cb = breaker()
+    await calls(cb, failures=9)
+    assert cb.state == CircuitState.CLOSED
+
+    with pytest.raises(RuntimeError):
+        await cb.call(fail)
+    assert cb.state == CircuitState.OPEN
+
+
+async def test_opens_on_failure_rate_not_consecutive_failures(clock):
+    cb = breaker()
+    await calls(cb, successes=6, failures=4)
+    assert cb.state == CircuitState.CLOSED  # 4 < failure_threshold
+
+    await calls(cb, successes=4)
+    await calls(cb, failures=3)
+    # 7 of 17 failed: enough failures, but below the 50% rate
+    assert cb.state == CircuitState.CLOSED
+
+    await calls(cb, failures=3)
+    # 10 of 20
+    assert cb.state == CircuitState.OPEN
+    status = cb.get_status()
+    assert status["window"]["calls"] == 20
+    assert status["window"]["failure_rate"] == 0.5
+
+
+async def test_old_failures_leave_the_window(clock):
+    cb = breaker()
+    await calls(cb, successes=1, failures=8)
+    clock.now += 70
+    await calls(cb, failures=2)
+    assert cb.state == CircuitState.CLOSED
+    assert cb.get_status()["window"]["calls"] == 2
+
+
+async def test_slow_calls_count_as_failures(clock):
+    cb = breaker(slow_call_seconds=2.0, minimum_calls=4, failure_threshold=2)
+    for duration in (0.1, 5.0, 0.2, 3.0):
+        await cb.record_success(duration)
+    assert cb.state == CircuitState.OPEN
+    assert cb.get_status()["window"]["slow_calls"] == 2
+
+
+async def test_excluded_exceptions_are_not_recorded(clock):
+    cb = breaker(excluded_exceptions=(KeyError,), minimum_calls=1, failure_threshold=1)
+
+    async def lookup():
+        raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        await cb.call(lookup)
+    assert cb.state == CircuitState.CLOSED
+    assert cb.get_status()["window"]["calls"] == 0
+
+
+async def test_open_circuit_fails_fast_until_timeout(clock):
+    cb = breaker(minimum_calls=1, failure_threshold=1)
+    await calls(cb, failures=1)
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as excinfo:
+        await cb.call(succeed)
+    assert excinfo.value.retry_after == pytest.approx(20)
+    assert cb.retry_after == pytest.approx(20)
+
+
+async def test_invalid_config():
+    with pytest.raises(ValueError):
+        CircuitBreakerConfig(name="bad", failure_rate_threshold=0)
+    with pytest.raises(ValueError):
+        CircuitBreakerConfig(name="bad", window_buckets=0)
+
+
+# -----------------------------------------------------------------------------
+# Half-open probes
+# -----------------------------------------------------------------------------
+
+async def opened(clock: Clock, **config) -> CircuitBreaker:
+    """A breaker that just opened and whose timeout has elapsed."""
+    cb = breaker(minimum_calls=1, failure_threshold=1, **config)
+    await calls(cb, failures=1)
+    assert cb.state == CircuitState.OPEN
+    clock.now += 30
+    return cb
+
+
+async def enter(cb: CircuitBreaker) -> CircuitBreaker._ProtectContext:
+    """Start a call that stays in flight until exited."""
+    ctx = cb.protect()
+    await ctx.__aenter__()
+    return ctx
+
+
+async def test_half_open_admits_limited_concurrent_probes(clock):
+    cb = await opened(clock, half_open_max_calls=2, half_open_retry_seconds=0.5)
+    first = await enter(cb)
+    assert cb.state == CircuitState.HALF_OPEN
+    await enter(cb)
+    assert cb.retry_after == 0.5
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        await cb.call(succeed)
+    assert excinfo.value.retry_after == 0.5
+
+    # A finished probe frees its slot
+    await first.__aexit__(None, None, None)
+    assert cb.retry_after is None
+    await enter(cb)
+
+    probes = cb.get_status()["probes"]
+    assert (probes["started"], probes["succeeded"], probes["rejected"], probes["in_flight"]) == (3, 1, 1, 2)
+
+
+async def test_probe_successes_close_and_clear_the_window(clock):
+    cb = await opened(clock, success_threshold=2)
+    await cb.call(succeed)
+    assert cb.state == CircuitState.HALF_OPEN
+    await cb.call(succeed)
+    assert cb.state == CircuitState.CLOSED
+    assert cb.get_status()["window"]["calls"] == 0
+
+    # Back to the fast path: the old failure doesn't count any more
+    await cb.call(succeed)
+    assert cb.state == CircuitState.CLOSED
+
+
+async def test_probe_failure_reopens(clock):
+    cb = await opened(clock, success_threshold=2)
+    await cb.call(succeed)
+    await calls(cb, failures=1)
+    assert cb.state == CircuitState.OPEN
+    assert cb.retry_after == pytest.approx(30)
+
+
+async def test_slow_probe_reopens(clock):
+    cb = await opened(clock, slow_call_seconds=1.0)
+    ctx = await enter(cb)
+    clock.now += 2
+    await ctx.__aexit__(None, None, None)
+    assert cb.state == CircuitState.OPEN
+
+
+async def test_cancelled_probe_frees_its_slot_without_an_outcome(clock):
+    cb = await opened(clock)
+    ctx = await enter(cb)
+    cancelled = asyncio.CancelledError()
+    await ctx.__aexit__(type(cancelled), cancelled, None)
+
+    assert cb.state == CircuitState.HALF_OPEN
+    probes = cb.get_status()["probes"]
+    assert (probes["in_flight"], probes["succeeded"], probes["failed"]) == (0, 0, 0)
+    await enter(cb)
+
+
+async def test_probes_of_an_earlier_half_open_period_are_ignored(clock):
+    cb = await opened(clock, half_open_max_calls=2, success_threshold=1)
+    stale = await enter(cb)
+    await calls(cb, failures=1)  # second probe fails: open again
+    assert cb.state == CircuitState.OPEN
+
+    clock.now += 30
+    current = await enter(cb)
+    assert cb.state == CircuitState.HALF_OPEN
+
+    # The stale probe neither closes the circuit nor frees a slot
+    await stale.__aexit__(None, None, None)
+    assert cb.state == CircuitState.HALF_OPEN
+    assert cb.get_status()["probes"]["in_flight"] == 1
+
+    await current.__aexit__(None, None, None)
+    assert cb.state == CircuitState.CLOSED
+
+
+async def test_reset_frees_probe_slots(clock):
+    cb = await opened(clock)
+    ctx = await enter(cb)
+    cb.reset()
+    assert cb.state == CircuitState.CLOSED
+    await ctx.__aexit__(None, None, None)
+    assert cb.get_status()["probes"]["in_flight"] == 0
@@ -0,0 +1,207 @@
+"""Tests for the TTL cache and the read-through content cache."""
+
+import pytest
+
+from src.core.cache import TTLCache
+from src.models.content import (
+    Answer,
+    QuestionCluster,
+    QuestionVariant,
+    QuestionWithAnswers,
+    Subject,
+)
+from src.repositories import CachedContentRepository, ContentCache
+
+
+class Clock:
+    """Controllable stand-in for time.monotonic."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr("src.core.cache.time.monotonic", clock)
+    monkeypatch.setattr("src.repositories.cached_content_repository.time.monotonic", clock)
+    return clock
+
+
+def question(variant_id: str, subject: Subject, cluster_id: str = "c1") -> QuestionWithAnswers:
+    return QuestionWithAnswers(
+        variant=QuestionVariant(id=variant_id, cluster_id=cluster_id, question_text="Q"),
+        answers=[Answer(id=f"{variant_id}-a", variant_id=variant_id, answer_text="A")],
+        cluster=QuestionCluster(id=cluster_id, subject_id=subject.id, topic="T"),
+        subject=subject,
+    )
+
+
+# -----------------------------------------------------------------------------
+# TTLCache
+# -----------------------------------------------------------------------------
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache[str, int]("test", ttl_seconds=10)
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.2
+    assert cache.get("a") is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 1, 1, 0)
+
+
+def test_lru_eviction(clock):
+    cache = TTLCache[str, int]("test", max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_invalidate_where(clock):
+    cache = TTLCache[str, int]("test")
+    for i in range(5):
+        cache.set(str(i), i)
+    assert cache.invalidate_where(lambda _, v: v % 2 == 0) == 3
+    assert len(cache) == 2
+
+
+# -----------------------------------------------------------------------------
+# ContentCache generation
+# -----------------------------------------------------------------------------
+
+def test_store_skips_values_read_before_an_invalidation(clock):
+    content = ContentCache()
+    subject = Subject(id="s1", key="mathe", name="Mathematik")
+
+    generation = content.generation
+    content.invalidate_subject("s1")  # a write lands while the read is in flight
+    content.store(content.subjects, "s1", subject, generation)
+    assert content.subjects.get("s1") is None
+
+    content.store(content.subjects, "s1", subject, content.generation)
+    assert content.subjects.get("s1") == subject
+
+
+def test_invalidations_reach_embedding_questions(clock):
+    content = ContentCache()
+    mathe = Subject(id="s1", key="mathe", name="Mathematik")
+    deutsch = Subject(id="s2", key="deutsch", name="Deutsch")
+    content.questions.set("v1", question("v1", mathe, "c1"))
+    content.questions.set("v2", question("v2", deutsch, "c2"))
+    content.subject_keys.set("mathe", mathe)
+
+    before = content.generation
+    content.invalidate_subject("s1")
+    assert content.generation > before
+    assert content.questions.get("v1") is None
+    assert content.subject_keys.get("mathe") is None
+    assert content.questions.get("v2") is not None
+
+    content.invalidate_entity("answer", "v2-a")
+    assert content.questions.get("v2") is None
+
+
+def test_sync_versions_drops_entries_of_changed_tables(clock):
+    content = ContentCache()
+    subject = Subject(id="s1", key="mathe", name="Mathematik")
+    cluster = QuestionCluster(id="c1", subject_id="s1", topic="T")
+
+    def fill():
+        content.subjects.set("s1", subject)
+        content.clusters.set("c1", cluster)
+        content.questions.set("v1", question("v1", subject))
+
+    versions = {"subjects": 1, "question_clusters": 1, "question_variants": 1, "answers": 1}
+    content.sync_versions(versions)
+    fill()
+
+    # Unchanged (or older) counters keep everything
+    generation = content.generation
+    assert content.sync_versions(versions) == set()
+    assert content.sync_versions({**versions, "answers": 0}) == set()
+    assert content.generation == generation
+    assert content.subjects.get("s1") is not None
+
+    # Answers changed: only hydrated questions embed them
+    assert content.sync_versions({**versions, "answers": 2}) == {"answers"}
+    assert content.generation > generation
+    assert content.questions.get("v1") is None
+    assert content.subjects.get("s1") is not None
+    assert content.clusters.get("c1") is not None
+
+    fill()
+    assert content.sync_versions({**versions, "answers": 2, "subjects": 5}) == {"subjects"}
+    assert content.subjects.get("s1") is None
+    assert content.clusters.get("c1") is not None
+    assert content.questions.get("v1") is None
+
+
+def test_version_check_is_claimed_once_per_interval(clock):
+    content = ContentCache(version_check_seconds=1.0)
+    assert content.version_check_due()
+    assert not content.version_check_due()
+    clock.now += 1.0
+    assert content.version_check_due()
+    content.sync_versions({})
+    clock.now += 0.5
+    assert not content.version_check_due()
+
+
+# -----------------------------------------------------------------------------
+# CachedContentRepository
+# -----------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_reads_are_served_from_cache_until_written(content_repository):
+    cache = ContentCache(version_check_seconds=3600)
+    repo = CachedContentRepository(content_repository, cache)
+    subject = await repo.create_subject(Subject(key="mathe", name="Mathematik"))
+
+    assert (await repo.get_subject_by_id(subject.id)).name == "Mathematik"
+    assert (await repo.get_subject_by_id(subject.id)).name == "Mathematik"
+    assert cache.subjects.get_stats()["hits"] == 1
+
+    # Callers may modify what they get
+    copy = await repo.get_subject_by_id(subject.id)
+    copy.name = "Changed locally"
+    assert (await repo.get_subject_by_id(subject.id)).name == "Mathematik"
+
+    await repo.update_subject(Subject(id=subject.id, key="mathe", name="Mathe"))
+    assert (await repo.get_subject_by_id(subject.id)).name == "Mathe"
+    assert [s.name for s in await repo.get_all_subjects()] == ["Mathe"]
+
+
+@pytest.mark.asyncio
+async def test_writes_from_elsewhere_show_up_after_the_version_check(content_repository, clock):
+    cache = ContentCache(version_check_seconds=1.0)
+    repo = CachedContentRepository(content_repository, cache)
+    subject = await repo.create_subject(Subject(key="mathe", name="Mathematik"))
+    assert (await repo.get_subject_by_id(subject.id)).name == "Mathematik"
+
+    # Another process writes without going through this cache
+    await content_repository.update_subject(Subject(id=subject.id, key="mathe", name="Extern"))
+    assert (await repo.get_subject_by_id(subject.id)).name == "Mathematik"
+
+    clock.now += 1.0
+    assert (await repo.get_subject_by_id(subject.id)).name == "Extern"
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl_in_repository(content_repository, clock):
+    cache = ContentCache(ttl_seconds=60, version_check_seconds=3600)
+    repo = CachedContentRepository(content_repository, cache)
+    subject = await repo.create_subject(Subject(key="mathe", name="Mathematik"))
+    await repo.get_subject_by_id(subject.id)
+
+    clock.now += 61
+    await repo.get_subject_by_id(subject.id)
+    assert cache.subjects.get_stats()["expirations"] == 1
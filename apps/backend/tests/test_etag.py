@@ -0,0 +1,28 @@
+"""Tests for conditional GET on content endpoints."""
+
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_unchanged_subjects_answer_304(client):
+    first = await client.get("/subjects")
+    etag = first.headers["etag"]
+
+    again = await client.get("/subjects", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+    assert again.content == b""
+    # Weak comparison, as RFC 9110 prescribes for If-None-Match
+    weak = await client.get("/subjects", headers={"If-None-Match": f'"other", W/{etag}'})
+    assert weak.status_code == 304
+
+
+async def test_writes_change_the_etag(client):
+    etag = (await client.get("/subjects")).headers["etag"]
+    await client.post("/subjects", json={"key": "mathe", "name": "Mathematik"})
+
+    response = await client.get("/subjects", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [s["key"] for s in response.json()] == ["mathe"]
@@ -0,0 +1,170 @@
+"""Tests for task retry scheduling and error classification."""
+
+import json
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from src.tasks.retry import (
+    ErrorClass,
+    PermanentTaskError,
+    RateLimitError,
+    RetryPolicy,
+    classify_error,
+    get_retry_after,
+)
+
+
+class HTTPError(Exception):
+    """Provider SDK style error carrying an HTTP status."""
+
+    def __init__(self, status_code: int, headers: dict | None = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class ResponseError(Exception):
+    """HTTP client style error with the status only on the response."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.response = SimpleNamespace(status=status, headers={})
+
+
+class Item(BaseModel):
+    value: int
+
+
+def validation_error() -> ValidationError:
+    try:
+        Item.model_validate({"value": "not a number"})
+    except ValidationError as e:
+        return e
+    raise AssertionError("expected a ValidationError")
+
+
+# -----------------------------------------------------------------------------
+# Error classification
+# -----------------------------------------------------------------------------
+
+@pytest.mark.parametrize("error, expected", [
+    (RateLimitError(), ErrorClass.RATE_LIMIT),
+    (HTTPError(429), ErrorClass.RATE_LIMIT),
+    (PermanentTaskError("bad payload"), ErrorClass.PERMANENT),
+    (HTTPError(400), ErrorClass.PERMANENT),
+    (HTTPError(404), ErrorClass.PERMANENT),
+    (ResponseError(401), ErrorClass.PERMANENT),
+    (HTTPError(408), ErrorClass.TRANSIENT),
+    (HTTPError(409), ErrorClass.TRANSIENT),
+    (HTTPError(500), ErrorClass.TRANSIENT),
+    (ResponseError(503), ErrorClass.TRANSIENT),
+    (TimeoutError(), ErrorClass.TRANSIENT),
+    (ConnectionError(), ErrorClass.TRANSIENT),
+    (RuntimeError("boom"), ErrorClass.TRANSIENT),
+])
+def test_classify_error(error, expected):
+    assert classify_error(error) == expected
+
+
+def test_malformed_llm_output_is_transient():
+    # A retry asks the model again, which usually fixes bad JSON / schema
+    try:
+        json.loads("{not json")
+    except json.JSONDecodeError as e:
+        assert classify_error(e) == ErrorClass.TRANSIENT
+    assert classify_error(validation_error()) == ErrorClass.TRANSIENT
+
+
+@pytest.mark.parametrize("error", [ValueError("x"), TypeError("x"), KeyError("x")])
+def test_builtin_errors_are_not_permanent(error):
+    assert classify_error(error) == ErrorClass.TRANSIENT
+
+
+# -----------------------------------------------------------------------------
+# Retry-After hints
+# -----------------------------------------------------------------------------
+
+def test_retry_after_from_attribute():
+    assert get_retry_after(RateLimitError(retry_after=12)) == 12.0
+    assert get_retry_after(RateLimitError()) is None
+
+
+def test_retry_after_from_header_seconds():
+    assert get_retry_after(HTTPError(429, {"retry-after": "7"})) == 7.0
+    assert get_retry_after(HTTPError(429, {"Retry-After": "-3"})) == 0.0
+
+
+def test_retry_after_from_header_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    retry_after = get_retry_after(HTTPError(429, {"retry-after": format_datetime(when, usegmt=True)}))
+    assert 115 <= retry_after <= 120
+
+
+def test_retry_after_ignores_garbage():
+    assert get_retry_after(HTTPError(429, {"retry-after": "soon"})) is None
+    assert get_retry_after(RuntimeError()) is None
+
+
+# -----------------------------------------------------------------------------
+# RetryPolicy
+# -----------------------------------------------------------------------------
+
+def test_invalid_jitter_mode():
+    with pytest.raises(ValueError):
+        RetryPolicy(jitter="random")
+
+
+def test_no_jitter_is_capped_exponential():
+    policy = RetryPolicy(base_delay=10, max_delay=300, jitter="none")
+    delays = [policy.get_delay(n) for n in range(7)]
+    assert delays == [10, 20, 40, 80, 160, 300, 300]
+
+
+def test_rate_limits_use_their_own_schedule():
+    policy = RetryPolicy(rate_limit_base_delay=30, rate_limit_max_delay=900, jitter="none")
+    delays = [policy.get_delay(n, ErrorClass.RATE_LIMIT) for n in range(7)]
+    assert delays == [30, 60, 120, 240, 480, 900, 900]
+
+
+def test_permanent_errors_are_not_retried():
+    policy = RetryPolicy()
+    assert policy.get_delay(0, ErrorClass.PERMANENT) is None
+    assert policy.get_delay(0, ErrorClass.PERMANENT, retry_after=5) is None
+    assert policy.get_delay_for(0, PermanentTaskError("bad")) is None
+
+
+@pytest.mark.parametrize("retry_count", [0, 1, 3, 8])
+def test_full_jitter_stays_within_backoff(retry_count):
+    policy = RetryPolicy(base_delay=10, max_delay=300, jitter="full")
+    backoff = min(300, 10 * 2 ** retry_count)
+    delays = [policy.get_delay(retry_count) for _ in range(200)]
+    assert all(0 <= d <= backoff for d in delays)
+    # Spread out, not a single value
+    assert max(delays) - min(delays) > backoff / 4
+
+
+@pytest.mark.parametrize("retry_count", [0, 1, 3, 8])
+def test_decorrelated_jitter_bounds(retry_count):
+    policy = RetryPolicy(base_delay=10, max_delay=300, jitter="decorrelated")
+    previous = min(300, 10 * 2 ** max(0, retry_count - 1))
+    upper = min(300, max(10, previous * 3))
+    delays = [policy.get_delay(retry_count) for _ in range(200)]
+    assert all(10 <= d <= upper for d in delays)
+
+
+def test_retry_after_hint_replaces_schedule():
+    policy = RetryPolicy(rate_limit_base_delay=30, jitter="none")
+    delays = [policy.get_delay(0, ErrorClass.RATE_LIMIT, retry_after=2) for _ in range(100)]
+    assert all(2 <= d <= 2.2 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_get_delay_for_uses_error_hint():
+    policy = RetryPolicy(jitter="none")
+    delay = policy.get_delay_for(3, RateLimitError(retry_after=5))
+    assert 5 <= delay <= 5.5
+    assert policy.get_delay_for(2, RuntimeError("boom")) == 40
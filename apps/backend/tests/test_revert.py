@@ -0,0 +1,180 @@
+"""Tests for reverting the content written by a task."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.content import Answer, QuestionCluster, QuestionVariant, Subject
+from src.models.tasks import ContentAction, GenerationTask, TaskContentLog, TaskType
+from src.tasks.revert import RevertEngine
+
+T0 = datetime(2026, 1, 1)
+
+
+def log(entity_type, entity_id, action, previous_data=None, seconds=0) -> TaskContentLog:
+    return TaskContentLog(
+        task_id="task",
+        entity_type=entity_type,
+        entity_id=entity_id,
+        action=ContentAction(action),
+        previous_data=previous_data,
+        created_at=T0 + timedelta(seconds=seconds),
+    )
+
+
+class RecordingContent:
+    """Content repository stand-in recording the revert's bulk operations."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str, list]] = []
+
+    async def delete_entities(self, entity_type, entity_ids):
+        self.calls.append(("delete", entity_type, list(entity_ids)))
+        return len(entity_ids)
+
+    async def restore_entities(self, entity_type, rows):
+        self.calls.append(("restore", entity_type, [row["id"] for row in rows]))
+        return len(rows)
+
+
+class LogOnlyTasks:
+    """Task repository stand-in serving a fixed content log."""
+
+    def __init__(self, logs):
+        self._logs = logs
+
+    async def get_content_log_by_task(self, task_id):
+        return self._logs
+
+    async def get_task_by_id(self, task_id):
+        return None
+
+
+# -----------------------------------------------------------------------------
+# Plan
+# -----------------------------------------------------------------------------
+
+def test_plan_uses_first_entry_per_entity():
+    logs = [
+        # Out of order on purpose: the plan sorts by created_at
+        log("variant", "v1", "updated", {"cluster_id": "c2", "question_text": "later"}, seconds=5),
+        log("variant", "v1", "updated", {"cluster_id": "c1", "question_text": "original"}, seconds=1),
+        log("cluster", "c9", "created", seconds=0),
+        log("cluster", "c9", "updated", {"subject_id": "s", "topic": "x"}, seconds=2),
+        log("answer", "a1", "deleted", {"variant_id": "v1", "answer_text": "a"}, seconds=3),
+    ]
+    deletes, restores = RevertEngine.plan(logs)
+
+    assert deletes == {"cluster": ["c9"]}
+    assert restores == {
+        "variant": [{"id": "v1", "cluster_id": "c1", "question_text": "original"}],
+        "answer": [{"id": "a1", "variant_id": "v1", "answer_text": "a"}],
+    }
+
+
+def test_plan_skips_unknown_types_and_missing_snapshots():
+    logs = [
+        log("widget", "w1", "created"),
+        log("variant", "v1", "updated", None),
+        log("answer", "a1", "created"),
+    ]
+    deletes, restores = RevertEngine.plan(logs)
+
+    assert deletes == {"answer": ["a1"]}
+    assert restores == {}
+
+
+@pytest.mark.asyncio
+async def test_restores_run_parents_first_before_dependents_first_deletes():
+    logs = [
+        log("answer", "a-new", "created", seconds=1),
+        log("variant", "v-new", "created", seconds=2),
+        log("cluster", "c-new", "created", seconds=3),
+        log("answer", "a-old", "updated", {"variant_id": "v-old", "answer_text": "a"}, seconds=4),
+        log("variant", "v-old", "updated", {"cluster_id": "c-old", "question_text": "q"}, seconds=5),
+        log("cluster", "c-old", "deleted", {"subject_id": "s", "topic": "t"}, seconds=6),
+    ]
+    content = RecordingContent()
+    counts = await RevertEngine(LogOnlyTasks(logs), content).revert("task")
+
+    assert content.calls == [
+        ("restore", "cluster", ["c-old"]),
+        ("restore", "variant", ["v-old"]),
+        ("restore", "answer", ["a-old"]),
+        ("delete", "answer", ["a-new"]),
+        ("delete", "variant", ["v-new"]),
+        ("delete", "cluster", ["c-new"]),
+    ]
+    assert counts == {"clusters": 2, "variants": 2, "answers": 2}
+
+
+@pytest.mark.asyncio
+async def test_operations_are_chunked():
+    logs = [log("answer", f"a{i}", "created", seconds=i) for i in range(5)]
+    content = RecordingContent()
+    await RevertEngine(LogOnlyTasks(logs), content, chunk_size=2).revert("task")
+
+    assert [ids for _, _, ids in content.calls] == [["a0", "a1"], ["a2", "a3"], ["a4"]]
+
+
+# -----------------------------------------------------------------------------
+# Revert against SQLite
+# -----------------------------------------------------------------------------
+
+@pytest.mark.asyncio
+async def test_revert_keeps_existing_variants_moved_into_a_created_cluster(
+    content_repository, task_repository
+):
+    subject = await content_repository.create_subject(Subject(key="mathe", name="Mathematik"))
+    old_cluster = await content_repository.create_cluster(
+        QuestionCluster(subject_id=subject.id, topic="Old")
+    )
+    moved = await content_repository.create_variant(
+        QuestionVariant(cluster_id=old_cluster.id, question_text="2 + 2?")
+    )
+    await content_repository.create_answers_bulk([
+        Answer(variant_id=moved.id, answer_text="4", is_correct=True),
+        Answer(variant_id=moved.id, answer_text="5"),
+    ])
+
+    task = await task_repository.create_task(
+        GenerationTask(task_type=TaskType.GENERATE_CLUSTERS, payload={})
+    )
+    scoped = content_repository.for_task(task.id)
+    new_cluster = await scoped.create_cluster(QuestionCluster(subject_id=subject.id, topic="New"))
+    await scoped.update_variant(
+        QuestionVariant(id=moved.id, cluster_id=new_cluster.id, question_text="2 + 2?")
+    )
+    created = await scoped.create_variant(
+        QuestionVariant(cluster_id=new_cluster.id, question_text="3 + 3?")
+    )
+    await scoped.create_answer(Answer(variant_id=created.id, answer_text="6", is_correct=True))
+
+    counts = await RevertEngine(task_repository, content_repository).revert(task.id)
+
+    assert counts == {"variants": 2, "clusters": 1, "answers": 1}
+    assert await content_repository.get_cluster_by_id(new_cluster.id) is None
+    assert await content_repository.get_variant_by_id(created.id) is None
+    restored = await content_repository.get_variant_by_id(moved.id)
+    assert restored.cluster_id == old_cluster.id
+    answers = await content_repository.get_answers_by_variant(moved.id)
+    assert sorted(a.answer_text for a in answers) == ["4", "5"]
+    assert (await task_repository.get_task_by_id(task.id)).reverted_at is not None
+
+
+@pytest.mark.asyncio
+async def test_revert_is_idempotent(content_repository, task_repository):
+    subject = await content_repository.create_subject(Subject(key="deutsch", name="Deutsch"))
+    task = await task_repository.create_task(
+        GenerationTask(task_type=TaskType.GENERATE_CLUSTERS, payload={})
+    )
+    scoped = content_repository.for_task(task.id)
+    cluster = await scoped.create_cluster(QuestionCluster(subject_id=subject.id, topic="T"))
+    await scoped.update_subject(Subject(id=subject.id, key="deutsch", name="Changed"))
+
+    engine = RevertEngine(task_repository, content_repository)
+    await engine.revert(task.id)
+    await engine.revert(task.id)
+
+    assert await content_repository.get_cluster_by_id(cluster.id) is None
+    assert (await content_repository.get_subject_by_id(subject.id)).name == "Deutsch"
@@ -0,0 +1,133 @@
+"""Tests for executing claimed tasks in the TaskRunner."""
+
+import asyncio
+from collections import Counter
+
+import pytest
+
+from src.models.tasks import GenerationTask, TaskStatus, TaskType
+from src.repositories import SQLiteTaskRepository
+from src.tasks import runner as runner_module
+from src.tasks.progress import ProgressCoalescer
+from src.tasks.registry import TaskHandler, TaskHandlerRegistry
+from src.tasks.runner import TaskRunner
+
+pytestmark = pytest.mark.asyncio
+
+TASK_TYPE = TaskType.GENERATE_VARIANTS
+
+
+@pytest.fixture
+def register(monkeypatch):
+    """Register a handler class for TASK_TYPE for the duration of a test."""
+    def register(handler_class: type[TaskHandler]) -> None:
+        monkeypatch.setitem(TaskHandlerRegistry._handlers, TASK_TYPE.value, handler_class)
+
+    return register
+
+
+async def claimed_task(repo, worker_id: str = "worker-1") -> GenerationTask:
+    await repo.create_task(GenerationTask(task_type=TASK_TYPE, payload={}))
+    return await repo.claim_next_pending_task(worker_id, 60)
+
+
+async def test_failing_progress_close_keeps_the_handler_error(task_repository, register, monkeypatch):
+    class Failing(TaskHandler):
+        async def run(self, task, update_progress, log_artifact):
+            await update_progress(1, 2, "first")
+            raise ValueError("handler failed")
+
+    async def broken_close(self):
+        raise RuntimeError("database is locked")
+
+    register(Failing)
+    monkeypatch.setattr(ProgressCoalescer, "close", broken_close)
+    runner = TaskRunner(task_repository, worker_id="worker-1")
+    errors = []
+    handle_failure = runner._handle_failure
+
+    async def record(task, error):
+        errors.append(error)
+        await handle_failure(task, error)
+
+    runner._handle_failure = record
+    task = await claimed_task(task_repository)
+    await runner._execute_task(task)
+
+    assert [type(e) for e in errors] == [ValueError]
+    stored = await task_repository.get_task_by_id(task.id)
+    assert stored.status == TaskStatus.PENDING
+    assert stored.retry_count == 1
+
+
+async def test_lost_lease_cancels_the_handler(pool, task_repository, register, monkeypatch):
+    monkeypatch.setattr(runner_module, "HEARTBEAT_INTERVAL", 0.02)
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    class Blocking(TaskHandler):
+        async def run(self, task, update_progress, log_artifact):
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+    register(Blocking)
+    runner = TaskRunner(task_repository, worker_id="worker-1")
+    task = await claimed_task(task_repository)
+    execution = asyncio.create_task(runner._execute_task(task))
+    await asyncio.wait_for(started.wait(), timeout=5)
+
+    # Another worker took the task over (e.g. after a stall)
+    async with pool.writer() as conn:
+        await conn.execute(
+            "UPDATE generation_tasks SET lease_owner = 'worker-2' WHERE id = ?", (task.id,)
+        )
+        await conn.commit()
+    await asyncio.wait_for(execution, timeout=5)
+
+    assert cancelled.is_set()
+    # The new owner decides the outcome: no completion, failure or retry here
+    stored = await task_repository.get_task_by_id(task.id)
+    assert stored.status == TaskStatus.IN_PROGRESS
+    assert stored.lease_owner == "worker-2"
+    assert stored.retry_count == 0
+
+
+async def test_two_runners_never_run_the_same_task(pool, task_repository, register):
+    runs: Counter[str] = Counter()
+
+    class Counting(TaskHandler):
+        async def run(self, task, update_progress, log_artifact):
+            runs[task.id] += 1
+            await asyncio.sleep(0.01)
+
+    register(Counting)
+    task_ids = [
+        (await task_repository.create_task(GenerationTask(task_type=TASK_TYPE, payload={}))).id
+        for _ in range(20)
+    ]
+    # Own connections each, like two worker processes
+    runners = [
+        TaskRunner(
+            SQLiteTaskRepository(pool.database_path),
+            concurrency=4,
+            worker_id=f"worker-{i}",
+            poll_interval=0.05,
+        )
+        for i in range(2)
+    ]
+    for runner in runners:
+        await runner.start()
+    try:
+        for _ in range(200):
+            if await task_repository.count_tasks(status=TaskStatus.COMPLETED) == len(task_ids):
+                break
+            await asyncio.sleep(0.05)
+    finally:
+        for runner in runners:
+            await runner.stop()
+
+    assert runs == Counter(task_ids)
@@ -0,0 +1,213 @@
+"""Tests for the in-memory question sampling index."""
+
+import random
+from collections import Counter
+
+import pytest
+
+from src.config import settings
+from src.models.content import QuestionCluster, QuestionVariant, Subject
+from src.repositories import SQLiteContentRepository
+from src.repositories.sampling import QuestionSampler
+
+
+def rows(clusters: dict[str, tuple[str, int, int]]) -> list[dict]:
+    """Build index rows: cluster_id -> (subject_id, difficulty, variant count)."""
+    result = []
+    for cluster_id, (subject_id, difficulty, count) in clusters.items():
+        for i in range(count):
+            result.append({
+                "variant_id": f"{cluster_id}-v{i}",
+                "cluster_id": cluster_id,
+                "subject_id": subject_id,
+                "subject_key": f"key-{subject_id}",
+                "difficulty_baseline": difficulty,
+            })
+        if count == 0:
+            result.append({
+                "variant_id": None,
+                "cluster_id": cluster_id,
+                "subject_id": subject_id,
+                "subject_key": f"key-{subject_id}",
+                "difficulty_baseline": difficulty,
+            })
+    return result
+
+
+def sampler_with(clusters, seed: int = 7) -> QuestionSampler:
+    sampler = QuestionSampler(rng=random.Random(seed))
+    assert sampler.load(rows(clusters))
+    return sampler
+
+
+def cluster_of(variant_id: str) -> str:
+    return variant_id.rsplit("-v", 1)[0]
+
+
+# -----------------------------------------------------------------------------
+# Weighting
+# -----------------------------------------------------------------------------
+
+def test_uniform_draws_treat_every_variant_alike():
+    # 1 variant in "a", 3 in "b": uniform per variant means b is drawn 3x as often
+    sampler = sampler_with({"a": ("s", 1, 1), "b": ("s", 9, 3)})
+    counts = Counter(cluster_of(sampler.sample()[0]) for _ in range(8000))
+    assert counts["b"] / counts["a"] == pytest.approx(3, rel=0.15)
+
+
+def test_weighted_draws_follow_difficulty():
+    sampler = sampler_with({"easy": ("s", 1, 2), "hard": ("s", 4, 2)})
+    counts = Counter(
+        cluster_of(sampler.sample(weighted=True)[0]) for _ in range(8000)
+    )
+    assert counts["hard"] / counts["easy"] == pytest.approx(4, rel=0.15)
+
+
+def test_weighted_distinct_draws_prefer_heavy_clusters():
+    # Small pool: exercises the without-replacement fallback
+    sampler = sampler_with({"easy": ("s", 1, 3), "hard": ("s", 9, 3)})
+    first = Counter(
+        cluster_of(sampler.sample(count=3, weighted=True)[0]) for _ in range(2000)
+    )
+    assert first["hard"] > 4 * first["easy"]
+
+
+def test_difficulty_zero_still_drawable_when_weighted():
+    sampler = sampler_with({"zero": ("s", 0, 2)})
+    assert cluster_of(sampler.sample(weighted=True)[0]) == "zero"
+
+
+# -----------------------------------------------------------------------------
+# Filters
+# -----------------------------------------------------------------------------
+
+def test_filters_restrict_the_pool():
+    sampler = sampler_with({
+        "m1": ("math", 2, 5),
+        "m2": ("math", 8, 5),
+        "d1": ("german", 5, 5),
+        "empty": ("german", 5, 0),
+    })
+    assert {cluster_of(v) for v in sampler.sample(count=50, subject_id="german")} == {"d1"}
+    assert {cluster_of(v) for v in sampler.sample(count=50, cluster_ids=["m2", "x"])} == {"m2"}
+    assert {cluster_of(v) for v in sampler.sample(count=50, min_difficulty=3, max_difficulty=8)} == {"m2", "d1"}
+    assert sampler.sample(cluster_ids=["empty"]) == []
+    assert sampler.subject_id_for_key("key-math") == "math"
+
+
+def test_distinct_and_capped_by_pool_size():
+    sampler = sampler_with({"a": ("s", 1, 4), "b": ("s", 1, 3)})
+    picked = sampler.sample(count=20)
+    assert len(picked) == 7
+    assert len(set(picked)) == 7
+
+
+# -----------------------------------------------------------------------------
+# Sessions / exhaustion
+# -----------------------------------------------------------------------------
+
+def test_session_never_repeats_until_exhausted():
+    sampler = sampler_with({"a": ("s", 1, 5), "b": ("s", 1, 5)})
+    drawn = []
+    for _ in range(4):
+        drawn += sampler.sample(count=3, session_id="quiz")
+    assert len(drawn) == 10
+    assert len(set(drawn)) == 10
+    assert sampler.sample(count=3, session_id="quiz") == []
+    assert sampler.sample(session_id="quiz") == []
+
+    sampler.end_session("quiz")
+    assert len(sampler.sample(count=3, session_id="quiz")) == 3
+
+
+def test_exclusions_outside_the_pool_do_not_exhaust_it():
+    sampler = sampler_with({"a": ("s", 1, 2), "b": ("t", 1, 2)})
+    assert len(sampler.sample(count=2, subject_id="t", session_id="quiz")) == 2
+    assert len(sampler.sample(count=2, subject_id="s", session_id="quiz")) == 2
+    assert sampler.sample(count=2, session_id="quiz") == []
+
+
+def test_sessions_are_evicted_lru():
+    sampler = QuestionSampler(max_sessions=2, rng=random.Random(1))
+    sampler.load(rows({"a": ("s", 1, 1)}))
+    sampler.sample(session_id="one")
+    sampler.sample(session_id="two")
+    sampler.sample(session_id="one")  # refreshes "one"
+    sampler.sample(session_id="three")  # evicts "two"
+    assert sampler.sample(session_id="one") == []
+    assert sampler.sample(session_id="two") == ["a-v0"]
+
+
+# -----------------------------------------------------------------------------
+# Index lifecycle
+# -----------------------------------------------------------------------------
+
+def test_load_discards_rows_from_before_an_invalidation():
+    sampler = QuestionSampler()
+    assert sampler.is_stale
+    generation = sampler.generation
+    sampler.invalidate()
+    assert not sampler.load(rows({"a": ("s", 1, 1)}), generation=generation)
+    assert sampler.is_stale
+    assert sampler.load(rows({"a": ("s", 1, 1)}), generation=sampler.generation)
+    assert not sampler.is_stale
+
+
+def test_index_expires_after_max_age(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("src.repositories.sampling.time.monotonic", lambda: now[0])
+    sampler = QuestionSampler(max_age_seconds=60)
+    sampler.load(rows({"a": ("s", 1, 1)}))
+    now[0] += 59
+    assert not sampler.is_stale
+    now[0] += 2
+    assert sampler.is_stale
+
+
+def test_index_rebuilds_once_source_counters_move():
+    sampler = QuestionSampler(version_check_seconds=0)
+    versions = {"subjects": 1, "question_clusters": 2, "question_variants": 3, "answers": 4}
+    sampler.load(rows({"a": ("s", 1, 1)}), versions=versions)
+
+    assert sampler.version_check_due()
+    assert not sampler.sync_versions({**versions, "answers": 9})
+    assert not sampler.is_stale
+    assert sampler.sync_versions({**versions, "question_variants": 4})
+    assert sampler.is_stale
+    # Nothing to compare against until the next load
+    assert not sampler.version_check_due()
+
+
+@pytest.mark.asyncio
+async def test_repository_rebuilds_index_after_writes(content_repository):
+    subject = await content_repository.create_subject(Subject(key="mathe", name="Mathematik"))
+    cluster = await content_repository.create_cluster(
+        QuestionCluster(subject_id=subject.id, topic="T", difficulty_baseline=3)
+    )
+    assert await content_repository.sample_variant_ids(5, subject_key="mathe") == []
+
+    variant = await content_repository.create_variant(
+        QuestionVariant(cluster_id=cluster.id, question_text="Q")
+    )
+    assert await content_repository.sample_variant_ids(5, subject_key="mathe") == [variant.id]
+    assert await content_repository.sample_variant_ids(5, subject_key="unknown") == []
+
+
+@pytest.mark.asyncio
+async def test_repository_sees_writes_from_other_processes(pool, monkeypatch):
+    monkeypatch.setattr(settings, "sampler_version_check_seconds", 0)
+    repository = SQLiteContentRepository(pool.database_path, pool=pool)
+    subject = await repository.create_subject(Subject(key="mathe", name="Mathematik"))
+    cluster = await repository.create_cluster(
+        QuestionCluster(subject_id=subject.id, topic="T", difficulty_baseline=3)
+    )
+    assert await repository.sample_variant_ids(5, subject_key="mathe") == []
+
+    # Written past the repository (e.g. by a standalone worker)
+    async with pool.writer() as conn:
+        await conn.execute(
+            "INSERT INTO question_variants (id, cluster_id, question_text) VALUES (?, ?, ?)",
+            ("external", cluster.id, "Q"),
+        )
+        await conn.commit()
+    assert await repository.sample_variant_ids(5, subject_key="mathe") == ["external"]
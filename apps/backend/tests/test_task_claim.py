@@ -0,0 +1,134 @@
+"""Tests for claiming tasks with priority lanes, aging and fair sharing."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.models.tasks import GenerationTask, TaskPriority, TaskStatus, TaskType
+from src.repositories.sqlite_task_repository import _CLAIM_WINDOW
+
+pytestmark = pytest.mark.asyncio
+
+CLUSTERS = TaskType.GENERATE_CLUSTERS
+VARIANTS = TaskType.GENERATE_VARIANTS
+
+
+async def add(
+    repo,
+    task_type: TaskType = CLUSTERS,
+    age_seconds: float = 0,
+    priority: TaskPriority = TaskPriority.NORMAL,
+    user: str | None = None,
+    status: TaskStatus = TaskStatus.PENDING,
+    **fields,
+) -> GenerationTask:
+    return await repo.create_task(GenerationTask(
+        task_type=task_type,
+        payload={},
+        priority=priority,
+        user_context=user,
+        status=status,
+        created_at=datetime.utcnow() - timedelta(seconds=age_seconds),
+        **fields,
+    ))
+
+
+async def claim(repo, **kwargs) -> str | None:
+    task = await repo.claim_next_pending_task("worker-1", 60, **kwargs)
+    return task.id if task else None
+
+
+async def test_claim_takes_the_lease(task_repository):
+    task = await add(task_repository)
+    claimed = await task_repository.claim_next_pending_task("worker-1", 60)
+
+    assert claimed.id == task.id
+    assert claimed.status == TaskStatus.IN_PROGRESS
+    assert claimed.lease_owner == "worker-1"
+    assert claimed.lease_expires_at > datetime.utcnow()
+    assert claimed.started_at is not None
+    assert await claim(task_repository) is None
+
+
+async def test_equal_scores_run_fifo(task_repository):
+    older = await add(task_repository, age_seconds=2)
+    newer = await add(task_repository, age_seconds=1)
+    assert await claim(task_repository) == older.id
+    assert await claim(task_repository) == newer.id
+
+
+async def test_higher_lane_runs_first(task_repository):
+    await add(task_repository, age_seconds=60)
+    high = await add(task_repository, priority=TaskPriority.HIGH)
+    assert await claim(task_repository) == high.id
+
+
+async def test_waiting_tasks_climb_lanes(task_repository):
+    # 1.5 lanes of aging (450s at 300s per lane) beats one lane of priority
+    old_low = await add(task_repository, age_seconds=450, priority=TaskPriority.LOW)
+    await add(task_repository, priority=TaskPriority.NORMAL)
+    assert await claim(task_repository) == old_low.id
+
+
+async def test_aging_below_one_lane_does_not_jump(task_repository):
+    await add(task_repository, age_seconds=200, priority=TaskPriority.LOW)
+    normal = await add(task_repository, priority=TaskPriority.NORMAL)
+    assert await claim(task_repository) == normal.id
+
+
+async def test_running_tasks_of_a_type_yield_to_other_types(task_repository):
+    await add(task_repository, CLUSTERS, status=TaskStatus.IN_PROGRESS)
+    await add(task_repository, CLUSTERS, age_seconds=60)
+    variants = await add(task_repository, VARIANTS)
+    # 60s of aging (0.2 lanes) is less than the 0.5 penalty for the running task
+    assert await claim(task_repository) == variants.id
+
+
+async def test_running_tasks_of_a_submitter_yield_to_others(task_repository):
+    await add(task_repository, VARIANTS, user="bulk", status=TaskStatus.IN_PROGRESS)
+    await add(task_repository, CLUSTERS, user="bulk", age_seconds=60)
+    other = await add(task_repository, CLUSTERS, user="alice")
+    assert await claim(task_repository) == other.id
+
+
+async def test_penalty_is_per_running_task(task_repository):
+    for i in range(5):
+        await add(task_repository, CLUSTERS, user=f"user-{i}", status=TaskStatus.IN_PROGRESS)
+    # Five running tasks cost 2.5 lanes, more than HIGH is ahead of LOW
+    await add(task_repository, CLUSTERS, user="alice", priority=TaskPriority.HIGH)
+    low = await add(task_repository, VARIANTS, user="bob", priority=TaskPriority.LOW)
+    assert await claim(task_repository) == low.id
+
+
+async def test_tasks_without_submitter_share_one(task_repository):
+    await add(task_repository, VARIANTS, status=TaskStatus.IN_PROGRESS)
+    await add(task_repository, CLUSTERS, age_seconds=60)
+    alice = await add(task_repository, CLUSTERS, user="alice")
+    assert await claim(task_repository) == alice.id
+
+
+async def test_delayed_and_excluded_tasks_are_skipped(task_repository):
+    await add(task_repository, CLUSTERS, delayed_until=datetime.utcnow() + timedelta(minutes=5))
+    excluded = await add(task_repository, VARIANTS)
+    assert await claim(task_repository, exclude_types=[VARIANTS]) is None
+    assert await claim(task_repository) == excluded.id
+
+
+async def test_window_keeps_each_type_reachable(task_repository):
+    # Many old tasks of one type don't hide a different type's task
+    for i in range(30):
+        await add(task_repository, CLUSTERS, age_seconds=100 + i)
+    variants = await add(task_repository, VARIANTS, priority=TaskPriority.HIGH)
+    assert await claim(task_repository) == variants.id
+
+
+async def test_aged_task_is_reached_behind_full_lanes(task_repository):
+    # More than a window of fresher HIGH tasks stays queued, yet the aged
+    # LOW task (four lanes of aging) still gets claimed
+    low = await add(task_repository, age_seconds=1200, priority=TaskPriority.LOW)
+    claimed = []
+    for _ in range(3):
+        for _ in range(_CLAIM_WINDOW + 4):
+            await add(task_repository, priority=TaskPriority.HIGH)
+        claimed.append(await claim(task_repository))
+    assert low.id in claimed
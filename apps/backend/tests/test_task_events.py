@@ -0,0 +1,44 @@
+"""Tests for streaming task events (SSE)."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.api.routes import tasks
+from src.models.tasks import GenerationTask, TaskType
+
+pytestmark = pytest.mark.asyncio
+
+
+def parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for message in body.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in message.splitlines() if not line.startswith(":"))
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def test_stream_polls_the_database_without_a_local_runner(client, task_repository, monkeypatch):
+    # As with task_runner_enabled=False: standalone workers publish nothing here
+    monkeypatch.setattr(tasks, "_SSE_POLL_SECONDS", 0.05)
+    task = await task_repository.create_task(
+        GenerationTask(task_type=TaskType.GENERATE_CLUSTERS, payload={})
+    )
+
+    async def work_elsewhere():
+        await asyncio.sleep(0.1)
+        claimed = await task_repository.claim_next_pending_task("worker-1", 60)
+        await task_repository.update_task_progress(claimed.id, 1, 2, "Half way")
+        await asyncio.sleep(0.1)
+        await task_repository.complete_task(claimed.id, lease_owner="worker-1")
+
+    worker = asyncio.create_task(work_elsewhere())
+    response = await asyncio.wait_for(client.get(f"/tasks/{task.id}/events"), timeout=5)
+    await worker
+
+    events = parse_sse(response.text)
+    assert events[0][0] == "status" and events[0][1]["status"] == "pending"
+    assert ("progress", "Half way") in [(kind, data.get("message")) for kind, data in events]
+    assert events[-1][0] == "status" and events[-1][1]["status"] == "completed"
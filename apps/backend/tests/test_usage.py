@@ -0,0 +1,78 @@
+"""Tests for LLM usage rollups."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models.tasks import LLMUsageLog
+
+pytestmark = pytest.mark.asyncio
+
+CEST = timezone(timedelta(hours=2))
+
+
+def usage(created_at: datetime, tokens: int = 10, model: str = "gpt") -> LLMUsageLog:
+    return LLMUsageLog(
+        created_at=created_at,
+        provider="openai",
+        model=model,
+        prompt_tokens=tokens,
+        completion_tokens=0,
+        total_tokens=tokens,
+        cost_cents=1,
+    )
+
+
+async def buckets(repo, granularity, **bounds) -> list[str]:
+    return [r.bucket for r in await repo.get_usage_rollups(granularity, **bounds)]
+
+
+async def test_bounds_follow_bucket_starts(usage_repository):
+    await usage_repository.create_usage_logs([
+        usage(datetime(2026, 10, 17, 23, 30)),
+        usage(datetime(2026, 10, 18, 0, 30)),
+    ])
+    repo = usage_repository
+
+    # The day starting at `until` is not included ...
+    assert await buckets(repo, "day", until=datetime(2026, 10, 18)) == ["2026-10-17"]
+    # ... but a bucket starting before it is
+    assert await buckets(repo, "day", until=datetime(2026, 10, 18, 0, 1)) == ["2026-10-17", "2026-10-18"]
+    assert await buckets(repo, "hour", until=datetime(2026, 10, 18)) == ["2026-10-17T23:00:00"]
+    assert await buckets(repo, "hour", since=datetime(2026, 10, 18, 0, 15)) == ["2026-10-18T00:00:00"]
+
+    # Aware bounds are converted to UTC first
+    assert await buckets(repo, "day", since=datetime(2026, 10, 18, 1, tzinfo=CEST)) == [
+        "2026-10-17", "2026-10-18",
+    ]
+    assert await buckets(repo, "day", until=datetime(2026, 10, 18, 2, tzinfo=CEST)) == ["2026-10-17"]
+    totals = await repo.get_usage_totals(until=datetime(2026, 10, 18, 2, tzinfo=CEST))
+    assert [t.total_tokens for t in totals] == [10]
+
+
+async def test_rollups_add_up_to_the_logged_usage(usage_repository):
+    repo = usage_repository
+    # Two batches, so the triggers have to add to existing buckets
+    await repo.create_usage_logs([
+        usage(datetime(2026, 10, 17, 9, 10), 10, "a"),
+        usage(datetime(2026, 10, 17, 14, 0), 5, "b"),
+    ])
+    await repo.create_usage_logs([
+        usage(datetime(2026, 10, 17, 9, 50), 20, "a"),
+        usage(datetime(2026, 10, 18, 8, 0), 7, "a"),
+    ])
+
+    hourly = {(r.bucket, r.model): (r.requests, r.total_tokens) for r in await repo.get_usage_rollups("hour")}
+    assert hourly == {
+        ("2026-10-17T09:00:00", "a"): (2, 30),
+        ("2026-10-17T14:00:00", "b"): (1, 5),
+        ("2026-10-18T08:00:00", "a"): (1, 7),
+    }
+    daily = {(r.bucket, r.model): (r.requests, r.total_tokens) for r in await repo.get_usage_rollups("day")}
+    assert daily == {
+        ("2026-10-17", "a"): (2, 30),
+        ("2026-10-17", "b"): (1, 5),
+        ("2026-10-18", "a"): (1, 7),
+    }
+    totals = {r.model: (r.requests, r.total_tokens, r.cost_cents) for r in await repo.get_usage_totals()}
+    assert totals == {"a": (3, 37, 3), "b": (1, 5, 1)}